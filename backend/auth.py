@@ -1,15 +1,19 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from models import AdminSession
 from config import settings
+import asyncio
 import uuid
 import pytz
+import time
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -21,6 +25,41 @@ ACCESS_TOKEN_EXPIRE_HOURS = 24
 # HTTP Bearer token scheme
 security = HTTPBearer(auto_error=False)
 
+class SessionCache:
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        # session_id -> (session expires_at, monotonic time the cache entry lapses)
+        self._entries: OrderedDict[str, tuple[datetime, float]] = OrderedDict()
+    
+    def is_valid(self, session_id: str) -> bool:
+        """Check if a session was validated against the database recently and hasn't expired."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return False
+        
+        expires_at, cached_until = entry
+        if time.monotonic() >= cached_until or datetime.now(pytz.UTC) >= expires_at:
+            del self._entries[session_id]
+            return False
+        
+        self._entries.move_to_end(session_id)
+        return True
+    
+    def add(self, session_id: str, expires_at: datetime) -> None:
+        """Remember a session the database just confirmed as active."""
+        self._entries[session_id] = (expires_at, time.monotonic() + self.ttl)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def revoke(self, session_id: str) -> None:
+        """Forget a session, the next request re-checks the database."""
+        self._entries.pop(session_id, None)
+
+# Validated sessions, revocations made through another worker apply within SESSION_CACHE_TTL
+session_cache = SessionCache(settings.SESSION_CACHE_SIZE, settings.SESSION_CACHE_TTL)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -58,7 +97,15 @@ def verify_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
-def create_admin_session(db: Session) -> str:
+def is_valid_uuid(value: str) -> bool:
+    """Check if a string is a valid UUID."""
+    try:
+        uuid.UUID(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+async def create_admin_session(db: AsyncSession) -> str:
     """Create a new admin session and return session token."""
     # Create JWT token
     session_id = str(uuid.uuid4())
@@ -68,18 +115,18 @@ def create_admin_session(db: Session) -> str:
     # Store session in database
     expires_at = datetime.now(pytz.UTC) + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
     db_session = AdminSession(
-        id=session_id,
+        id=uuid.UUID(session_id),
         expires_at=expires_at,
         is_active=True
     )
     db.add(db_session)
-    db.commit()
+    await db.commit()
     
     return access_token
 
-def get_current_admin(
+async def get_current_admin(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> dict:
     """Get current admin user from JWT token."""
     if not credentials:
@@ -100,18 +147,22 @@ def get_current_admin(
     
     # Check session in database
     session_id = payload.get("session_id")
-    if not session_id:
+    if not session_id or not is_valid_uuid(session_id):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token format",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    session = db.query(AdminSession).filter(
-        AdminSession.id == session_id,
+    # Recently validated sessions skip the database
+    if session_cache.is_valid(session_id):
+        return {"session_id": session_id, "type": "admin"}
+    
+    session = await db.scalar(select(AdminSession).where(
+        AdminSession.id == uuid.UUID(session_id),
         AdminSession.is_active == True,
         AdminSession.expires_at > datetime.now(pytz.UTC)
-    ).first()
+    ))
     
     if not session:
         raise HTTPException(
@@ -120,8 +171,52 @@ def get_current_admin(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    session_cache.add(session_id, session.expires_at)
     return {"session_id": session_id, "type": "admin"}
 
+async def revoke_admin_session(db: AsyncSession, session_id: str) -> None:
+    """Deactivate an admin session in the database and drop it from the cache."""
+    session_cache.revoke(session_id)
+    await db.execute(
+        update(AdminSession).where(AdminSession.id == uuid.UUID(session_id)).values(is_active=False)
+    )
+    await db.commit()
+
+async def sweep_admin_sessions(db: AsyncSession, batch_size: int) -> int:
+    """
+    Delete expired and inactive admin sessions.
+
+    Rows are deleted in batches so the table is never locked for long.
+
+    Args:
+        db: Database session
+        batch_size: Maximum rows deleted per statement
+
+    Returns:
+        Number of sessions deleted
+    """
+    stale = or_(AdminSession.expires_at <= datetime.now(pytz.UTC), AdminSession.is_active == False)
+    deleted = 0
+    while True:
+        batch = select(AdminSession.id).where(stale).limit(batch_size).scalar_subquery()
+        result = await db.execute(delete(AdminSession).where(AdminSession.id.in_(batch)))
+        await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+async def run_session_sweeper(session_factory, interval_seconds: int, batch_size: int) -> None:
+    """Sweep stale admin sessions every interval, forever."""
+    while True:
+        try:
+            async with session_factory() as db:
+                deleted = await sweep_admin_sessions(db, batch_size)
+            if deleted:
+                print(f"Removed {deleted} expired admin sessions")
+        except Exception as e:
+            print(f"Failed to sweep admin sessions: {str(e)}")
+        await asyncio.sleep(interval_seconds)
+
 def get_current_time_utc() -> datetime:
     """Get current UTC time."""
     return datetime.now(pytz.UTC)
@@ -132,12 +227,17 @@ def get_current_time_gmt4() -> datetime:
     gmt4_tz = pytz.timezone('America/New_York')  # GMT-4 (EDT)
     return utc_time.astimezone(gmt4_tz)
 
-def is_content_unlocked(release_datetime_utc: datetime, preview_token: Optional[str] = None) -> bool:
+def is_content_unlocked(
+    release_datetime_utc: datetime,
+    preview_token: Optional[str] = None,
+    current_utc: Optional[datetime] = None
+) -> bool:
     """Check if content is unlocked based on release time or preview token."""
     # Admin preview access
     if preview_token and verify_preview_token(preview_token):
         return True
     
-    # Time-based unlocking
-    current_utc = get_current_time_utc()
+    # Time-based unlocking, callers checking many days pass one shared time
+    if current_utc is None:
+        current_utc = get_current_time_utc()
     return current_utc >= release_datetime_utc 
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Concurrency benchmark for the API.
+
+Drives a DB-backed endpoint with concurrent clients while a probe client keeps
+hitting a cheap endpoint (/health by default). With blocking database calls
+the probe's latency tracks the database work happening on the same event
+loop; with the async database layer it should stay flat.
+
+Run it against a server started from each commit you want to compare:
+
+    uvicorn main:app --port 8000
+    python benchmarks/concurrency.py --base-url http://localhost:8000 --path /api/countdown
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import httpx
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def summarize(samples: list[float], errors: int, duration: float) -> dict:
+    """Throughput and latency summary in milliseconds."""
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / duration, 1),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+    }
+
+async def worker(client: httpx.AsyncClient, path: str, deadline: float, samples: list[float], errors: list[int], headers: dict):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            if response.status_code >= 400:
+                errors[0] += 1
+                continue
+        except httpx.HTTPError:
+            errors[0] += 1
+            continue
+        samples.append(time.perf_counter() - start)
+
+async def run(args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + args.duration
+        load_samples, load_errors = [], [0]
+        probe_samples, probe_errors = [], [0]
+        await asyncio.gather(
+            *(worker(client, args.path, deadline, load_samples, load_errors, headers) for _ in range(args.concurrency)),
+            worker(client, args.probe_path, deadline, probe_samples, probe_errors, {})
+        )
+
+    return {
+        "path": args.path,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "load": summarize(load_samples, load_errors[0], args.duration),
+        "probe": summarize(probe_samples, probe_errors[0], args.duration),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/countdown", help="DB-backed endpoint to load")
+    parser.add_argument("--probe-path", default="/health", help="Cheap endpoint to measure event loop stalls")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds to run")
+    parser.add_argument("--token", default=None, help="Admin bearer token for /api/admin paths")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
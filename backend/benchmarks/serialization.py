@@ -0,0 +1,179 @@
+"""
+Serialization micro-benchmark for countdown payloads.
+
+Builds an unlocked day with many sections (half of them images with responsive
+variants) in memory and measures CPU time per payload for:
+
+  schema  - the previous path: nested dicts with MediaAssetResponse objects,
+            validated against the response_model and encoded with json.dumps,
+            as FastAPI does for routes returning plain data
+  fast    - serializers.serialize_* to plain structures encoded with orjson
+
+No database or S3 access is needed:
+
+    python benchmarks/serialization.py --sections 32 --iterations 2000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+from models import CountdownDay, DaySection, MediaAsset
+from schemas import CountdownDayResponse, MediaAssetResponse, MediaVariantResponse, PublicCountdownDayResponse
+from storage import storage
+from serializers import dumps, serialize_admin_day, serialize_public_day
+
+def make_day(section_count: int) -> CountdownDay:
+    """Transient day with the given number of sections, every other one an image."""
+    now = datetime.now(timezone.utc)
+    day = CountdownDay(
+        id=1, day_number=1, title="Day 1", content_html=None,
+        release_datetime_utc=now - timedelta(days=1), audio_config={"volume": 0.7},
+        created_at=now, updated_at=now
+    )
+    for position in range(section_count):
+        media = None
+        if position % 2 == 0:
+            file_key = f"media/day_1/{uuid.uuid4()}.jpg"
+            media = MediaAsset(
+                id=uuid.uuid4(), filename="photo.jpg", file_key=file_key, file_size=2_000_000,
+                mime_type="image/jpeg", media_config={"caption": "A caption"}, uploaded_at=now,
+                day_number=1, width=1920, height=1080, placeholder="data:image/webp;base64," + "A" * 80,
+                variants=[
+                    {"width": width, "height": width * 9 // 16, "mime_type": mime_type,
+                     "file_key": file_key.replace(".jpg", f"_w{width}.{extension}"), "file_size": width * 100}
+                    for width in (320, 640, 960, 1280)
+                    for extension, mime_type in (("webp", "image/webp"), ("jpg", "image/jpeg"))
+                ]
+            )
+        day.sections.append(DaySection(
+            id=uuid.uuid4(), day_number=1, section_type="image" if media else "text",
+            content_text=f"Section {position} " * 20, position_order=position,
+            style_config={"alignment": "center"}, media_asset=media,
+            media_asset_id=media.id if media else None, created_at=now, updated_at=now
+        ))
+    return day
+
+def legacy_media(media: MediaAsset) -> MediaAssetResponse:
+    """add_media_urls as it was before the serialization layer."""
+    response = MediaAssetResponse.model_validate(media)
+    response.url = storage.get_media_url(media.file_key)
+    response.variants = [
+        MediaVariantResponse(**variant, url=storage.get_media_url(variant["file_key"]))
+        for variant in media.variants or []
+    ]
+    candidates: dict[str, list[str]] = {}
+    for variant in sorted(response.variants, key=lambda v: v.width):
+        candidates.setdefault(variant.mime_type, []).append(f"{variant.url} {variant.width}w")
+    response.srcset = {mime_type: ", ".join(entries) for mime_type, entries in candidates.items()}
+    return response
+
+def legacy_public_day(day: CountdownDay) -> dict:
+    return {
+        "day_number": day.day_number,
+        "title": day.title,
+        "content_html": day.content_html,
+        "sections": [
+            {
+                "id": section.id,
+                "section_type": section.section_type,
+                "content_text": section.content_text,
+                "position_order": section.position_order,
+                "style_config": section.style_config,
+                "media_asset": legacy_media(section.media_asset) if section.media_asset else None
+            }
+            for section in day.sections
+        ],
+        "background_audio": None,
+        "audio_config": day.audio_config,
+        "is_unlocked": True
+    }
+
+def legacy_admin_day(day: CountdownDay) -> dict:
+    return {
+        "id": day.id,
+        "day_number": day.day_number,
+        "title": day.title,
+        "content_html": day.content_html,
+        "background_audio_id": day.background_audio_id,
+        "audio_config": day.audio_config,
+        "release_datetime_utc": day.release_datetime_utc,
+        "created_at": day.created_at,
+        "updated_at": day.updated_at,
+        "is_unlocked": True,
+        "sections": [
+            {
+                "id": section.id,
+                "section_type": section.section_type,
+                "content_text": section.content_text,
+                "position_order": section.position_order,
+                "style_config": section.style_config,
+                "media_asset_id": section.media_asset_id,
+                "day_number": section.day_number,
+                "created_at": section.created_at,
+                "updated_at": section.updated_at,
+                "media_asset": legacy_media(section.media_asset) if section.media_asset else None
+            }
+            for section in day.sections
+        ],
+        "media_assets": [],
+        "background_audio": None
+    }
+
+def schema_render(adapter: TypeAdapter, content: dict) -> bytes:
+    """response_model validation and encoding, as FastAPI does it."""
+    data = adapter.dump_python(adapter.validate_python(content), mode="json")
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def measure(render, iterations: int) -> float:
+    """CPU milliseconds per call."""
+    render()  # warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        render()
+    return (time.process_time() - start) / iterations * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    day = make_day(args.sections)
+    public_adapter = TypeAdapter(PublicCountdownDayResponse)
+    admin_adapter = TypeAdapter(CountdownDayResponse)
+
+    # Both paths must produce the same document
+    assert json.loads(schema_render(public_adapter, legacy_public_day(day))) == json.loads(dumps(serialize_public_day(day, True)))
+
+    cases = {
+        "public_day": (
+            lambda: schema_render(public_adapter, legacy_public_day(day)),
+            lambda: dumps(serialize_public_day(day, True)),
+        ),
+        "admin_day": (
+            lambda: schema_render(admin_adapter, legacy_admin_day(day)),
+            lambda: dumps(serialize_admin_day(day, True)),
+        ),
+    }
+
+    results = {"sections": args.sections, "iterations": args.iterations}
+    for name, (schema, fast) in cases.items():
+        schema_ms = measure(schema, args.iterations)
+        fast_ms = measure(fast, args.iterations)
+        results[name] = {
+            "schema_cpu_ms": round(schema_ms, 3),
+            "fast_cpu_ms": round(fast_ms, 3),
+            "speedup": round(schema_ms / fast_ms, 1),
+            "bytes": len(fast()),
+        }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
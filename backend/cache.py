@@ -0,0 +1,214 @@
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Hashable, Optional
+from auth import get_current_time_utc
+from config import settings
+
+# Cache keys are (scope, name), a scope is everything cached for one countdown
+CacheKey = tuple[Hashable, str]
+
+def overview_cache_key(countdown_id: int) -> CacheKey:
+    """Cache key for a countdown's public overview payload."""
+    return countdown_id, "overview"
+
+def summary_cache_key(countdown_id: int) -> CacheKey:
+    """Cache key for a countdown's public grid summary payload."""
+    return countdown_id, "summary"
+
+def day_cache_key(countdown_id: int, day_number: int) -> CacheKey:
+    """Cache key for a public countdown day payload."""
+    return countdown_id, f"day:{day_number}"
+
+class CacheEntry:
+    def __init__(self, value: Any, expires_at: Optional[datetime], valid_from: Optional[datetime] = None):
+        self.value = value
+        self.expires_at = expires_at
+        self.valid_from = valid_from
+
+    def is_fresh(self, now: datetime) -> bool:
+        """Check if the entry is valid at the given time."""
+        if self.valid_from is not None and now < self.valid_from:
+            return False
+        return self.expires_at is None or now < self.expires_at
+
+class ResponseCache:
+    def __init__(self, max_age_seconds: int, max_scopes: int):
+        """
+        Built payloads grouped by scope, bounded to the most recently used scopes.
+
+        Writes invalidate only their own scope, so editing one countdown never
+        throws away another's payloads.
+
+        Args:
+            max_age_seconds: Longest an entry is served without rebuilding
+            max_scopes: Scopes kept, the least recently used one is dropped past this
+        """
+        self.max_age = timedelta(seconds=max_age_seconds)
+        self.max_scopes = max_scopes
+        # scope -> name -> entry, least recently used scope first
+        self._entries: OrderedDict[Hashable, dict[str, CacheEntry]] = OrderedDict()
+        # Same, for values staged ahead of a release
+        self._staged: OrderedDict[Hashable, dict[str, CacheEntry]] = OrderedDict()
+        self._inflight: dict[CacheKey, asyncio.Future] = {}
+        self._generation = 0
+        # scope -> generation, least recently invalidated scope first. Scopes
+        # without one are at _evicted_generation, the highest one dropped, so
+        # dropping a counter never takes a scope back to an earlier generation
+        self._scope_generations: OrderedDict[Hashable, int] = OrderedDict()
+        self._evicted_generation = 0
+        self._listeners: list[Callable[[Optional[Hashable]], None]] = []
+
+    async def get_or_build(
+        self,
+        key: CacheKey,
+        builder: Callable[[], Awaitable[tuple[Any, Optional[datetime]]]]
+    ) -> Any:
+        """
+        Return the cached value for a key, building it at most once at a time.
+
+        Args:
+            key: Cache key
+            builder: Coroutine function returning (value, expires_at). expires_at is
+                the next instant the value changes on its own (e.g. the next release),
+                or None if it only changes on admin writes.
+
+        Returns:
+            The cached or freshly built value
+        """
+        scope, name = key
+        while True:
+            now = get_current_time_utc()
+            entries = self._entries.get(scope)
+            entry = entries.get(name) if entries else None
+            if entry and entry.is_fresh(now):
+                self._entries.move_to_end(scope)
+                return entry.value
+
+            # Swap in a value prewarmed for this moment
+            staged = self._staged.get(scope, {}).get(name)
+            if staged and staged.is_fresh(now):
+                del self._staged[scope][name]
+                if not self._staged[scope]:
+                    del self._staged[scope]
+                self._store(key, staged)
+                return staged.value
+
+            # Another request is already rebuilding this key, wait for its result
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The rebuilding request was cancelled, try again ourselves
+                if inflight.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self.generation(scope)
+        try:
+            value, expires_at = await builder()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        # Don't store a value built from data an admin write has since replaced
+        if generation == self.generation(scope):
+            self._store(key, CacheEntry(value, self._cap_expiry(now, expires_at)))
+        future.set_result(value)
+        return value
+
+    def generation(self, scope: Hashable) -> tuple[int, int]:
+        """Counters bumped on every invalidation of everything and of the scope."""
+        return self._generation, self._scope_generations.get(scope, self._evicted_generation)
+
+    def stage(
+        self,
+        key: CacheKey,
+        value: Any,
+        valid_from: datetime,
+        expires_at: Optional[datetime],
+        generation: tuple[int, int]
+    ) -> bool:
+        """
+        Stage a value that replaces the cached one once valid_from is reached.
+
+        Args:
+            key: Cache key
+            value: Value built ahead of time, as of valid_from
+            valid_from: Instant the value becomes current (e.g. a release time)
+            expires_at: Next instant the value changes on its own
+            generation: Generation of the key's scope read before building the value
+
+        Returns:
+            False if the scope was invalidated while the value was being built
+        """
+        scope, name = key
+        if generation != self.generation(scope):
+            return False
+
+        # Values staged for an earlier release nobody asked for are out of date by now
+        staged = self._staged.get(scope)
+        if staged is None:
+            staged = self._staged[scope] = {}
+            while len(self._staged) > self.max_scopes:
+                self._staged.popitem(last=False)
+        else:
+            self._staged.move_to_end(scope)
+        for stale in [other for other, entry in staged.items() if entry.valid_from < valid_from]:
+            del staged[stale]
+        staged[name] = CacheEntry(value, self._cap_expiry(valid_from, expires_at), valid_from)
+        return True
+
+    def invalidate(self, scope: Optional[Hashable] = None) -> None:
+        """Drop everything cached for one scope, or for every scope when none is given."""
+        if scope is None:
+            self._generation += 1
+            self._entries.clear()
+            self._staged.clear()
+        else:
+            self._scope_generations[scope] = self.generation(scope)[1] + 1
+            self._scope_generations.move_to_end(scope)
+            while len(self._scope_generations) > self.max_scopes:
+                _, evicted = self._scope_generations.popitem(last=False)
+                self._evicted_generation = max(self._evicted_generation, evicted)
+            self._entries.pop(scope, None)
+            self._staged.pop(scope, None)
+        
+        for listener in self._listeners:
+            listener(scope)
+    
+    def on_invalidate(self, listener: Callable[[Optional[Hashable]], None]) -> None:
+        """Call a function with the invalidated scope (None for all) whenever content changed."""
+        self._listeners.append(listener)
+
+    def _store(self, key: CacheKey, entry: CacheEntry) -> None:
+        scope, name = key
+        entries = self._entries.get(scope)
+        if entries is None:
+            entries = self._entries[scope] = {}
+            while len(self._entries) > self.max_scopes:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(scope)
+        entries[name] = entry
+
+    def _cap_expiry(self, now: datetime, expires_at: Optional[datetime]) -> datetime:
+        # Bound staleness for writes made through other worker processes
+        max_expiry = now + self.max_age
+        if expires_at is None or expires_at > max_expiry:
+            return max_expiry
+        return expires_at
+
+# Create a singleton instance
+countdown_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_AGE, settings.RESPONSE_CACHE_MAX_COUNTDOWNS)
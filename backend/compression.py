@@ -0,0 +1,141 @@
+import gzip
+from collections import OrderedDict
+from typing import Optional
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+# Event streams are flushed event by event, buffering them would hold events back
+STREAMING_TYPES = ("text/event-stream",)
+
+# Compressors by content coding. Payloads with an ETag are compressed once and
+# reused, so they get the slower, smaller setting.
+ENCODERS = {
+    "br": lambda body, reused: brotli.compress(body, quality=9 if reused else 4),
+    "gzip": lambda body, reused: gzip.compress(body, compresslevel=9 if reused else 6, mtime=0),
+}
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Supported content coding the client prefers, brotli on ties. None means identity."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    wildcard = weights.get("*", 0.0)
+    weight, _, encoding = max((weights.get(name, wildcard), name == "br", name) for name in ENCODERS)
+    return encoding if weight > 0 else None
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli/gzip compression for complete responses.
+
+    Bodies under minimum_size, already encoded responses and streams are sent
+    as they are. Compressed bodies of responses carrying an ETag are kept in a
+    small LRU keyed by path, ETag and coding, so a cached public payload is
+    compressed once rather than for every client.
+    """
+    def __init__(self, app, minimum_size: int = 1024, cache_size: int = 256):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache_size = cache_size
+        self._compressed: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                if message["status"] == 304:
+                    # Revalidated JSON payloads: no body to compress, but the validators must match the full response's
+                    set_encoding_validators(MutableHeaders(scope=message), encoding)
+                    passthrough = True
+                    await send(message)
+                    return
+                if not is_compressible(Headers(raw=message["headers"])):
+                    passthrough = True
+                    await send(message)
+                    return
+                # Hold the headers until the body size is known
+                start_message = message
+                return
+
+            if message["type"] == "http.response.body":
+                if message.get("more_body", False):
+                    # Streaming response, send it as is
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                await self._send_complete(send, scope["path"], start_message, message.get("body", b""), encoding)
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_complete(self, send, path: str, start_message, body: bytes, encoding: Optional[str]) -> None:
+        if len(body) >= self.minimum_size and start_message["status"] not in (204, 304):
+            headers = MutableHeaders(scope=start_message)
+            if encoding is not None:
+                body = self._compress(path, headers.get("etag"), body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+            set_encoding_validators(headers, encoding)
+
+        await send(start_message)
+        await send({"type": "http.response.body", "body": body})
+
+    def _compress(self, path: str, etag: Optional[str], body: bytes, encoding: str) -> bytes:
+        if etag is None:
+            return ENCODERS[encoding](body, False)
+
+        key = (path, etag, encoding)
+        compressed = self._compressed.get(key)
+        if compressed is not None:
+            self._compressed.move_to_end(key)
+            return compressed
+
+        compressed = ENCODERS[encoding](body, True)
+        self._compressed[key] = compressed
+        while len(self._compressed) > self.cache_size:
+            self._compressed.popitem(last=False)
+        return compressed
+
+def set_encoding_validators(headers: MutableHeaders, encoding: Optional[str]) -> None:
+    """Vary on Accept-Encoding, and weaken the ETag of an encoded representation."""
+    headers.add_vary_header("Accept-Encoding")
+    etag = headers.get("etag")
+    # The encoded bytes differ from the identity representation
+    if encoding is not None and etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+def is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(STREAMING_TYPES)
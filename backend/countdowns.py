@@ -0,0 +1,56 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Countdown
+
+class CountdownInfo:
+    def __init__(self, id: int, slug: str, title: str, total_days: int):
+        self.id = id
+        self.slug = slug
+        self.title = title
+        self.total_days = total_days
+
+class CountdownDirectory:
+    def __init__(self):
+        """
+        Every countdown by slug and id, kept in memory.
+
+        Public requests resolve their countdown here, so cached payloads are
+        served without touching the database however many countdowns exist.
+        """
+        self._by_slug: dict[str, CountdownInfo] = {}
+        self._by_id: dict[int, CountdownInfo] = {}
+
+    async def load(self, db: AsyncSession) -> None:
+        """(Re)build the directory from the countdowns table."""
+        result = await db.execute(select(Countdown))
+        countdowns = [self._info(countdown) for countdown in result.scalars()]
+
+        # Swap both maps at once so readers never see a partial directory
+        self._by_slug = {countdown.slug: countdown for countdown in countdowns}
+        self._by_id = {countdown.id: countdown for countdown in countdowns}
+
+    def get(self, slug: str) -> Optional[CountdownInfo]:
+        """Countdown by slug, None if it isn't loaded."""
+        return self._by_slug.get(slug)
+
+    def by_id(self, countdown_id: int) -> Optional[CountdownInfo]:
+        """Countdown by id, None if it isn't loaded."""
+        return self._by_id.get(countdown_id)
+
+    def ids(self) -> list[int]:
+        """Ids of every loaded countdown."""
+        return list(self._by_id)
+
+    def add(self, countdown: Countdown) -> CountdownInfo:
+        """Add or replace a countdown (e.g. one just created, here or through another worker)."""
+        info = self._info(countdown)
+        self._by_slug[info.slug] = info
+        self._by_id[info.id] = info
+        return info
+
+    def _info(self, countdown: Countdown) -> CountdownInfo:
+        return CountdownInfo(countdown.id, countdown.slug, countdown.title, countdown.total_days)
+
+# Create a singleton instance
+countdown_directory = CountdownDirectory()
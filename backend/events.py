@@ -0,0 +1,197 @@
+import asyncio
+import json
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+# Reconnect delay suggested to EventSource clients, in milliseconds
+RECONNECT_MILLISECONDS = 5000
+
+class EventBroker:
+    def __init__(self, history_size: int = 256):
+        # Identifies this process's event sequence, cursors from another one can't be resumed
+        self.stream_id = uuid.uuid4().hex[:8]
+        self._history: deque[tuple[int, str, dict]] = deque(maxlen=history_size)
+        self._sequence = 0
+        self._published = asyncio.Event()
+
+    def publish(self, event: str, data: dict) -> None:
+        """Send an event to every connected stream."""
+        self._sequence += 1
+        self._history.append((self._sequence, event, data))
+
+        # Wake all waiting streams at once, later waits use a fresh event
+        published, self._published = self._published, asyncio.Event()
+        published.set()
+
+    async def stream(self, last_event_id: Optional[str], keepalive_seconds: float) -> AsyncIterator[str]:
+        """
+        Server-sent event stream, starting after the client's last seen event.
+
+        Idle streams only wait on a shared asyncio.Event, so open connections
+        cost no work until something is published.
+
+        Args:
+            last_event_id: Last-Event-ID sent by a reconnecting client, if any
+            keepalive_seconds: Interval between keepalive comments on idle streams
+
+        Yields:
+            Encoded SSE messages
+        """
+        yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+
+        cursor = self._resume_cursor(last_event_id)
+        if cursor is None:
+            # Missed events can't be replayed, tell the client to reload everything
+            cursor = self._sequence
+            yield self._format(cursor, "resync", {})
+
+        while True:
+            published = self._published
+            for sequence, event, data in list(self._history):
+                if sequence > cursor:
+                    yield self._format(sequence, event, data)
+                    cursor = sequence
+
+            try:
+                await asyncio.wait_for(published.wait(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                # Comment line, keeps proxies from closing the idle connection
+                yield ": keepalive\n\n"
+
+    def _resume_cursor(self, last_event_id: Optional[str]) -> Optional[int]:
+        # New connections only get events from now on
+        if not last_event_id:
+            return self._sequence
+
+        stream_id, _, sequence = last_event_id.partition("-")
+        if stream_id != self.stream_id or not sequence.isdigit():
+            return None
+
+        sequence = int(sequence)
+        oldest = self._history[0][0] if self._history else self._sequence + 1
+        if sequence > self._sequence or sequence < oldest - 1:
+            return None
+        return sequence
+
+    def _format(self, sequence: int, event: str, data: dict) -> str:
+        return f"id: {self.stream_id}-{sequence}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+class EventHub:
+    def __init__(self, history_size: int = 256):
+        """
+        One event broker per countdown.
+
+        Publishing only wakes the streams of that countdown, however many
+        countdowns have listeners. Brokers are created by the first stream,
+        countdowns nobody listens to have nothing to send.
+        """
+        self.history_size = history_size
+        self._brokers: dict[int, EventBroker] = {}
+
+    def broker(self, countdown_id: int) -> EventBroker:
+        """Event broker of a countdown, created on first use."""
+        broker = self._brokers.get(countdown_id)
+        if broker is None:
+            broker = self._brokers[countdown_id] = EventBroker(self.history_size)
+        return broker
+
+    def publish(self, countdown_id: int, event: str, data: dict) -> None:
+        """Send an event to every connected stream of a countdown."""
+        broker = self._brokers.get(countdown_id)
+        if broker is not None:
+            broker.publish(event, data)
+
+class CoalescedCall:
+    def __init__(self, func: Callable[[Any], Awaitable[None]], delay_seconds: float):
+        self.func = func
+        self.delay = delay_seconds
+        self._pending: dict[Any, asyncio.Task] = {}
+
+    def request(self, key: Any = None) -> None:
+        """Run the function for a key shortly, once for a whole burst of requests for it."""
+        pending = self._pending.get(key)
+        if pending and not pending.done():
+            return
+        try:
+            self._pending[key] = asyncio.get_running_loop().create_task(self._run_later(key))
+        except RuntimeError:
+            # No event loop (e.g. a script), nothing to notify
+            pass
+
+    async def _run_later(self, key: Any) -> None:
+        await asyncio.sleep(self.delay)
+        # Requests made while running schedule another run
+        self._pending.pop(key, None)
+        try:
+            await self.func(key)
+        except Exception as e:
+            print(f"Failed to run {self.func.__name__}: {str(e)}")
+
+class ChangeRelay:
+    def __init__(self, database_url: str, channel: str = "countdown_changes"):
+        """
+        Relay content changes between processes through Postgres LISTEN/NOTIFY.
+
+        Caches and event brokers live in each process, so a write handled by one
+        uvicorn worker (or the snapshot command) would otherwise never reach the
+        streams connected to another. Every process listens on one dedicated
+        connection, outside the request pool, and replays the changes the
+        others announce.
+
+        Args:
+            database_url: Postgres URL, plain (postgresql://...)
+            channel: NOTIFY channel shared by every process
+        """
+        self.database_url = database_url
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._connection = None
+        self._on_change: Optional[Callable[[Optional[int]], None]] = None
+        self._relaying = False
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self, on_change: Callable[[Optional[int]], None]) -> None:
+        """Listen for other processes' changes, calling on_change with the countdown id (None for all)."""
+        import asyncpg
+        self._on_change = on_change
+        self._connection = await asyncpg.connect(self.database_url)
+        await self._connection.add_listener(self.channel, self._receive)
+
+    async def stop(self) -> None:
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await connection.close()
+
+    def announce(self, countdown_id: Optional[int]) -> None:
+        """Tell the other processes a countdown's content changed (None for all)."""
+        # Changes received from another process were announced there already
+        if self._relaying or self._connection is None:
+            return
+        task = asyncio.get_running_loop().create_task(self._notify(countdown_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _notify(self, countdown_id: Optional[int]) -> None:
+        payload = json.dumps({"origin": self.origin, "countdown_id": countdown_id})
+        try:
+            # One connection runs one statement at a time
+            async with self._lock:
+                await self._connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+        except Exception as e:
+            print(f"Failed to announce content change: {str(e)}")
+
+    def _receive(self, connection, pid: int, channel: str, payload: str) -> None:
+        message = json.loads(payload)
+        # Notifications come back to the process that sent them too
+        if message["origin"] == self.origin:
+            return
+        self._relaying = True
+        try:
+            self._on_change(message["countdown_id"])
+        finally:
+            self._relaying = False
+
+# Create a singleton instance
+countdown_events = EventHub()
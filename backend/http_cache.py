@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request
+import hashlib
+import pytz
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the parts of a content fingerprint."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+def validator_headers(etag: str, last_modified: datetime) -> dict:
+    """Headers that let clients revalidate a response instead of refetching it."""
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """Check the request's conditional headers against the current validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 7232 section 6)
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or any(
+            tag.removeprefix("W/") == etag for tag in candidates
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        since = _parse_http_date(if_modified_since)
+        # HTTP dates have second precision
+        return since is not None and last_modified.replace(microsecond=0) <= since
+
+    return False
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=pytz.UTC)
+    return parsed
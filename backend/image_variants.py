@@ -0,0 +1,159 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, Optional
+from PIL import Image, ImageFilter, ImageOps
+from config import settings
+from storage import storage
+import asyncio
+import base64
+import posixpath
+import shutil
+import tempfile
+
+# Standard responsive widths, only those narrower than the original are generated
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+
+# (extension, MIME type, Pillow format, save options)
+VARIANT_FORMATS = (
+    ("webp", "image/webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "image/jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+# GIFs are left alone so animations keep playing
+VARIANT_SOURCE_TYPES = {'image/jpeg', 'image/png', 'image/webp'}
+
+# Bytes copied per chunk when spooling an image to disk
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Low-quality placeholder, small enough to inline in every section payload
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 40
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def get_executor() -> ProcessPoolExecutor:
+    """Process pool for image work, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _executor
+
+def variant_key(file_key: str, width: int, extension: str) -> str:
+    """Storage key for a derivative, next to its original."""
+    stem, _ = posixpath.splitext(file_key)
+    return f"{stem}_w{width}.{extension}"
+
+def render_image(path: str) -> dict:
+    """
+    Render an image's resized derivatives and placeholder.
+
+    Runs in a worker process, reading the original from disk so it is never
+    pickled across. Orientation is baked in from EXIF and no metadata is
+    written to the derivatives.
+
+    Args:
+        path: Local file holding the original image
+
+    Returns:
+        Dict with the oriented width and height, a placeholder data URI, and
+        variants (dicts with width, height, extension, mime_type and data)
+    """
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    widths = [width for width in VARIANT_WIDTHS if width < image.width] or [image.width]
+
+    variants = []
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+
+        for extension, mime_type, image_format, options in VARIANT_FORMATS:
+            buffer = BytesIO()
+            frame = flatten(resized) if image_format == "JPEG" else resized
+            frame.save(buffer, image_format, **options)
+            variants.append({
+                "width": width,
+                "height": height,
+                "extension": extension,
+                "mime_type": mime_type,
+                "data": buffer.getvalue(),
+            })
+
+    return {
+        "width": image.width,
+        "height": image.height,
+        "placeholder": render_placeholder(image),
+        "variants": variants,
+    }
+
+def render_placeholder(image: Image.Image) -> str:
+    """Tiny blurred WebP of an image as a data URI (around 100 bytes)."""
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    tiny = flatten(image).resize((PLACEHOLDER_WIDTH, height), Image.BILINEAR)
+    tiny = tiny.filter(ImageFilter.GaussianBlur(1))
+
+    buffer = BytesIO()
+    tiny.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+def flatten(image: Image.Image) -> Image.Image:
+    """Drop the alpha channel onto white, for formats without transparency."""
+    if image.mode != "RGBA":
+        return image
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+async def process_image(path: str) -> dict:
+    """Render an image's derivatives and placeholder in the image process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), render_image, path)
+
+def spool_to_disk(file_obj: BinaryIO) -> str:
+    """Copy a stream to a temporary file in chunks, returns its path. The caller removes it."""
+    with tempfile.NamedTemporaryFile(prefix="image-", delete=False) as temp_file:
+        shutil.copyfileobj(file_obj, temp_file, COPY_CHUNK_SIZE)
+        return temp_file.name
+
+async def store_image_derivatives(file_key: str, path: str) -> dict:
+    """
+    Generate an image's derivatives and placeholder, uploading derivatives next to the original.
+
+    Args:
+        file_key: Storage key of the original image
+        path: Local file holding the original image
+
+    Returns:
+        MediaAsset column values (width, height, placeholder, variants), empty
+        if the image couldn't be processed
+    """
+    try:
+        rendered = await process_image(path)
+    except Exception as e:
+        print(f"Failed to process image {file_key}: {str(e)}")
+        return {}
+
+    variants = [
+        {
+            "width": variant["width"],
+            "height": variant["height"],
+            "mime_type": variant["mime_type"],
+            "file_key": variant_key(file_key, variant["width"], variant["extension"]),
+            "file_size": len(variant["data"]),
+        }
+        for variant in rendered["variants"]
+    ]
+    await asyncio.gather(*(
+        storage.run(storage.upload_bytes, variant["data"], record["file_key"], record["mime_type"])
+        for variant, record in zip(rendered["variants"], variants)
+    ))
+
+    return {
+        "width": rendered["width"],
+        "height": rendered["height"],
+        "placeholder": rendered["placeholder"],
+        "variants": variants,
+    }
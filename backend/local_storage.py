@@ -0,0 +1,153 @@
+from datetime import datetime, timezone
+from typing import BinaryIO, Optional
+from config import settings
+from storage_backend import StorageBackend
+import io
+import mimetypes
+import os
+import shutil
+import tempfile
+
+# Bytes read and written per chunk when streaming files
+CHUNK_SIZE = 1024 * 1024
+
+class FileRangeReader:
+    """Readable inclusive byte range of an open file."""
+    def __init__(self, file: BinaryIO, start: int, end: int):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = end - start + 1
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self.file.read(size)
+        self.remaining -= len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        self.file.close()
+
+class LocalStorage(StorageBackend):
+    """
+    Objects stored as files under a root directory, for single-box installs.
+
+    Keys map to paths below the root. Uploads are streamed to a temporary file
+    in chunks and moved into place, so readers never see partial objects.
+    Clients always load media through the /media proxy, which sends these
+    files in place.
+    """
+    local = True
+
+    def __init__(self, root: str):
+        super().__init__(settings.LOCAL_STORAGE_WORKERS, "storage")
+        self.root = os.path.realpath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, file_key: str) -> str:
+        """Path of an object, keys reaching outside the root are treated as missing."""
+        path = os.path.realpath(os.path.join(self.root, file_key))
+        if not path.startswith(self.root + os.sep):
+            raise FileNotFoundError(file_key)
+        return path
+
+    def local_file(self, file_key: str) -> Optional[tuple[str, int]]:
+        try:
+            path = self.path_for(file_key)
+            return path, os.stat(path).st_size
+        except FileNotFoundError:
+            return None
+
+    def upload_stream(
+        self,
+        file_obj: BinaryIO,
+        filename: str,
+        content_type: str,
+        day_number: Optional[int] = None,
+        max_size: Optional[int] = None
+    ) -> tuple[str, str, int]:
+        file_key = self.generate_file_key(filename, day_number)
+        size = 0
+
+        def write_chunks(temp_file: BinaryIO) -> None:
+            nonlocal size
+            while chunk := file_obj.read(CHUNK_SIZE):
+                size += len(chunk)
+                self._check_size(size, max_size)
+                temp_file.write(chunk)
+
+        self._write_atomic(file_key, write_chunks)
+        return file_key, self.get_media_url(file_key), size
+
+    def upload_bytes(self, data: bytes, file_key: str, content_type: str) -> str:
+        self._write_atomic(file_key, lambda temp_file: temp_file.write(data))
+        return self.get_media_url(file_key)
+
+    def download_bytes(self, file_key: str) -> bytes:
+        with open(self.path_for(file_key), "rb") as file:
+            return file.read()
+
+    def open_object(self, file_key: str, byte_range: Optional[tuple[int, int]] = None) -> FileRangeReader:
+        file = open(self.path_for(file_key), "rb")
+        if byte_range is None:
+            byte_range = (0, os.fstat(file.fileno()).st_size - 1)
+        return FileRangeReader(file, *byte_range)
+
+    def download_to_file(self, file_key: str, file_obj: BinaryIO) -> None:
+        """Copy an object into a writable binary file, with sendfile when it's a real file."""
+        with open(self.path_for(file_key), "rb") as source:
+            try:
+                target_fd = file_obj.fileno()
+            except (AttributeError, io.UnsupportedOperation):
+                shutil.copyfileobj(source, file_obj, CHUNK_SIZE)
+                return
+
+            # Kernel-side copy, the bytes never pass through Python
+            file_obj.flush()
+            offset = 0
+            size = os.fstat(source.fileno()).st_size
+            while offset < size:
+                sent = os.sendfile(target_fd, source.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+
+    def get_file_metadata(self, file_key: str) -> Optional[dict]:
+        try:
+            stat = os.stat(self.path_for(file_key))
+        except FileNotFoundError:
+            return None
+        return {
+            'size': stat.st_size,
+            'content_type': mimetypes.guess_type(file_key)[0] or '',
+            'last_modified': datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            'etag': f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        }
+
+    def delete_file(self, file_key: str) -> bool:
+        try:
+            os.remove(self.path_for(file_key))
+            return True
+        except OSError as e:
+            print(f"Failed to delete file from local storage: {str(e)}")
+            return False
+
+    def file_exists(self, file_key: str) -> bool:
+        try:
+            return os.path.isfile(self.path_for(file_key))
+        except FileNotFoundError:
+            return False
+
+    def _write_atomic(self, file_key: str, write) -> None:
+        path = self.path_for(file_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                write(temp_file)
+            # mkstemp creates files only the owner can read, nginx serves them too
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
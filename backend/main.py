@@ -1,40 +1,151 @@
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Query, Header, Request, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session, joinedload
-from datetime import datetime
-from typing import Optional, List
-import io
-from PIL import Image
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import delete, func, insert, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Iterable, Optional, List
+from uuid import UUID, uuid4
+import asyncio
+import functools
+import hmac
+import inspect
+import mimetypes
+import os
+import tempfile
 
 # Local imports
 from config import settings
-from database import get_db, engine
-from models import Base, CountdownDay, MediaAsset, DaySection
+from database import get_db, engine, SessionLocal
+from models import Base, Countdown, CountdownDay, MediaAsset, DaySection
 from schemas import (
     AdminLoginRequest, AdminLoginResponse, 
+    CountdownCreate, CountdownResponse,
     CountdownDayResponse, CountdownDayUpdate,
     PublicCountdownDayResponse, CountdownOverviewResponse,
+    CountdownSummaryResponse, AdminDaySummaryResponse,
     MediaUploadResponse, ValidationResponse,
-    DaySectionCreate, DaySectionUpdate, DaySectionResponse,
+    DaySectionBase, DaySectionUpdate, DaySectionResponse, SectionMoveRequest,
     SectionsUpdateRequest, SectionsResponse,
-    MediaAssetUpdate, AudioConfig, MediaConfig
+    MediaAssetUpdate, AudioConfig, MediaConfig, SectionStyleConfig,
+    MediaAssetResponse,
+    PresignedUploadRequest, PresignedUploadResponse, UploadCompleteRequest
 )
 from auth import (
     verify_admin_password, create_admin_session, get_current_admin,
-    is_content_unlocked, get_current_time_utc
+    is_content_unlocked, get_current_time_utc, verify_preview_token,
+    create_access_token, verify_token, revoke_admin_session, run_session_sweeper
+)
+from storage import storage, FileTooLargeError, hash_stream, RangedObjectReader
+from cache import countdown_cache, overview_cache_key, summary_cache_key, day_cache_key
+from http_cache import make_etag, validator_headers, is_not_modified
+from schedule import unlock_schedule, UnlockScheduler
+from countdowns import countdown_directory, CountdownInfo
+from image_variants import store_image_derivatives, spool_to_disk, VARIANT_SOURCE_TYPES
+from media_metadata import read_video_dimensions, VIDEO_PROBE_TYPES
+from snapshots import SnapshotPublisher
+from events import countdown_events, CoalescedCall, ChangeRelay
+from compression import CompressionMiddleware
+from metrics import MetricsMiddleware, instrument_engine, instrument_s3_client, render_metrics
+from profiling import QueryProfilerMiddleware, enable_query_profiling
+from media_proxy import (
+    media_cache, parse_range, range_headers, iter_body, FileRangeResponse, RangeNotSatisfiable, PROXIED_KEY_PREFIXES
+)
+from serializers import (
+    FastJSONResponse, dumps, serialize_media, serialize_cover, serialize_public_day, serialize_admin_day,
+    day_media_file_keys
 )
-from s3_service import s3_service
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create database tables
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    # Load the countdowns and their unlock schedule, and start warming content ahead of each release
+    async with SessionLocal() as db:
+        await countdown_directory.load(db)
+        await unlock_schedule.load(db)
+    
+    # Remote objects served through the media proxy are cached on local disk
+    if storage.proxied and not storage.local:
+        await asyncio.to_thread(media_cache.load)
+    
+    # Static snapshots and event streams follow releases and admin writes
+    publisher = SnapshotPublisher(settings.SNAPSHOT_DIR, render_snapshots) if settings.SNAPSHOT_DIR else None
+    
+    async def announce_release(release_at: datetime, releases: dict[int, list[int]]) -> None:
+        async def announce(countdown_id: int) -> None:
+            if publisher:
+                await publisher.publish(countdown_id)
+            countdown_events.publish(countdown_id, "unlock", {
+                "day_numbers": releases[countdown_id],
+                "release_at": release_at.isoformat()
+            })
+        await run_per_countdown(releases, announce, "announce the release of")
+    
+    async def announce_content_change(countdown_id: Optional[int]) -> None:
+        async def announce(countdown_id: int) -> None:
+            if publisher:
+                await publisher.publish(countdown_id)
+            countdown_events.publish(countdown_id, "content", {})
+        countdown_ids = countdown_directory.ids() if countdown_id is None else [countdown_id]
+        await run_per_countdown(countdown_ids, announce, "announce content changes of")
+    
+    # Admin writes come in bursts, announce them per countdown once things settle
+    content_changed = CoalescedCall(announce_content_change, settings.CONTENT_EVENT_DELAY)
+    countdown_cache.on_invalidate(content_changed.request)
+    
+    # Writes handled by other workers reach this one's cache and event streams through Postgres
+    relay = ChangeRelay(settings.DATABASE_URL) if settings.DATABASE_URL.startswith("postgres") else None
+    if relay:
+        try:
+            await relay.start(countdown_cache.invalidate)
+            countdown_cache.on_invalidate(relay.announce)
+        except Exception as e:
+            print(f"Failed to listen for changes from other workers: {str(e)}")
+    
+    # Catch up on anything that changed while we were down
+    content_changed.request()
+    
+    scheduler = UnlockScheduler(unlock_schedule, prewarm_release, settings.PREWARM_SECONDS, announce_release)
+    scheduler_task = asyncio.create_task(scheduler.run())
+    
+    # Keep admin_sessions from growing with every login
+    sweeper_task = asyncio.create_task(run_session_sweeper(
+        SessionLocal, settings.SESSION_SWEEP_INTERVAL, settings.SESSION_SWEEP_BATCH_SIZE
+    ))
+    
+    # Presigned media URLs are re-signed per window, republish when a new one starts
+    async def rotate_media_urls() -> None:
+        while True:
+            _, window_end = storage.media_url_window()
+            await asyncio.sleep(max((window_end - datetime.now(timezone.utc)).total_seconds(), 0) + 1)
+            content_changed.request()
+    
+    rotation_task = asyncio.create_task(rotate_media_urls()) if storage.media_url_window() else None
+    
+    yield
+    
+    scheduler_task.cancel()
+    sweeper_task.cancel()
+    if rotation_task:
+        rotation_task.cancel()
+    if relay:
+        await relay.stop()
+    await engine.dispose()
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.API_VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -46,152 +157,504 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Brotli/gzip for API responses, public payloads are compressed once per version
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    cache_size=settings.COMPRESSION_CACHE_SIZE
+)
+
+# Request, SQL and S3 timings for Prometheus
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine.sync_engine)
+    if settings.STORAGE_BACKEND == "s3":
+        instrument_s3_client(storage.s3_client)
+
+# SQL statement profiles, for every request or ones sending X-Query-Profile
+if settings.QUERY_PROFILING or settings.QUERY_PROFILE_TOKEN:
+    app.add_middleware(
+        QueryProfilerMiddleware,
+        enabled=settings.QUERY_PROFILING,
+        explain=settings.QUERY_PROFILING_EXPLAIN,
+        token=settings.QUERY_PROFILE_TOKEN
+    )
+    enable_query_profiling(engine.sync_engine)
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "timestamp": get_current_time_utc()}
 
+# Prometheus scrape endpoint, not proxied by nginx
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=404, detail="Not Found")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+async def resolve_countdown(countdown_slug: str) -> CountdownInfo:
+    """
+    Countdown by slug, 404 if there is none.
+
+    Directory misses query through their own short-lived session rather than
+    the request's, so event streams don't hold a pooled connection open.
+    """
+    countdown = countdown_directory.get(countdown_slug)
+    if countdown is None:
+        # Created through another worker since this one loaded its directory
+        async with SessionLocal() as db:
+            row = await db.scalar(select(Countdown).where(Countdown.slug == countdown_slug))
+            if not row:
+                raise HTTPException(status_code=404, detail="Countdown not found")
+            countdown = countdown_directory.add(row)
+            await unlock_schedule.load(db, countdown.id)
+    return countdown
+
+async def get_countdown(countdown_slug: str) -> CountdownInfo:
+    """Countdown named by the path's slug, on the /api/countdowns/{countdown_slug} routes."""
+    return await resolve_countdown(countdown_slug)
+
+async def get_default_countdown() -> CountdownInfo:
+    """Default countdown (DEFAULT_COUNTDOWN), on the legacy /api/countdown routes."""
+    return await resolve_countdown(settings.DEFAULT_COUNTDOWN)
+
+def default_countdown_route(route: Callable) -> Callable:
+    """
+    Also register an endpoint on a legacy route, serving the default countdown.
+
+    The endpoint is declared with Depends(get_countdown); on the legacy route that
+    dependency becomes get_default_countdown, so the slug can't be passed there.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        signature = inspect.signature(endpoint)
+        parameters = [
+            parameter.replace(default=Depends(get_default_countdown)) if parameter.name == "countdown" else parameter
+            for parameter in signature.parameters.values()
+        ]
+        
+        @functools.wraps(endpoint)
+        async def legacy_endpoint(**kwargs):
+            return await endpoint(**kwargs)
+        
+        legacy_endpoint.__signature__ = signature.replace(parameters=parameters)
+        route(legacy_endpoint)
+        return endpoint
+    return decorator
+
+async def run_per_countdown(
+    countdown_ids: Iterable[int],
+    func: Callable[[int], Awaitable[None]],
+    action: str
+) -> None:
+    """Run a coroutine function for several countdowns, a database pool's worth at a time."""
+    semaphore = asyncio.Semaphore(settings.DB_POOL_SIZE)
+    
+    async def run(countdown_id: int) -> None:
+        async with semaphore:
+            try:
+                await func(countdown_id)
+            except Exception as e:
+                print(f"Failed to {action} countdown {countdown_id}: {str(e)}")
+    
+    await asyncio.gather(*(run(countdown_id) for countdown_id in countdown_ids))
+
 # Helper function to add media URLs
-def add_media_urls(obj):
-    """Add public URLs to media assets"""
-    if hasattr(obj, 'url') and hasattr(obj, 'file_key'):
-        obj.url = s3_service.get_public_url(obj.file_key)
-    return obj
+def add_media_urls(media: MediaAsset) -> MediaAssetResponse:
+    """Build a media asset response with URLs for the original and its variants"""
+    return MediaAssetResponse.model_validate(serialize_media(media))
 
 # Public endpoints for countdown display
-@app.get("/api/countdown", response_model=CountdownOverviewResponse)
-async def get_countdown_overview(db: Session = Depends(get_db)):
+# /api/countdown routes serve the default countdown (DEFAULT_COUNTDOWN), /api/countdowns/{countdown_slug} any countdown
+@default_countdown_route(app.get("/api/countdown", response_model=CountdownOverviewResponse, response_class=FastJSONResponse))
+@app.get("/api/countdowns/{countdown_slug}", response_model=CountdownOverviewResponse, response_class=FastJSONResponse)
+async def get_countdown_overview(
+    request: Request,
+    countdown: CountdownInfo = Depends(get_countdown),
+    db: AsyncSession = Depends(get_db)
+):
     """Get overview of all countdown days with unlock status."""
-    days = db.query(CountdownDay).options(
-        joinedload(CountdownDay.sections).joinedload(DaySection.media_asset),
+    overview, etag, last_modified = await countdown_cache.get_or_build(
+        overview_cache_key(countdown.id),
+        lambda: build_countdown_overview(db, countdown, get_current_time_utc())
+    )
+    
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return FastJSONResponse(overview, headers=headers)
+
+async def build_countdown_overview(
+    db: AsyncSession,
+    countdown: CountdownInfo,
+    now: datetime
+) -> tuple[tuple[bytes, str, datetime], Optional[datetime]]:
+    """Build the encoded public overview as of a given time with its validators, and the next release time that will change it."""
+    # Collections load in their own query, joining them would repeat every day row per section
+    result = await db.execute(select(CountdownDay).options(
+        selectinload(CountdownDay.sections).joinedload(DaySection.media_asset),
         joinedload(CountdownDay.background_audio)
-    ).order_by(CountdownDay.day_number.desc()).all()
+    ).where(CountdownDay.countdown_id == countdown.id).order_by(CountdownDay.day_number.desc()))
+    days = result.scalars().all()
     
-    current_time = get_current_time_utc()
+    # Sign the media URLs of every unlocked day in one batch
+    await storage.prepare_media_urls(
+        file_key
+        for day in days if is_content_unlocked(day.release_datetime_utc, current_utc=now)
+        for file_key in day_media_file_keys(day)
+    )
     
     # Find the currently unlocked day (highest day number that's unlocked)
     current_day = None
     
+    # Earliest release still pending, the overview is stale from then on
+    next_release = None
+    
+    # Content fingerprint for ETag / Last-Modified
+    last_modified = None
+    section_count = 0
+    unlocked_days = []
+    
     public_days = []
     for day in days:
-        is_unlocked = is_content_unlocked(day.release_datetime_utc)
+        is_unlocked = is_content_unlocked(day.release_datetime_utc, current_utc=now)
         
         # Set current day to the highest unlocked day number
         if is_unlocked and (current_day is None or day.day_number > current_day):
             current_day = day.day_number
         
-        # Only include content for unlocked days
-        content_html = day.content_html if is_unlocked else None
-        sections = []
-        background_audio = None
-        audio_config = None
+        if not is_unlocked and (next_release is None or day.release_datetime_utc < next_release):
+            next_release = day.release_datetime_utc
         
+        day_modified = get_day_last_modified(
+            now,
+            day.release_datetime_utc if is_unlocked else None,
+            day.updated_at,
+            *(section.updated_at for section in day.sections)
+        )
+        if last_modified is None or day_modified > last_modified:
+            last_modified = day_modified
+        section_count += len(day.sections)
         if is_unlocked:
-            # Add sections with media URLs
-            for section in day.sections:
-                section_dict = {
-                    "id": section.id,
-                    "section_type": section.section_type,
-                    "content_text": section.content_text,
-                    "position_order": section.position_order,
-                    "style_config": section.style_config,
-                    "media_asset": None
-                }
-                
-                if section.media_asset:
-                    section_dict["media_asset"] = add_media_urls(section.media_asset)
-                
-                sections.append(section_dict)
-            
-            # Add background audio
-            if day.background_audio:
-                background_audio = add_media_urls(day.background_audio)
-            audio_config = day.audio_config
+            unlocked_days.append(day.day_number)
         
-        public_days.append({
-            "day_number": day.day_number,
-            "title": day.title,
-            "content_html": content_html,
-            "sections": sections,
-            "background_audio": background_audio,
-            "audio_config": audio_config,
-            "is_unlocked": is_unlocked
-        })
-    
-    return CountdownOverviewResponse(
-        days=public_days,
-        current_day=current_day,
-        total_days=25
+        public_days.append(serialize_public_day(day, is_unlocked))
+    
+    overview = dumps({
+        "days": public_days,
+        "current_day": current_day,
+        "total_days": countdown.total_days
+    })
+    last_modified, next_release = align_with_media_urls(last_modified or now, next_release)
+    etag = make_etag("overview", countdown.id, last_modified.isoformat(), section_count, unlocked_days)
+    return (overview, etag, last_modified), next_release
+
+def get_day_last_modified(now: datetime, *timestamps: Optional[datetime]) -> datetime:
+    """Latest of a day's timestamps, ignoring missing ones."""
+    return max((ts for ts in timestamps if ts is not None), default=now)
+
+def align_with_media_urls(
+    last_modified: datetime,
+    expires_at: Optional[datetime]
+) -> tuple[datetime, Optional[datetime]]:
+    """
+    Tie a payload's validators and cache lifetime to the presigned URLs it embeds.
+    
+    Payloads built in a new signing window get a newer Last-Modified (and so a
+    new ETag), and cached payloads expire when their window ends. Public URLs
+    never change and leave both as they are.
+    """
+    window = storage.media_url_window()
+    if window is None:
+        return last_modified, expires_at
+    
+    window_start, window_end = window
+    if expires_at is None or window_end < expires_at:
+        expires_at = window_end
+    return max(last_modified, window_start), expires_at
+
+# Registered before /api/countdown/{day_number} so "summary" isn't taken for a day number
+@default_countdown_route(app.get("/api/countdown/summary", response_model=CountdownSummaryResponse, response_class=FastJSONResponse))
+@app.get("/api/countdowns/{countdown_slug}/summary", response_model=CountdownSummaryResponse, response_class=FastJSONResponse)
+async def get_countdown_summary(
+    request: Request,
+    countdown: CountdownInfo = Depends(get_countdown),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the countdown grid: titles, unlock status and cover images, without day content."""
+    summary, etag, last_modified = await countdown_cache.get_or_build(
+        summary_cache_key(countdown.id),
+        lambda: build_countdown_summary(db, countdown, get_current_time_utc())
+    )
+    
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return FastJSONResponse(summary, headers=headers)
+
+async def build_countdown_summary(
+    db: AsyncSession,
+    countdown: CountdownInfo,
+    now: datetime
+) -> tuple[tuple[bytes, str, datetime], Optional[datetime]]:
+    """Build the encoded grid summary as of a given time with its validators, and the next release time that will change it."""
+    # Only the columns the grid shows, section timestamps are aggregated for the validators
+    sections = select(
+        DaySection.day_number,
+        func.count().label("section_count"),
+        func.max(DaySection.updated_at).label("updated_at")
+    ).where(DaySection.countdown_id == countdown.id).group_by(DaySection.day_number).subquery()
+    result = await db.execute(select(
+        CountdownDay.day_number,
+        CountdownDay.title,
+        CountdownDay.release_datetime_utc,
+        CountdownDay.updated_at,
+        func.coalesce(sections.c.section_count, 0).label("section_count"),
+        sections.c.updated_at.label("sections_updated_at")
+    ).outerjoin(
+        sections, sections.c.day_number == CountdownDay.day_number
+    ).where(CountdownDay.countdown_id == countdown.id).order_by(CountdownDay.day_number.desc()))
+    days = result.all()
+    
+    current_day = None
+    next_release = None
+    last_modified = None
+    section_count = 0
+    unlocked_days = []
+    
+    for day in days:
+        is_unlocked = is_content_unlocked(day.release_datetime_utc, current_utc=now)
+        if is_unlocked:
+            unlocked_days.append(day.day_number)
+            if current_day is None or day.day_number > current_day:
+                current_day = day.day_number
+        elif next_release is None or day.release_datetime_utc < next_release:
+            next_release = day.release_datetime_utc
+        
+        day_modified = get_day_last_modified(
+            now,
+            day.release_datetime_utc if is_unlocked else None,
+            day.updated_at,
+            day.sections_updated_at
+        )
+        if last_modified is None or day_modified > last_modified:
+            last_modified = day_modified
+        section_count += day.section_count
+    
+    covers = await get_cover_images(db, countdown.id, unlocked_days)
+    summary = dumps({
+        "days": [
+            {
+                "day_number": day.day_number,
+                "title": day.title,
+                "is_unlocked": day.day_number in unlocked_days,
+                "cover_image": covers.get(day.day_number),
+            }
+            for day in days
+        ],
+        "current_day": current_day,
+        "total_days": countdown.total_days
+    })
+    last_modified, next_release = align_with_media_urls(last_modified or now, next_release)
+    etag = make_etag("summary", countdown.id, last_modified.isoformat(), section_count, unlocked_days)
+    return (summary, etag, last_modified), next_release
+
+async def get_cover_images(db: AsyncSession, countdown_id: int, day_numbers: list[int]) -> dict[int, dict]:
+    """Cover image data per day of a countdown: the media of its first image section."""
+    if not day_numbers:
+        return {}
+    
+    # Rank each day's image sections, the first one is the cover
+    ranked = select(
+        DaySection.day_number,
+        DaySection.media_asset_id,
+        func.row_number().over(
+            partition_by=DaySection.day_number,
+            order_by=DaySection.position_order
+        ).label("rank")
+    ).join(MediaAsset, MediaAsset.id == DaySection.media_asset_id).where(
+        DaySection.countdown_id == countdown_id,
+        DaySection.day_number.in_(day_numbers),
+        DaySection.section_type == "image",
+        MediaAsset.mime_type.like("image/%")
+    ).subquery()
+    result = await db.execute(select(
+        ranked.c.day_number,
+        MediaAsset.file_key,
+        MediaAsset.width,
+        MediaAsset.height,
+        MediaAsset.placeholder,
+        MediaAsset.variants
+    ).join(MediaAsset, MediaAsset.id == ranked.c.media_asset_id).where(ranked.c.rank == 1))
+    rows = result.all()
+    
+    await storage.prepare_media_urls(
+        file_key
+        for row in rows
+        for file_key in [row.file_key, *(variant["file_key"] for variant in row.variants or [])]
+    )
+    return {
+        row.day_number: serialize_cover(row.file_key, row.width, row.height, row.placeholder, row.variants)
+        for row in rows
+    }
+
+# Registered before /api/countdown/{day_number} so "events" isn't taken for a day number
+@default_countdown_route(app.get("/api/countdown/events"))
+@app.get("/api/countdowns/{countdown_slug}/events")
+async def get_countdown_events(
+    last_event_id: Optional[str] = Header(None),
+    countdown: CountdownInfo = Depends(get_countdown)
+):
+    """Server-sent events for day unlocks ("unlock") and published content changes ("content")."""
+    return StreamingResponse(
+        countdown_events.broker(countdown.id).stream(last_event_id, settings.EVENT_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop nginx from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
     )
 
-@app.get("/api/countdown/{day_number}", response_model=PublicCountdownDayResponse)
+@default_countdown_route(app.get("/api/countdown/{day_number}", response_model=PublicCountdownDayResponse, response_class=FastJSONResponse))
+@app.get("/api/countdowns/{countdown_slug}/{day_number}", response_model=PublicCountdownDayResponse, response_class=FastJSONResponse)
 async def get_countdown_day(
     day_number: int,
+    request: Request,
     preview_token: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    countdown: CountdownInfo = Depends(get_countdown),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get specific countdown day content."""
-    if day_number < 1 or day_number > 25:
+    if day_number < 1 or day_number > countdown.total_days:
         raise HTTPException(status_code=404, detail="Day not found")
     
-    day = db.query(CountdownDay).options(
-        joinedload(CountdownDay.sections).joinedload(DaySection.media_asset),
+    if preview_token and verify_preview_token(preview_token):
+        # Previews can differ from the public payload, don't cache them
+        (day, etag, last_modified), _ = await build_countdown_day(
+            db, countdown, day_number, get_current_time_utc(), preview_token
+        )
+    else:
+        day, etag, last_modified = await countdown_cache.get_or_build(
+            day_cache_key(countdown.id, day_number),
+            lambda: build_countdown_day(db, countdown, day_number, get_current_time_utc())
+        )
+    
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return FastJSONResponse(day, headers=headers)
+
+async def build_countdown_day(
+    db: AsyncSession,
+    countdown: CountdownInfo,
+    day_number: int,
+    now: datetime,
+    preview_token: Optional[str] = None
+) -> tuple[tuple[bytes, str, datetime], Optional[datetime]]:
+    """Build an encoded public day payload as of a given time with its validators, and the release time that will change it."""
+    result = await db.execute(select(CountdownDay).options(
+        selectinload(CountdownDay.sections).joinedload(DaySection.media_asset),
         joinedload(CountdownDay.background_audio)
-    ).filter(CountdownDay.day_number == day_number).first()
+    ).where(CountdownDay.countdown_id == countdown.id, CountdownDay.day_number == day_number))
+    day = result.scalars().first()
     
     if not day:
         raise HTTPException(status_code=404, detail="Day not found")
     
     # Check if content is unlocked
-    unlocked = is_content_unlocked(day.release_datetime_utc, preview_token)
-    
-    if not unlocked:
-        # Return limited info for locked content
-        return PublicCountdownDayResponse(
-            day_number=day.day_number,
-            title=day.title,
-            content_html=None,
-            sections=[],
-            background_audio=None,
-            audio_config=None,
-            is_unlocked=False
-        )
+    unlocked = is_content_unlocked(day.release_datetime_utc, preview_token, current_utc=now)
+    if unlocked:
+        await storage.prepare_media_urls(day_media_file_keys(day))
     
-    # Prepare sections with media URLs
-    sections = []
-    for section in day.sections:
-        section_dict = {
-            "id": section.id,
-            "section_type": section.section_type,
-            "content_text": section.content_text,
-            "position_order": section.position_order,
-            "style_config": section.style_config,
-            "media_asset": None
-        }
+    last_modified, expires_at = align_with_media_urls(
+        get_day_last_modified(
+            now,
+            day.release_datetime_utc if unlocked else None,
+            day.updated_at,
+            *(section.updated_at for section in day.sections)
+        ),
+        None if unlocked else day.release_datetime_utc
+    )
+    etag = make_etag("day", countdown.id, day_number, last_modified.isoformat(), len(day.sections), unlocked)
+    
+    # Locked days only expose limited info
+    payload = dumps(serialize_public_day(day, unlocked))
+    return (payload, etag, last_modified), expires_at
+
+async def prewarm_release(release_at: datetime, releases: dict[int, list[int]]) -> None:
+    """Build the payloads a release changes ahead of time, swapped in when it happens."""
+    async def prewarm(countdown_id: int) -> None:
+        countdown = countdown_directory.by_id(countdown_id)
+        if countdown:
+            await prewarm_countdown_release(countdown, release_at, releases[countdown_id])
+    
+    # Countdowns often share release times, warm them side by side
+    await run_per_countdown(releases, prewarm, "prewarm")
+
+async def prewarm_countdown_release(countdown: CountdownInfo, release_at: datetime, day_numbers: list[int]) -> None:
+    """Build the payloads one countdown's release changes, swapped in when it happens."""
+    generation = countdown_cache.generation(countdown.id)
+    async with SessionLocal() as db:
+        overview, expires_at = await build_countdown_overview(db, countdown, release_at)
+        countdown_cache.stage(overview_cache_key(countdown.id), overview, release_at, expires_at, generation)
         
-        if section.media_asset:
-            section_dict["media_asset"] = add_media_urls(section.media_asset)
+        summary, expires_at = await build_countdown_summary(db, countdown, release_at)
+        countdown_cache.stage(summary_cache_key(countdown.id), summary, release_at, expires_at, generation)
         
-        sections.append(section_dict)
-    
-    # Add background audio URL
-    background_audio = None
-    if day.background_audio:
-        background_audio = add_media_urls(day.background_audio)
-    
-    return PublicCountdownDayResponse(
-        day_number=day.day_number,
-        title=day.title,
-        content_html=day.content_html,
-        sections=sections,
-        background_audio=background_audio,
-        audio_config=day.audio_config,
-        is_unlocked=True
-    )
+        for day_number in day_numbers:
+            day, expires_at = await build_countdown_day(db, countdown, day_number, release_at)
+            countdown_cache.stage(day_cache_key(countdown.id, day_number), day, release_at, expires_at, generation)
+        
+        if storage.proxied and not storage.local:
+            # Pull the unlocking days' media to disk before their listeners arrive
+            result = await db.execute(select(CountdownDay).options(
+                selectinload(CountdownDay.sections).joinedload(DaySection.media_asset),
+                joinedload(CountdownDay.background_audio)
+            ).where(CountdownDay.countdown_id == countdown.id, CountdownDay.day_number.in_(day_numbers)))
+            media_cache.warm(file_key for day in result.scalars() for file_key in day_media_file_keys(day))
+
+async def render_snapshots(countdown_id: int) -> dict[str, bytes]:
+    """Public payloads of a countdown to publish as static files: the overview, the grid summary and every unlocked day."""
+    countdown = countdown_directory.by_id(countdown_id)
+    if countdown is None:
+        return {}
+    
+    now = get_current_time_utc()
+    async with SessionLocal() as db:
+        overview, _, _ = await countdown_cache.get_or_build(
+            overview_cache_key(countdown.id),
+            lambda: build_countdown_overview(db, countdown, now)
+        )
+        summary, _, _ = await countdown_cache.get_or_build(
+            summary_cache_key(countdown.id),
+            lambda: build_countdown_summary(db, countdown, now)
+        )
+        files = {"": overview, "/summary": summary}
+        
+        # Locked days are never written, nginx falls back to the backend for them
+        for day_number in unlock_schedule.unlocked_days(countdown.id, now):
+            day, _, _ = await countdown_cache.get_or_build(
+                day_cache_key(countdown.id, day_number),
+                lambda: build_countdown_day(db, countdown, day_number, now)
+            )
+            files[f"/{day_number}"] = day
+    
+    # The default countdown is published under the /api/countdown routes too
+    paths = [f"api/countdowns/{countdown.slug}"]
+    if countdown.slug == settings.DEFAULT_COUNTDOWN:
+        paths.append("api/countdown")
+    return {path + suffix: body for path in paths for suffix, body in files.items()}
 
 # Admin authentication endpoints
 @app.post("/api/admin/login", response_model=AdminLoginResponse)
-async def admin_login(login_data: AdminLoginRequest, db: Session = Depends(get_db)):
+async def admin_login(login_data: AdminLoginRequest, db: AsyncSession = Depends(get_db)):
     """Admin login endpoint."""
     if not verify_admin_password(login_data.password):
         raise HTTPException(
@@ -199,156 +662,188 @@ async def admin_login(login_data: AdminLoginRequest, db: Session = Depends(get_d
             detail="Invalid admin password"
         )
     
-    access_token = create_admin_session(db)
+    access_token = await create_admin_session(db)
     return AdminLoginResponse(access_token=access_token)
 
+@app.post("/api/admin/logout", response_model=ValidationResponse)
+async def admin_logout(
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Admin logout endpoint, revokes the current session."""
+    await revoke_admin_session(db, current_admin["session_id"])
+    return ValidationResponse(valid=False, message="Logged out")
+
 @app.post("/api/admin/validate-token", response_model=ValidationResponse)
 async def validate_admin_token(current_admin: dict = Depends(get_current_admin)):
     """Validate admin token."""
     return ValidationResponse(valid=True, message="Token is valid")
 
 # Admin countdown management endpoints
-@app.get("/api/admin/countdown", response_model=List[CountdownDayResponse])
+@app.get("/api/admin/countdowns", response_model=List[CountdownResponse])
+async def list_countdowns(
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """List countdowns, a page at a time."""
+    result = await db.execute(select(Countdown).order_by(Countdown.id).limit(limit).offset(offset))
+    return result.scalars().all()
+
+@app.post("/api/admin/countdowns", response_model=CountdownResponse, status_code=201)
+async def create_countdown(
+    countdown_data: CountdownCreate,
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a countdown with all its days, the highest day unlocking first."""
+    countdown = Countdown(
+        slug=countdown_data.slug,
+        title=countdown_data.title,
+        total_days=countdown_data.total_days
+    )
+    interval = timedelta(hours=countdown_data.release_interval_hours)
+    try:
+        db.add(countdown)
+        await db.flush()
+        await db.execute(insert(CountdownDay), [
+            {
+                "countdown_id": countdown.id,
+                "day_number": day_number,
+                "title": f"Day {day_number}",
+                "release_datetime_utc": countdown_data.first_release_utc + (countdown_data.total_days - day_number) * interval,
+                "audio_config": {}
+            }
+            for day_number in range(1, countdown_data.total_days + 1)
+        ])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A countdown with this slug already exists")
+    
+    await db.refresh(countdown)
+    countdown_directory.add(countdown)
+    await unlock_schedule.load(db, countdown.id)
+    return countdown
+
+@default_countdown_route(app.get("/api/admin/countdown", response_model=List[CountdownDayResponse], response_class=FastJSONResponse))
+@app.get("/api/admin/countdowns/{countdown_slug}", response_model=List[CountdownDayResponse], response_class=FastJSONResponse)
 async def get_admin_countdown_overview(
+    countdown: CountdownInfo = Depends(get_countdown),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all countdown days for admin with full details."""
-    days = db.query(CountdownDay).options(
-        joinedload(CountdownDay.sections).joinedload(DaySection.media_asset),
-        joinedload(CountdownDay.media_assets),
+    result = await db.execute(select(CountdownDay).options(
+        selectinload(CountdownDay.sections).joinedload(DaySection.media_asset),
+        selectinload(CountdownDay.media_assets),
         joinedload(CountdownDay.background_audio)
-    ).order_by(CountdownDay.day_number.desc()).all()
+    ).where(CountdownDay.countdown_id == countdown.id).order_by(CountdownDay.day_number.desc()))
+    days = result.scalars().all()
+    await storage.prepare_media_urls(
+        file_key for day in days for file_key in day_media_file_keys(day, include_assets=True)
+    )
     
-    result = []
-    for day in days:
-        # Add computed field for unlock status
-        day_dict = {
+    now = get_current_time_utc()
+    return FastJSONResponse([
+        serialize_admin_day(day, is_content_unlocked(day.release_datetime_utc, current_utc=now))
+        for day in days
+    ])
+
+# Registered before /api/admin/countdown/{day_number} so "summary" isn't taken for a day number
+@default_countdown_route(app.get("/api/admin/countdown/summary", response_model=List[AdminDaySummaryResponse], response_class=FastJSONResponse))
+@app.get("/api/admin/countdowns/{countdown_slug}/summary", response_model=List[AdminDaySummaryResponse], response_class=FastJSONResponse)
+async def get_admin_countdown_summary(
+    countdown: CountdownInfo = Depends(get_countdown),
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get every day with its section count and media usage, aggregated in one query."""
+    sections = select(
+        DaySection.day_number,
+        func.count().label("section_count")
+    ).where(DaySection.countdown_id == countdown.id).group_by(DaySection.day_number).subquery()
+    media = select(
+        MediaAsset.day_number,
+        func.count().label("media_count"),
+        func.sum(MediaAsset.file_size).label("media_bytes")
+    ).where(MediaAsset.countdown_id == countdown.id).group_by(MediaAsset.day_number).subquery()
+    
+    result = await db.execute(select(
+        CountdownDay.id,
+        CountdownDay.day_number,
+        CountdownDay.title,
+        CountdownDay.release_datetime_utc,
+        CountdownDay.updated_at,
+        (func.length(func.coalesce(CountdownDay.content_html, "")) > 0).label("has_html"),
+        func.coalesce(sections.c.section_count, 0).label("section_count"),
+        func.coalesce(media.c.media_count, 0).label("media_count"),
+        func.coalesce(media.c.media_bytes, 0).label("media_bytes")
+    ).outerjoin(
+        sections, sections.c.day_number == CountdownDay.day_number
+    ).outerjoin(
+        media, media.c.day_number == CountdownDay.day_number
+    ).where(CountdownDay.countdown_id == countdown.id).order_by(CountdownDay.day_number.desc()))
+    
+    now = get_current_time_utc()
+    return FastJSONResponse([
+        {
             "id": day.id,
             "day_number": day.day_number,
             "title": day.title,
-            "content_html": day.content_html,
-            "background_audio_id": day.background_audio_id,
-            "audio_config": day.audio_config,
             "release_datetime_utc": day.release_datetime_utc,
-            "created_at": day.created_at,
             "updated_at": day.updated_at,
-            "is_unlocked": is_content_unlocked(day.release_datetime_utc),
-            "sections": [],
-            "media_assets": [],
-            "background_audio": None
+            "is_unlocked": is_content_unlocked(day.release_datetime_utc, current_utc=now),
+            "has_content": bool(day.has_html) or day.section_count > 0,
+            "section_count": day.section_count,
+            "media_count": day.media_count,
+            "media_bytes": int(day.media_bytes),
         }
-        
-        # Add sections with media URLs
-        for section in day.sections:
-            section_dict = {
-                "id": section.id,
-                "section_type": section.section_type,
-                "content_text": section.content_text,
-                "position_order": section.position_order,
-                "style_config": section.style_config,
-                "media_asset_id": section.media_asset_id,
-                "day_number": section.day_number,
-                "created_at": section.created_at,
-                "updated_at": section.updated_at,
-                "media_asset": None
-            }
-            
-            if section.media_asset:
-                section_dict["media_asset"] = add_media_urls(section.media_asset)
-            
-            day_dict["sections"].append(section_dict)
-        
-        # Add media assets URLs
-        for media in day.media_assets:
-            day_dict["media_assets"].append(add_media_urls(media))
-        
-        # Add background audio
-        if day.background_audio:
-            day_dict["background_audio"] = add_media_urls(day.background_audio)
-        
-        result.append(day_dict)
-    
-    return result
+        for day in result
+    ])
 
-@app.get("/api/admin/countdown/{day_number}", response_model=CountdownDayResponse)
+@default_countdown_route(app.get("/api/admin/countdown/{day_number}", response_model=CountdownDayResponse, response_class=FastJSONResponse))
+@app.get("/api/admin/countdowns/{countdown_slug}/{day_number}", response_model=CountdownDayResponse, response_class=FastJSONResponse)
 async def get_admin_countdown_day(
     day_number: int,
+    countdown: CountdownInfo = Depends(get_countdown),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get specific countdown day for admin."""
-    if day_number < 1 or day_number > 25:
+    if day_number < 1 or day_number > countdown.total_days:
         raise HTTPException(status_code=404, detail="Day not found")
     
-    day = db.query(CountdownDay).options(
-        joinedload(CountdownDay.sections).joinedload(DaySection.media_asset),
-        joinedload(CountdownDay.media_assets),
+    result = await db.execute(select(CountdownDay).options(
+        selectinload(CountdownDay.sections).joinedload(DaySection.media_asset),
+        selectinload(CountdownDay.media_assets),
         joinedload(CountdownDay.background_audio)
-    ).filter(CountdownDay.day_number == day_number).first()
+    ).where(CountdownDay.countdown_id == countdown.id, CountdownDay.day_number == day_number))
+    day = result.scalars().first()
     
     if not day:
         raise HTTPException(status_code=404, detail="Day not found")
     
-    # Prepare response
-    day_dict = {
-        "id": day.id,
-        "day_number": day.day_number,
-        "title": day.title,
-        "content_html": day.content_html,
-        "background_audio_id": day.background_audio_id,
-        "audio_config": day.audio_config,
-        "release_datetime_utc": day.release_datetime_utc,
-        "created_at": day.created_at,
-        "updated_at": day.updated_at,
-        "is_unlocked": is_content_unlocked(day.release_datetime_utc),
-        "sections": [],
-        "media_assets": [],
-        "background_audio": None
-    }
-    
-    # Add sections with media URLs
-    for section in day.sections:
-        section_dict = {
-            "id": section.id,
-            "section_type": section.section_type,
-            "content_text": section.content_text,
-            "position_order": section.position_order,
-            "style_config": section.style_config,
-            "media_asset_id": section.media_asset_id,
-            "day_number": section.day_number,
-            "created_at": section.created_at,
-            "updated_at": section.updated_at,
-            "media_asset": None
-        }
-        
-        if section.media_asset:
-            section_dict["media_asset"] = add_media_urls(section.media_asset)
-        
-        day_dict["sections"].append(section_dict)
-    
-    # Add media assets URLs
-    for media in day.media_assets:
-        day_dict["media_assets"].append(add_media_urls(media))
-    
-    # Add background audio
-    if day.background_audio:
-        day_dict["background_audio"] = add_media_urls(day.background_audio)
-    
-    return day_dict
+    await storage.prepare_media_urls(day_media_file_keys(day, include_assets=True))
+    return FastJSONResponse(serialize_admin_day(day, is_content_unlocked(day.release_datetime_utc)))
 
-@app.put("/api/admin/countdown/{day_number}", response_model=CountdownDayResponse)
+@default_countdown_route(app.put("/api/admin/countdown/{day_number}", response_model=CountdownDayResponse))
+@app.put("/api/admin/countdowns/{countdown_slug}/{day_number}", response_model=CountdownDayResponse)
 async def update_countdown_day(
     day_number: int,
     update_data: CountdownDayUpdate,
+    countdown: CountdownInfo = Depends(get_countdown),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update countdown day content."""
-    if day_number < 1 or day_number > 25:
+    if day_number < 1 or day_number > countdown.total_days:
         raise HTTPException(status_code=404, detail="Day not found")
     
-    day = db.query(CountdownDay).filter(CountdownDay.day_number == day_number).first()
+    day = await db.scalar(select(CountdownDay).where(
+        CountdownDay.countdown_id == countdown.id, CountdownDay.day_number == day_number
+    ))
     if not day:
         raise HTTPException(status_code=404, detail="Day not found")
     
@@ -358,110 +853,463 @@ async def update_countdown_day(
     if update_data.content_html is not None:
         day.content_html = update_data.content_html
     if update_data.background_audio_id is not None:
+        if update_data.background_audio_id != day.background_audio_id:
+            await check_countdown_media(db, countdown.id, [update_data.background_audio_id])
         day.background_audio_id = update_data.background_audio_id
     if update_data.audio_config is not None:
         day.audio_config = update_data.audio_config.dict() if update_data.audio_config else {}
     
     day.updated_at = get_current_time_utc()
     
-    db.commit()
-    db.refresh(day)
+    await db.commit()
+    await db.refresh(day)
+    countdown_cache.invalidate(countdown.id)
     
     # Return updated day
-    return await get_admin_countdown_day(day_number, current_admin, db)
+    return await get_admin_countdown_day(day_number, countdown, current_admin, db)
 
 # Section management endpoints
-@app.get("/api/admin/countdown/{day_number}/sections", response_model=SectionsResponse)
+@default_countdown_route(app.get("/api/admin/countdown/{day_number}/sections", response_model=SectionsResponse))
+@app.get("/api/admin/countdowns/{countdown_slug}/{day_number}/sections", response_model=SectionsResponse)
 async def get_day_sections(
     day_number: int,
+    countdown: CountdownInfo = Depends(get_countdown),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all sections for a specific day."""
-    if day_number < 1 or day_number > 25:
+    if day_number < 1 or day_number > countdown.total_days:
         raise HTTPException(status_code=404, detail="Day not found")
     
-    sections = db.query(DaySection).options(
+    result = await db.execute(select(DaySection).options(
         joinedload(DaySection.media_asset)
-    ).filter(DaySection.day_number == day_number).order_by(DaySection.position_order).all()
-    
-    sections_data = []
-    for section in sections:
-        section_dict = {
-            "id": section.id,
-            "section_type": section.section_type,
-            "content_text": section.content_text,
-            "position_order": section.position_order,
-            "style_config": section.style_config,
-            "media_asset_id": section.media_asset_id,
-            "day_number": section.day_number,
-            "created_at": section.created_at,
-            "updated_at": section.updated_at,
-            "media_asset": None
-        }
-        
-        if section.media_asset:
-            section_dict["media_asset"] = add_media_urls(section.media_asset)
-        
-        sections_data.append(section_dict)
+    ).where(
+        DaySection.countdown_id == countdown.id, DaySection.day_number == day_number
+    ).order_by(DaySection.position_order))
+    sections = result.scalars().all()
     
-    return SectionsResponse(sections=sections_data)
+    return SectionsResponse(sections=[
+        build_section_response(get_section_values(section), section.media_asset) for section in sections
+    ])
+
+# Columns compared when diffing submitted sections against stored ones
+SECTION_FIELDS = ("section_type", "content_text", "position_order", "style_config", "media_asset_id")
+
+def get_section_values(section: DaySection) -> dict:
+    """Column values of a section row."""
+    return {
+        "id": section.id,
+        "day_number": section.day_number,
+        "created_at": section.created_at,
+        "updated_at": section.updated_at,
+        **{field: getattr(section, field) for field in SECTION_FIELDS}
+    }
 
-@app.put("/api/admin/countdown/{day_number}/sections", response_model=SectionsResponse)
+def is_section_unchanged(section: DaySection, values: dict) -> bool:
+    """Check if submitted section values match the stored row."""
+    for field in SECTION_FIELDS:
+        stored = getattr(section, field)
+        if field == "style_config":
+            # Compare with defaults filled in, as clients send back what they were given
+            stored = SectionStyleConfig(**(stored or {})).dict()
+        if stored != values[field]:
+            return False
+    return True
+
+def build_section_response(values: dict, media_asset: Optional[MediaAsset]) -> dict:
+    """Section response data from a section's column values."""
+    return {**values, "media_asset": add_media_urls(media_asset) if media_asset else None}
+
+@default_countdown_route(app.put("/api/admin/countdown/{day_number}/sections", response_model=SectionsResponse))
+@app.put("/api/admin/countdowns/{countdown_slug}/{day_number}/sections", response_model=SectionsResponse)
 async def update_day_sections(
     day_number: int,
     sections_data: SectionsUpdateRequest,
+    countdown: CountdownInfo = Depends(get_countdown),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Update all sections for a specific day."""
-    if day_number < 1 or day_number > 25:
+    """Update all sections for a specific day, touching only rows that changed."""
+    if day_number < 1 or day_number > countdown.total_days:
         raise HTTPException(status_code=404, detail="Day not found")
     
     # Verify day exists
-    day = db.query(CountdownDay).filter(CountdownDay.day_number == day_number).first()
+    day = await db.scalar(select(CountdownDay).where(
+        CountdownDay.countdown_id == countdown.id, CountdownDay.day_number == day_number
+    ))
     if not day:
         raise HTTPException(status_code=404, detail="Day not found")
     
-    # Delete existing sections
-    db.query(DaySection).filter(DaySection.day_number == day_number).delete()
+    result = await db.execute(select(DaySection).options(
+        joinedload(DaySection.media_asset)
+    ).where(DaySection.countdown_id == countdown.id, DaySection.day_number == day_number))
+    existing = {section.id: section for section in result.unique().scalars()}
     
-    # Create new sections
+    now = get_current_time_utc()
+    final_rows, inserts, updates, moved_ids, linked_media_ids = [], [], [], [], []
     for section_data in sections_data.sections:
-        section = DaySection(
-            day_number=day_number,
-            section_type=section_data.section_type,
-            content_text=section_data.content_text,
-            position_order=section_data.position_order,
-            style_config=section_data.style_config.dict() if section_data.style_config else {},
-            media_asset_id=section_data.media_asset_id
+        values = {
+            "section_type": section_data.section_type,
+            "content_text": section_data.content_text,
+            "position_order": section_data.position_order,
+            "style_config": (section_data.style_config or SectionStyleConfig()).dict(),
+            "media_asset_id": section_data.media_asset_id
+        }
+        
+        # Unknown ids (or ids submitted twice) become new sections
+        current = existing.pop(section_data.id, None) if section_data.id else None
+        if current is None:
+            row = {
+                **values, "id": uuid4(), "countdown_id": countdown.id, "day_number": day_number,
+                "created_at": now, "updated_at": now
+            }
+            inserts.append(row)
+            final_rows.append((row, None))
+            linked_media_ids.append(row["media_asset_id"])
+            continue
+        
+        if is_section_unchanged(current, values):
+            final_rows.append((get_section_values(current), current.media_asset))
+            continue
+        
+        if current.position_order != values["position_order"]:
+            moved_ids.append(current.id)
+        row = {**values, "id": current.id, "day_number": day_number, "created_at": current.created_at, "updated_at": now}
+        updates.append(row)
+        media_asset = current.media_asset if current.media_asset_id == values["media_asset_id"] else None
+        final_rows.append((row, media_asset))
+        if media_asset is None:
+            linked_media_ids.append(row["media_asset_id"])
+    
+    # Whatever wasn't resubmitted was removed
+    removed_ids = list(existing)
+    
+    await check_countdown_media(db, countdown.id, linked_media_ids)
+    
+    if inserts or updates or removed_ids:
+        try:
+            if removed_ids:
+                await db.execute(delete(DaySection).where(DaySection.id.in_(removed_ids)))
+            
+            # Park moved sections above every position in use, so reordering
+            # never trips UNIQUE(countdown_id, day_number, position_order) halfway through
+            if moved_ids:
+                park_offset = 1 + max(row["position_order"] for row, _ in final_rows)
+                await db.execute(
+                    update(DaySection)
+                    .where(DaySection.id.in_(moved_ids))
+                    .values(position_order=DaySection.position_order + park_offset)
+                    .execution_options(synchronize_session=False)
+                )
+            
+            if updates:
+                await db.execute(update(DaySection), [
+                    {field: row[field] for field in ("id", "updated_at") + SECTION_FIELDS}
+                    for row in updates
+                ])
+            if inserts:
+                await db.execute(insert(DaySection), inserts)
+            
+            # Update day timestamp
+            day.updated_at = now
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail="Section positions must be unique")
+        
+        countdown_cache.invalidate(countdown.id)
+    
+    # Media for new or re-pointed sections, in one query
+    missing_media_ids = {
+        row["media_asset_id"] for row, media_asset in final_rows
+        if row["media_asset_id"] and media_asset is None
+    }
+    media_by_id = {}
+    if missing_media_ids:
+        result = await db.execute(select(MediaAsset).where(MediaAsset.id.in_(missing_media_ids)))
+        media_by_id = {media.id: media for media in result.scalars()}
+    
+    final_rows.sort(key=lambda item: item[0]["position_order"])
+    return SectionsResponse(sections=[
+        build_section_response(row, media_asset or media_by_id.get(row["media_asset_id"]))
+        for row, media_asset in final_rows
+    ])
+
+async def check_countdown_media(db: AsyncSession, countdown_id: int, media_ids: Iterable[Optional[UUID]]) -> None:
+    """Reject media that isn't the countdown's own, before it's linked to one of its days."""
+    media_ids = {media_id for media_id in media_ids if media_id}
+    if not media_ids:
+        return
+    found = await db.scalar(select(func.count()).select_from(MediaAsset).where(
+        MediaAsset.id.in_(media_ids), MediaAsset.countdown_id == countdown_id
+    ))
+    if found < len(media_ids):
+        raise HTTPException(status_code=400, detail="Media not found in this countdown")
+
+def section_conflict_error() -> HTTPException:
+    return HTTPException(status_code=409, detail="Section was modified by another request, reload and try again")
+
+async def get_section_for_update(
+    db: AsyncSession,
+    countdown_id: int,
+    day_number: int,
+    section_id: UUID,
+    expected_updated_at: Optional[datetime]
+) -> DaySection:
+    """Load a section for writing, checking it hasn't changed since the client read it."""
+    section = await db.scalar(select(DaySection).options(
+        joinedload(DaySection.media_asset)
+    ).where(
+        DaySection.id == section_id, DaySection.countdown_id == countdown_id, DaySection.day_number == day_number
+    ))
+    if not section:
+        raise HTTPException(status_code=404, detail="Section not found")
+    if expected_updated_at is not None and section.updated_at != expected_updated_at:
+        raise section_conflict_error()
+    return section
+
+async def park_sections(
+    db: AsyncSession,
+    countdown_id: int,
+    day_number: int,
+    start: int,
+    end: Optional[int],
+    delta: int
+) -> None:
+    """
+    Move sections between two positions out of the way, shifted by delta.
+
+    Parked sections get negative positions encoding their new position, so the
+    shift never collides with UNIQUE(countdown_id, day_number, position_order)
+    row by row. unpark_sections puts them in place. Renumbering alone keeps
+    updated_at, so it doesn't conflict with edits to the shifted sections.
+    """
+    criteria = [
+        DaySection.countdown_id == countdown_id,
+        DaySection.day_number == day_number,
+        DaySection.position_order >= start
+    ]
+    if end is not None:
+        criteria.append(DaySection.position_order <= end)
+    await db.execute(
+        update(DaySection).where(*criteria)
+        .values(position_order=-(DaySection.position_order + delta) - 1, updated_at=DaySection.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+async def unpark_sections(db: AsyncSession, countdown_id: int, day_number: int) -> None:
+    """Move parked sections to their shifted positions."""
+    await db.execute(
+        update(DaySection).where(
+            DaySection.countdown_id == countdown_id, DaySection.day_number == day_number, DaySection.position_order < 0
         )
-        db.add(section)
+        .values(position_order=-DaySection.position_order - 1, updated_at=DaySection.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+async def get_last_position(db: AsyncSession, countdown_id: int, day_number: int) -> Optional[int]:
+    return await db.scalar(select(func.max(DaySection.position_order)).where(
+        DaySection.countdown_id == countdown_id, DaySection.day_number == day_number
+    ))
+
+async def touch_day(db: AsyncSession, countdown_id: int, day_number: int, now: datetime) -> bool:
+    """Bump a day's updated_at after a section write. Returns False if the day doesn't exist."""
+    result = await db.execute(
+        update(CountdownDay).where(
+            CountdownDay.countdown_id == countdown_id, CountdownDay.day_number == day_number
+        ).values(updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+async def apply_section_update(
+    db: AsyncSession,
+    countdown_id: int,
+    day_number: int,
+    section_id: UUID,
+    values: dict,
+    position_order: Optional[int],
+    expected_updated_at: Optional[datetime]
+) -> dict:
+    """Update one section and optionally move it, renumbering the sections in between."""
+    section = await get_section_for_update(db, countdown_id, day_number, section_id, expected_updated_at)
+    if "media_asset_id" in values and values["media_asset_id"] != section.media_asset_id:
+        await check_countdown_media(db, countdown_id, [values["media_asset_id"]])
+    now = get_current_time_utc()
     
-    # Update day timestamp
-    day.updated_at = get_current_time_utc()
+    # Conditional on updated_at, so a concurrent write between the read and here is caught too
+    result = await db.execute(
+        update(DaySection)
+        .where(DaySection.id == section.id, DaySection.updated_at == section.updated_at)
+        .values(**values, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        raise section_conflict_error()
+    
+    current_position = section.position_order
+    if position_order is not None and position_order != current_position:
+        position_order = min(position_order, await get_last_position(db, countdown_id, day_number))
+        if position_order < current_position:
+            await park_sections(db, countdown_id, day_number, position_order, current_position - 1, 1)
+        else:
+            await park_sections(db, countdown_id, day_number, current_position + 1, position_order, -1)
+        await db.execute(
+            update(DaySection).where(DaySection.id == section.id)
+            .values(position_order=position_order, updated_at=DaySection.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await unpark_sections(db, countdown_id, day_number)
+        current_position = position_order
     
-    db.commit()
+    await touch_day(db, countdown_id, day_number, now)
+    await db.commit()
+    countdown_cache.invalidate(countdown_id)
     
-    # Return updated sections
-    return await get_day_sections(day_number, current_admin, db)
+    section_values = {**get_section_values(section), **values, "position_order": current_position, "updated_at": now}
+    media_asset = section.media_asset
+    if section_values["media_asset_id"] != section.media_asset_id:
+        media_asset = await db.get(MediaAsset, section_values["media_asset_id"]) if section_values["media_asset_id"] else None
+    return build_section_response(section_values, media_asset)
+
+@default_countdown_route(app.post("/api/admin/countdown/{day_number}/sections", response_model=DaySectionResponse))
+@app.post("/api/admin/countdowns/{countdown_slug}/{day_number}/sections", response_model=DaySectionResponse)
+async def create_day_section(
+    day_number: int,
+    section_data: DaySectionBase,
+    countdown: CountdownInfo = Depends(get_countdown),
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Insert a section at a position, shifting the sections after it down."""
+    if day_number < 1 or day_number > countdown.total_days:
+        raise HTTPException(status_code=404, detail="Day not found")
+    
+    await check_countdown_media(db, countdown.id, [section_data.media_asset_id])
+    
+    now = get_current_time_utc()
+    if not await touch_day(db, countdown.id, day_number, now):
+        raise HTTPException(status_code=404, detail="Day not found")
+    
+    try:
+        last_position = await get_last_position(db, countdown.id, day_number)
+        next_position = 0 if last_position is None else last_position + 1
+        position_order = min(section_data.position_order, next_position)
+        if position_order < next_position:
+            await park_sections(db, countdown.id, day_number, position_order, None, 1)
+            await unpark_sections(db, countdown.id, day_number)
+        
+        values = {
+            "id": uuid4(),
+            "countdown_id": countdown.id,
+            "day_number": day_number,
+            "section_type": section_data.section_type,
+            "content_text": section_data.content_text,
+            "position_order": position_order,
+            "style_config": (section_data.style_config or SectionStyleConfig()).dict(),
+            "media_asset_id": section_data.media_asset_id,
+            "created_at": now,
+            "updated_at": now
+        }
+        await db.execute(insert(DaySection).values(**values))
+        await db.commit()
+    except IntegrityError:
+        # A concurrent insert took the position since the last one was read
+        await db.rollback()
+        raise section_conflict_error()
+    
+    countdown_cache.invalidate(countdown.id)
+    
+    media_asset = await db.get(MediaAsset, values["media_asset_id"]) if values["media_asset_id"] else None
+    return build_section_response(values, media_asset)
+
+@default_countdown_route(app.patch("/api/admin/countdown/{day_number}/sections/{section_id}", response_model=DaySectionResponse))
+@app.patch("/api/admin/countdowns/{countdown_slug}/{day_number}/sections/{section_id}", response_model=DaySectionResponse)
+async def update_day_section(
+    day_number: int,
+    section_id: UUID,
+    section_update: DaySectionUpdate,
+    countdown: CountdownInfo = Depends(get_countdown),
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Update a single section's fields."""
+    if day_number < 1 or day_number > countdown.total_days:
+        raise HTTPException(status_code=404, detail="Day not found")
+    
+    values = section_update.dict(exclude_unset=True, exclude={"position_order", "expected_updated_at"})
+    if "style_config" in values:
+        values["style_config"] = values["style_config"] or SectionStyleConfig().dict()
+    
+    return await apply_section_update(
+        db, countdown.id, day_number, section_id, values,
+        section_update.position_order, section_update.expected_updated_at
+    )
+
+@default_countdown_route(app.post("/api/admin/countdown/{day_number}/sections/{section_id}/move", response_model=DaySectionResponse))
+@app.post("/api/admin/countdowns/{countdown_slug}/{day_number}/sections/{section_id}/move", response_model=DaySectionResponse)
+async def move_day_section(
+    day_number: int,
+    section_id: UUID,
+    move: SectionMoveRequest,
+    countdown: CountdownInfo = Depends(get_countdown),
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Move a section to a position, renumbering the sections in between."""
+    if day_number < 1 or day_number > countdown.total_days:
+        raise HTTPException(status_code=404, detail="Day not found")
+    
+    return await apply_section_update(
+        db, countdown.id, day_number, section_id, {}, move.position_order, move.expected_updated_at
+    )
+
+@default_countdown_route(app.delete("/api/admin/countdown/{day_number}/sections/{section_id}", status_code=204))
+@app.delete("/api/admin/countdowns/{countdown_slug}/{day_number}/sections/{section_id}", status_code=204)
+async def delete_day_section(
+    day_number: int,
+    section_id: UUID,
+    expected_updated_at: Optional[datetime] = Query(None),
+    countdown: CountdownInfo = Depends(get_countdown),
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a section, closing the gap it leaves."""
+    if day_number < 1 or day_number > countdown.total_days:
+        raise HTTPException(status_code=404, detail="Day not found")
+    
+    section = await get_section_for_update(db, countdown.id, day_number, section_id, expected_updated_at)
+    result = await db.execute(
+        delete(DaySection).where(DaySection.id == section.id, DaySection.updated_at == section.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        raise section_conflict_error()
+    
+    await park_sections(db, countdown.id, day_number, section.position_order + 1, None, -1)
+    await unpark_sections(db, countdown.id, day_number)
+    
+    await touch_day(db, countdown.id, day_number, get_current_time_utc())
+    await db.commit()
+    countdown_cache.invalidate(countdown.id)
+    return Response(status_code=204)
 
 # Media upload endpoints
-@app.post("/api/admin/upload", response_model=MediaUploadResponse)
+@default_countdown_route(app.post("/api/admin/upload", response_model=MediaUploadResponse))
+@app.post("/api/admin/countdowns/{countdown_slug}/upload", response_model=MediaUploadResponse)
 async def upload_media(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     day_number: Optional[int] = Form(None),
     media_config: Optional[str] = Form("{}"),  # JSON string for media configuration
+    countdown: CountdownInfo = Depends(get_countdown),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload media file for a countdown day."""
-    # Validate file
-    if file.size > settings.MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size is {settings.MAX_FILE_SIZE // (1024*1024)}MB"
-        )
+    # Validate file, the size is enforced again while streaming since file.size is client-provided
+    if file.size is not None and file.size > settings.MAX_FILE_SIZE:
+        raise file_too_large_error()
     
     if file.content_type not in settings.ALLOWED_MIME_TYPES:
         raise HTTPException(
@@ -471,11 +1319,13 @@ async def upload_media(
     
     # Validate day_number if provided
     if day_number is not None:
-        if day_number < 1 or day_number > 25:
+        if day_number < 1 or day_number > countdown.total_days:
             raise HTTPException(status_code=400, detail="Invalid day number")
         
         # Check if day exists
-        day = db.query(CountdownDay).filter(CountdownDay.day_number == day_number).first()
+        day = await db.scalar(select(CountdownDay).where(
+            CountdownDay.countdown_id == countdown.id, CountdownDay.day_number == day_number
+        ))
         if not day:
             raise HTTPException(status_code=404, detail="Day not found")
     
@@ -486,70 +1336,410 @@ async def upload_media(
         if media_config and media_config != "{}":
             parsed_config = json.loads(media_config)
         
-        # Upload to S3
-        file_content = io.BytesIO(await file.read())
-        file_key, public_url = s3_service.upload_file(
-            file_content, 
-            file.filename, 
-            file.content_type,
-            day_number
+        # Hash the spooled upload first, identical bytes stored before are reused instead of written again
+        await file.seek(0)
+        content_hash, file_size = await run_in_threadpool(hash_stream, file.file, settings.MAX_FILE_SIZE)
+        existing = await db.scalar(
+            select(MediaAsset)
+            .where(MediaAsset.content_hash == content_hash)
+            .order_by(MediaAsset.uploaded_at)
+            .limit(1)
         )
         
+        if existing:
+            file_key = existing.file_key
+            derived = {
+                "variants": existing.variants,
+                "width": existing.width,
+                "height": existing.height,
+                "placeholder": existing.placeholder
+            }
+        else:
+            # Stream the spooled upload to storage in chunks, off the event loop
+            await file.seek(0)
+            file_key, _, file_size = await storage.run(
+                storage.upload_stream,
+                file.file,
+                file.filename,
+                file.content_type,
+                day_number,
+                settings.MAX_FILE_SIZE
+            )
+            
+            # Responsive derivatives, dimensions and placeholder for images, rendered in the image process pool
+            derived = {}
+            if file.content_type in VARIANT_SOURCE_TYPES:
+                # The worker reads the image from disk, it's never held in memory here
+                await file.seek(0)
+                image_path = await run_in_threadpool(spool_to_disk, file.file)
+                try:
+                    derived = await store_image_derivatives(file_key, image_path)
+                finally:
+                    os.unlink(image_path)
+            elif file.content_type in VIDEO_PROBE_TYPES:
+                dimensions = await run_in_threadpool(read_video_dimensions, file.file)
+                if dimensions:
+                    derived = {"width": dimensions[0], "height": dimensions[1]}
+        
         # Save to database
         media_asset = MediaAsset(
             filename=file.filename,
             file_key=file_key,
-            file_size=file.size,
+            content_hash=content_hash,
+            file_size=file_size,
             mime_type=file.content_type,
             media_config=parsed_config,
+            variants=derived.get("variants", []),
+            width=derived.get("width"),
+            height=derived.get("height"),
+            placeholder=derived.get("placeholder"),
+            countdown_id=countdown.id,
             day_number=day_number
         )
         
         db.add(media_asset)
-        db.commit()
-        db.refresh(media_asset)
+        await db.commit()
+        await db.refresh(media_asset)
+        
+        # The matched asset had no derivatives to copy (e.g. they were still being rendered), render this one's own
+        if existing and file.content_type in VARIANT_SOURCE_TYPES and not media_asset.variants:
+            background_tasks.add_task(generate_media_variants, media_asset.id, file_key)
         
+        media_urls = serialize_media(media_asset)
         return MediaUploadResponse(
             id=media_asset.id,
             filename=media_asset.filename,
             file_key=media_asset.file_key,
             file_size=media_asset.file_size,
             mime_type=media_asset.mime_type,
-            url=public_url,
+            url=media_urls["url"],
             uploaded_at=media_asset.uploaded_at,
-            media_config=media_asset.media_config
+            media_config=media_asset.media_config,
+            width=media_asset.width,
+            height=media_asset.height,
+            placeholder=media_asset.placeholder,
+            variants=media_urls["variants"],
+            srcset=media_urls["srcset"]
         )
         
+    except FileTooLargeError:
+        raise file_too_large_error()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+def file_too_large_error() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size is {settings.MAX_FILE_SIZE // (1024*1024)}MB"
+    )
+
+@default_countdown_route(app.post("/api/admin/uploads/presign", response_model=PresignedUploadResponse))
+@app.post("/api/admin/countdowns/{countdown_slug}/uploads/presign", response_model=PresignedUploadResponse)
+async def presign_upload(
+    upload_request: PresignedUploadRequest,
+    countdown: CountdownInfo = Depends(get_countdown),
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Start a direct-to-S3 upload: returns a presigned POST for the browser."""
+    if upload_request.file_size is not None and upload_request.file_size > settings.MAX_FILE_SIZE:
+        raise file_too_large_error()
+    
+    if upload_request.content_type not in settings.ALLOWED_MIME_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported file type. Allowed types: {', '.join(settings.ALLOWED_MIME_TYPES)}"
+        )
+    
+    # Validate day_number if provided
+    day_number = upload_request.day_number
+    if day_number is not None:
+        if day_number < 1 or day_number > countdown.total_days:
+            raise HTTPException(status_code=400, detail="Invalid day number")
+        
+        day = await db.scalar(select(CountdownDay).where(
+            CountdownDay.countdown_id == countdown.id, CountdownDay.day_number == day_number
+        ))
+        if not day:
+            raise HTTPException(status_code=404, detail="Day not found")
+    
+    file_key = storage.generate_file_key(upload_request.filename, day_number)
+    try:
+        presigned = storage.generate_presigned_upload(
+            file_key,
+            upload_request.filename,
+            upload_request.content_type,
+            settings.MAX_FILE_SIZE,
+            settings.PRESIGNED_UPLOAD_EXPIRY
+        )
+    except NotImplementedError:
+        raise HTTPException(
+            status_code=501,
+            detail="Direct uploads need S3 storage, upload through /api/admin/upload instead"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+    
+    # Signed record of what was authorized, so completion can't be pointed at another key
+    upload_token = create_access_token(
+        {
+            "type": "upload",
+            "file_key": file_key,
+            "filename": upload_request.filename,
+            "content_type": upload_request.content_type,
+            "countdown_id": countdown.id,
+            "day_number": day_number
+        },
+        expires_delta=timedelta(seconds=settings.PRESIGNED_UPLOAD_EXPIRY)
+    )
+    
+    return PresignedUploadResponse(
+        file_key=file_key,
+        url=presigned["url"],
+        fields=presigned["fields"],
+        upload_token=upload_token,
+        expires_in=settings.PRESIGNED_UPLOAD_EXPIRY
+    )
+
+@app.post("/api/admin/uploads/complete", response_model=MediaUploadResponse)
+async def complete_upload(
+    complete_request: UploadCompleteRequest,
+    background_tasks: BackgroundTasks,
+    current_admin: dict = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Finish a direct-to-S3 upload: verify the object and record the media asset."""
+    upload = verify_token(complete_request.upload_token)
+    if not upload or upload.get("type") != "upload":
+        raise HTTPException(status_code=400, detail="Invalid or expired upload token")
+    
+    file_key = upload["file_key"]
+    
+    # Completing the same upload again (e.g. a retried request) returns the asset it created
+    media_asset = await db.scalar(
+        select(MediaAsset).where(MediaAsset.file_key == file_key).order_by(MediaAsset.uploaded_at).limit(1)
+    )
+    if media_asset:
+        return build_upload_response(media_asset)
+    
+    metadata = await storage.run(storage.get_file_metadata, file_key)
+    if not metadata:
+        raise HTTPException(status_code=400, detail="Uploaded file not found")
+    
+    # S3 enforces these through the POST policy, check again before trusting the object
+    if metadata["size"] > settings.MAX_FILE_SIZE:
+        await storage.run(storage.delete_file, file_key)
+        raise file_too_large_error()
+    if metadata["content_type"] != upload["content_type"]:
+        await storage.run(storage.delete_file, file_key)
+        raise HTTPException(status_code=415, detail="Uploaded file type does not match")
+    
+    media_asset = MediaAsset(
+        filename=upload["filename"],
+        file_key=file_key,
+        file_size=metadata["size"],
+        mime_type=metadata["content_type"],
+        media_config=complete_request.media_config.dict() if complete_request.media_config else {},
+        variants=[],
+        countdown_id=upload["countdown_id"],
+        day_number=upload["day_number"]
+    )
+    db.add(media_asset)
+    await db.commit()
+    await db.refresh(media_asset)
+    
+    # The API never received the bytes, render image derivatives and placeholder and hash the
+    # object after responding, so later uploads of the same content reuse it
+    if media_asset.mime_type in VARIANT_SOURCE_TYPES:
+        background_tasks.add_task(generate_media_variants, media_asset.id, file_key)
+    else:
+        background_tasks.add_task(
+            hash_uploaded_media, media_asset.id, file_key, media_asset.mime_type, media_asset.file_size
+        )
+    
+    return build_upload_response(media_asset)
+
+def build_upload_response(media_asset: MediaAsset) -> MediaUploadResponse:
+    return MediaUploadResponse(
+        id=media_asset.id,
+        filename=media_asset.filename,
+        file_key=media_asset.file_key,
+        file_size=media_asset.file_size,
+        mime_type=media_asset.mime_type,
+        url=storage.get_media_url(media_asset.file_key),
+        uploaded_at=media_asset.uploaded_at,
+        media_config=media_asset.media_config
+    )
+
+async def generate_media_variants(media_id: UUID, file_key: str) -> None:
+    """Render and record derivatives for an image the API stored without rendering (e.g. uploaded directly to S3)."""
+    try:
+        image_path = await storage.run(download_to_disk, file_key)
+        try:
+            derived = await store_image_derivatives(file_key, image_path)
+            content_hash = await run_in_threadpool(hash_file, image_path)
+        finally:
+            os.unlink(image_path)
+        
+        # Hashed along with its derivatives, so re-uploads matching it can copy them
+        async with SessionLocal() as db:
+            await db.execute(update(MediaAsset).where(MediaAsset.id == media_id).values(
+                **(derived or {}), content_hash=content_hash
+            ))
+            await db.commit()
+            countdown_ids = await get_media_countdown_ids(db, media_id) if derived else set()
+        for countdown_id in countdown_ids:
+            countdown_cache.invalidate(countdown_id)
+    except Exception as e:
+        print(f"Failed to generate variants for {file_key}: {str(e)}")
+
+def download_to_disk(file_key: str) -> str:
+    """Copy a stored object to a temporary file, returns its path. Blocking, run it through storage.run()."""
+    with tempfile.NamedTemporaryFile(prefix="media-", delete=False) as temp_file:
+        storage.download_to_file(file_key, temp_file)
+        return temp_file.name
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as file:
+        return hash_stream(file)[0]
+
+def hash_object(file_key: str) -> str:
+    """SHA-256 of a stored object, streamed in chunks. Blocking, run it through storage.run()."""
+    body = storage.open_object(file_key)
+    try:
+        return hash_stream(body)[0]
+    finally:
+        body.close()
+
+async def hash_uploaded_media(media_id: UUID, file_key: str, mime_type: str, file_size: int) -> None:
+    """Record the content hash, and a video's dimensions, of a file that was uploaded directly to S3."""
+    try:
+        values = {"content_hash": await storage.run(hash_object, file_key)}
+        if mime_type in VIDEO_PROBE_TYPES:
+            # Only the box headers are fetched, through ranged reads
+            reader = RangedObjectReader(storage, file_key, file_size)
+            dimensions = await storage.run(read_video_dimensions, reader)
+            if dimensions:
+                values.update(width=dimensions[0], height=dimensions[1])
+        
+        async with SessionLocal() as db:
+            await db.execute(update(MediaAsset).where(MediaAsset.id == media_id).values(**values))
+            await db.commit()
+            countdown_ids = await get_media_countdown_ids(db, media_id) if "width" in values else set()
+        for countdown_id in countdown_ids:
+            countdown_cache.invalidate(countdown_id)
+    except Exception as e:
+        print(f"Failed to hash {file_key}: {str(e)}")
+
+async def get_media_countdown_ids(db: AsyncSession, media_id: UUID) -> set[int]:
+    """Countdowns showing a media asset, in a section or as background audio."""
+    result = await db.execute(
+        select(DaySection.countdown_id).where(DaySection.media_asset_id == media_id)
+        .union(select(CountdownDay.countdown_id).where(CountdownDay.background_audio_id == media_id))
+    )
+    return set(result.scalars())
+
 @app.put("/api/admin/media/{media_id}", response_model=MediaUploadResponse)
 async def update_media_config(
-    media_id: str,
+    media_id: UUID,
     config_data: MediaAssetUpdate,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update media asset configuration."""
-    media = db.query(MediaAsset).filter(MediaAsset.id == media_id).first()
+    media = await db.scalar(select(MediaAsset).where(MediaAsset.id == media_id))
     if not media:
         raise HTTPException(status_code=404, detail="Media not found")
     
     if config_data.media_config is not None:
         media.media_config = config_data.media_config.dict()
+        
+        # Bump the days showing this media so their ETags change
+        await db.execute(update(CountdownDay).where(or_(
+            tuple_(CountdownDay.countdown_id, CountdownDay.day_number).in_(
+                select(DaySection.countdown_id, DaySection.day_number).where(DaySection.media_asset_id == media.id)
+            ),
+            CountdownDay.background_audio_id == media.id
+        )).values(updated_at=get_current_time_utc()).execution_options(synchronize_session=False))
     
-    db.commit()
-    db.refresh(media)
+    await db.commit()
+    await db.refresh(media)
+    for countdown_id in await get_media_countdown_ids(db, media.id):
+        countdown_cache.invalidate(countdown_id)
     
+    media_urls = serialize_media(media)
     return MediaUploadResponse(
         id=media.id,
         filename=media.filename,
         file_key=media.file_key,
         file_size=media.file_size,
         mime_type=media.mime_type,
-        url=s3_service.get_public_url(media.file_key),
+        url=media_urls["url"],
         uploaded_at=media.uploaded_at,
-        media_config=media.media_config
+        media_config=media.media_config,
+        width=media.width,
+        height=media.height,
+        placeholder=media.placeholder,
+        variants=media_urls["variants"],
+        srcset=media_urls["srcset"]
+    )
+
+# Media proxy, for local storage and deployments where clients can't reach the bucket
+@app.api_route("/media/{file_key:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_media(file_key: str, request: Request):
+    """Serve a media object with Range support, in place or from the local disk cache."""
+    if not storage.proxied or not file_key.startswith(PROXIED_KEY_PREFIXES):
+        raise HTTPException(status_code=404, detail="Media not found")
+    
+    # Locally stored files are sent as they are, remote ones through the cache when they fit
+    local_file = storage.local_file(file_key)
+    if local_file:
+        path, size = local_file
+        accel_redirect = settings.LOCAL_STORAGE_ACCEL_REDIRECT and settings.LOCAL_STORAGE_ACCEL_REDIRECT + file_key
+    else:
+        if storage.local:
+            raise HTTPException(status_code=404, detail="Media not found")
+        try:
+            path, size = await media_cache.get_or_fill(file_key)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Media not found")
+        accel_redirect = path and settings.MEDIA_ACCEL_REDIRECT and settings.MEDIA_ACCEL_REDIRECT + os.path.basename(path)
+    
+    # Keys are never reused, so objects never change
+    etag = make_etag("media", file_key, size)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Accept-Ranges": "bytes",
+    }
+    media_type = mimetypes.guess_type(file_key)[0] or "application/octet-stream"
+    
+    if accel_redirect:
+        # nginx sends the file itself (sendfile) and handles the Range
+        headers["X-Accel-Redirect"] = accel_redirect
+        return Response(headers=headers, media_type=media_type)
+    
+    # Ranges conditional on a different version get the whole object
+    if_range = request.headers.get("if-range")
+    try:
+        byte_range = parse_range(request.headers.get("range"), size) if if_range in (None, etag) else None
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    
+    status_code, length_headers = range_headers(byte_range, size)
+    headers.update(length_headers)
+    if request.method == "HEAD" or size == 0:
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    
+    if path:
+        return FileRangeResponse(path, byte_range or (0, size - 1), status_code, headers, media_type)
+    
+    body = await storage.run(storage.open_object, file_key, byte_range)
+    return StreamingResponse(
+        iter_body(body, storage.run), status_code=status_code, headers=headers, media_type=media_type
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+from typing import BinaryIO, Optional
+import os
+import struct
+
+# ISO base media (MP4/MOV) containers that hold the track headers we need
+VIDEO_PROBE_TYPES = {'video/mp4'}
+
+CONTAINER_BOXES = {b"moov", b"trak"}
+
+def read_video_dimensions(file_obj: BinaryIO) -> Optional[tuple[int, int]]:
+    """
+    Read a video's display width and height from its MP4 track headers.
+
+    Only box headers are read, seeking past media data, so this is cheap even
+    for large files. The stream position is restored afterwards.
+
+    Returns:
+        (width, height) of the first visual track, or None if not found
+    """
+    start = file_obj.tell()
+    try:
+        file_obj.seek(0, os.SEEK_END)
+        end = file_obj.tell()
+        return _find_dimensions(file_obj, 0, end)
+    except (OSError, struct.error, ValueError):
+        return None
+    finally:
+        file_obj.seek(start)
+
+def _find_dimensions(file_obj: BinaryIO, offset: int, end: int) -> Optional[tuple[int, int]]:
+    while offset + 8 <= end:
+        file_obj.seek(offset)
+        size, box_type = struct.unpack(">I4s", file_obj.read(8))
+        header_size = 8
+        if size == 1:
+            # 64-bit box size follows the type
+            size = struct.unpack(">Q", file_obj.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            # Box extends to the end of the file
+            size = end - offset
+        if size < header_size:
+            return None
+
+        if box_type in CONTAINER_BOXES:
+            dimensions = _find_dimensions(file_obj, offset + header_size, offset + size)
+            if dimensions:
+                return dimensions
+        elif box_type == b"tkhd":
+            dimensions = _read_tkhd(file_obj, offset + header_size, size - header_size)
+            if dimensions:
+                return dimensions
+
+        offset += size
+    return None
+
+def _read_tkhd(file_obj: BinaryIO, offset: int, size: int) -> Optional[tuple[int, int]]:
+    # The header ends with the display matrix (9 signed 32-bit values) then
+    # width and height, as 16.16 fixed point
+    if size < 44:
+        return None
+    file_obj.seek(offset + size - 44)
+    a, b, _, c, d, _, _, _, _, width, height = struct.unpack(">9i2I", file_obj.read(44))
+    width, height = width >> 16, height >> 16
+    # Audio tracks have zero dimensions
+    if not (width and height):
+        return None
+    # Rotated by 90 or 270 degrees (phone videos shot upright): displayed sideways
+    if a == 0 and d == 0 and b != 0 and c != 0:
+        return height, width
+    return width, height
@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import os
+import posixpath
+import tempfile
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+from starlette.responses import Response
+from config import settings
+from storage import storage
+
+# Bytes read per chunk when sending a cached file or a storage body
+CHUNK_SIZE = 256 * 1024
+
+# Only keys the app generates are proxied (see StorageBackend.generate_file_key)
+PROXIED_KEY_PREFIXES = ("days/", "general/")
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header starts past the end of the object."""
+    pass
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Inclusive byte range requested by a Range header.
+
+    Only single ranges are served partially. Missing, malformed and multi-range
+    headers get the whole object, which RFC 7233 allows.
+
+    Raises:
+        RangeNotSatisfiable: If the range lies outside the object
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, separator, last = spec.strip().partition("-")
+    if not separator:
+        return None
+
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable(header)
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+
+    if end is not None and start > end:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+def range_headers(byte_range: Optional[tuple[int, int]], size: int) -> tuple[int, dict]:
+    """Status code and length headers for sending a range (or the whole object, for None)."""
+    if byte_range is None:
+        return 200, {"Content-Length": str(size)}
+    start, end = byte_range
+    return 206, {"Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(end - start + 1)}
+
+class FileRangeResponse(Response):
+    def __init__(self, path: str, byte_range: tuple[int, int], status_code: int, headers: dict, media_type: str):
+        """
+        Send an inclusive byte range of a file.
+
+        Uses the ASGI zero-copy send extension (sendfile) when the server offers
+        it, otherwise reads the range in chunks off the event loop.
+        """
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.path = path
+        self.start, self.end = byte_range
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        with open(self.path, "rb") as file:
+            length = self.end - self.start + 1
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file.fileno(),
+                    "offset": self.start,
+                    "count": length,
+                })
+                return
+
+            file.seek(self.start)
+            while length > 0:
+                chunk = await asyncio.to_thread(file.read, min(CHUNK_SIZE, length))
+                if not chunk:
+                    break
+                length -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+async def iter_body(body, run: Callable[..., Awaitable[Any]]) -> AsyncIterator[bytes]:
+    """Read a blocking streaming body chunk by chunk through run(), closing it at the end."""
+    try:
+        while True:
+            chunk = await run(body.read, CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        body.close()
+
+class MediaCache:
+    def __init__(self, root: str, max_bytes: int, max_object_size: int):
+        """
+        Size-bounded LRU of remote storage objects on local disk.
+
+        Files are named by a hash of their key, so every key maps to a safe
+        path. Concurrent misses for a key share a single download, so a hot
+        object is read from storage once however many clients ask for it.
+
+        Args:
+            root: Cache directory
+            max_bytes: Total size of cached files
+            max_object_size: Larger objects are never cached
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_object_size = min(max_object_size, max_bytes)
+        self._entries: OrderedDict[str, int] = OrderedDict()  # path -> size, least recently used first
+        self._size = 0
+        self._fills: dict[str, asyncio.Future] = {}
+        self._warming: set[asyncio.Task] = set()
+
+    def load(self) -> None:
+        """Index the files left by a previous run, oldest first, and drop partial downloads."""
+        os.makedirs(self.root, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.root):
+            if not entry.is_file():
+                continue
+            if entry.name.startswith(".download-"):
+                os.remove(entry.path)
+                continue
+            stat = entry.stat()
+            files.append((stat.st_mtime, entry.path, stat.st_size))
+
+        for _, path, size in sorted(files):
+            self._add(path, size)
+
+    def path_for(self, file_key: str) -> str:
+        _, ext = posixpath.splitext(file_key)
+        return os.path.join(self.root, hashlib.sha256(file_key.encode()).hexdigest() + ext.lower())
+
+    def lookup(self, file_key: str) -> Optional[tuple[str, int]]:
+        """Path and size of a cached object, marking it as recently used."""
+        path = self.path_for(file_key)
+        size = self._entries.get(path)
+        if size is None:
+            return None
+        self._entries.move_to_end(path)
+        return path, size
+
+    async def get_or_fill(self, file_key: str) -> tuple[Optional[str], int]:
+        """
+        Cached path and size of an object, downloading it on a miss.
+
+        Returns:
+            Tuple of (path, size), path is None when the object is too large to
+            cache or the download failed and it should be streamed from storage
+
+        Raises:
+            FileNotFoundError: If the object doesn't exist
+        """
+        cached = self.lookup(file_key)
+        if cached is not None:
+            return cached
+
+        metadata = await storage.run(storage.get_file_metadata, file_key)
+        if metadata is None:
+            raise FileNotFoundError(file_key)
+        if metadata['size'] > self.max_object_size:
+            return None, metadata['size']
+
+        path = self.path_for(file_key)
+        pending = self._fills.get(path)
+        if pending is None:
+            pending = self._fills[path] = asyncio.ensure_future(self._download(file_key, path))
+            pending.add_done_callback(lambda _: self._fills.pop(path, None))
+
+        try:
+            # A client going away mustn't cancel the download others wait on
+            return await asyncio.shield(pending)
+        except Exception as e:
+            print(f"Failed to cache media {file_key}: {str(e)}")
+            return None, metadata['size']
+
+    def warm(self, file_keys: Iterable[str]) -> None:
+        """Start downloading objects in the background (e.g. a day's media ahead of its release)."""
+        async def fill_all(file_keys: list[str]) -> None:
+            for file_key in file_keys:
+                try:
+                    await self.get_or_fill(file_key)
+                except Exception as e:
+                    print(f"Failed to warm media {file_key}: {str(e)}")
+
+        task = asyncio.create_task(fill_all(list(dict.fromkeys(file_keys))))
+        self._warming.add(task)
+        task.add_done_callback(self._warming.discard)
+
+    async def _download(self, file_key: str, path: str) -> tuple[str, int]:
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".download-")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                await storage.run(storage.download_to_file, file_key, temp_file)
+            size = os.path.getsize(temp_path)
+            # mkstemp creates files only the owner can read, nginx serves them too
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        self._add(path, size)
+        return path, size
+
+    def _add(self, path: str, size: int) -> None:
+        self._size += size - self._entries.pop(path, 0)
+        self._entries[path] = size
+
+        # Files being sent stay readable after they're unlinked
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            evicted, evicted_size = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            try:
+                os.remove(evicted)
+            except FileNotFoundError:
+                pass
+
+# Create a singleton instance
+media_cache = MediaCache(
+    settings.MEDIA_CACHE_DIR,
+    settings.MEDIA_CACHE_MAX_BYTES,
+    settings.MEDIA_CACHE_MAX_OBJECT_SIZE
+)
@@ -0,0 +1,150 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Latency buckets in seconds, from cached hits to slow uploads
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time until the response starts", ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request", ["route"],
+    buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request", ["route"],
+    buckets=LATENCY_BUCKETS
+)
+QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", buckets=LATENCY_BUCKETS
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a pooled database connection", buckets=LATENCY_BUCKETS
+)
+S3_LATENCY = Histogram(
+    "s3_request_duration_seconds", "S3 API call latency", ["operation"], buckets=LATENCY_BUCKETS
+)
+S3_ERRORS = Counter(
+    "s3_request_errors_total", "Failed S3 API calls", ["operation"]
+)
+
+# Routes whose requests aren't recorded
+UNTRACKED_ROUTES = {"/metrics"}
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+# SQL stats of the request being handled, shared with the SQLAlchemy greenlets it spawns
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+class MetricsMiddleware:
+    """Record request counts, latency and SQL usage per route template."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Measured to the first byte, so long-lived streams don't skew latency
+                route = get_route_template(scope)
+                if route not in UNTRACKED_ROUTES:
+                    REQUEST_LATENCY.labels(scope["method"], route).observe(time.perf_counter() - start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request_stats.reset(token)
+            route = get_route_template(scope)
+            if route not in UNTRACKED_ROUTES:
+                REQUESTS.labels(scope["method"], route, str(status_code)).inc()
+                REQUEST_QUERIES.labels(route).observe(stats.queries)
+                REQUEST_DB_TIME.labels(route).observe(stats.db_seconds)
+
+def get_route_template(scope) -> str:
+    """Path template of the matched route (e.g. /api/countdown/{day_number}), keeps label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every SQL statement and attribute it to the current request."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_times"].pop()
+        QUERY_LATENCY.observe(elapsed)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start_times"):
+            connection.info["query_start_times"].pop()
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool recording how long checkouts wait for a connection."""
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+def instrument_s3_client(client) -> None:
+    """Time S3 API calls and count failures, through botocore's event hooks."""
+    def before_call(model, context, **kwargs):
+        context["metrics_call"] = (model.name, time.perf_counter())
+
+    def after_call(http_response, context, **kwargs):
+        operation, start = context.pop("metrics_call", (None, None))
+        if operation is None:
+            return
+        S3_LATENCY.labels(operation).observe(time.perf_counter() - start)
+        if http_response.status_code >= 400:
+            S3_ERRORS.labels(operation).inc()
+
+    def after_call_error(context, **kwargs):
+        # Network errors and exhausted retries, there's no HTTP response
+        operation, start = context.pop("metrics_call", (None, None))
+        if operation is None:
+            return
+        S3_LATENCY.labels(operation).observe(time.perf_counter() - start)
+        S3_ERRORS.labels(operation).inc()
+
+    client.meta.events.register("before-call.s3", before_call)
+    client.meta.events.register("after-call.s3", after_call)
+    client.meta.events.register("after-call-error.s3", after_call_error)
+
+def render_metrics() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,15 +1,30 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, BigInteger, ForeignKey, CheckConstraint, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, BigInteger, ForeignKey, ForeignKeyConstraint, CheckConstraint, Index, UniqueConstraint, JSON
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
 import uuid
 
+class Countdown(Base):
+    __tablename__ = "countdowns"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    slug = Column(String(100), unique=True, nullable=False)  # Names the countdown in URLs
+    title = Column(String(255), nullable=False)
+    total_days = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        CheckConstraint('total_days >= 1', name='check_total_days_positive'),
+    )
+
 class CountdownDay(Base):
     __tablename__ = "countdown_days"
     
     id = Column(Integer, primary_key=True, index=True)
-    day_number = Column(Integer, unique=True, nullable=False)
+    countdown_id = Column(Integer, ForeignKey("countdowns.id", ondelete="CASCADE"), nullable=False)
+    day_number = Column(Integer, nullable=False)
     title = Column(String(255), nullable=False)
     content_html = Column(Text)  # Legacy HTML content (for backward compatibility)
     release_datetime_utc = Column(DateTime(timezone=True), nullable=False)
@@ -19,19 +34,22 @@ class CountdownDay(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    media_assets = relationship("MediaAsset", back_populates="countdown_day", foreign_keys="MediaAsset.day_number")
+    media_assets = relationship("MediaAsset", back_populates="countdown_day", foreign_keys="[MediaAsset.countdown_id, MediaAsset.day_number]")
     sections = relationship("DaySection", back_populates="countdown_day", cascade="all, delete-orphan", order_by="DaySection.position_order")
     background_audio = relationship("MediaAsset", foreign_keys=[background_audio_id])
     
     __table_args__ = (
-        CheckConstraint('day_number >= 1 AND day_number <= 25', name='check_day_number_range'),
+        # The upper bound is the countdown's total_days, checked by the API
+        CheckConstraint('day_number >= 1', name='check_day_number_range'),
+        UniqueConstraint('countdown_id', 'day_number', name='uq_countdown_days_countdown_day'),
     )
 
 class DaySection(Base):
     __tablename__ = "day_sections"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    day_number = Column(Integer, ForeignKey("countdown_days.day_number", ondelete="CASCADE"), nullable=False)
+    countdown_id = Column(Integer, nullable=False)
+    day_number = Column(Integer, nullable=False)
     section_type = Column(String(50), nullable=False)  # title, text, image, video, audio, quote, divider
     content_text = Column(Text)
     position_order = Column(Integer, nullable=False)
@@ -46,6 +64,11 @@ class DaySection(Base):
     
     __table_args__ = (
         CheckConstraint("section_type IN ('title', 'text', 'image', 'video', 'audio', 'quote', 'divider')", name='check_section_type'),
+        ForeignKeyConstraint(
+            ['countdown_id', 'day_number'], ['countdown_days.countdown_id', 'countdown_days.day_number'],
+            ondelete='CASCADE', name='day_sections_countdown_day_fkey'
+        ),
+        UniqueConstraint('countdown_id', 'day_number', 'position_order', name='uq_day_sections_position'),
     )
 
 class MediaAsset(Base):
@@ -53,15 +76,32 @@ class MediaAsset(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     filename = Column(String(255), nullable=False)
-    file_key = Column(String(500), unique=True, nullable=False)
+    file_key = Column(String(500), nullable=False)  # Shared by assets uploaded with identical content
+    content_hash = Column(String(64))  # SHA-256 of the original, when the API has seen its bytes
     file_size = Column(BigInteger, nullable=False)
     mime_type = Column(String(100), nullable=False)
     media_config = Column(JSONB, default={})  # Configuration for media (autoplay, volume, loop, etc.)
+    variants = Column(JSONB, default=[])  # Resized image derivatives (width, height, mime_type, file_key, file_size)
+    width = Column(Integer)  # Intrinsic dimensions, when known
+    height = Column(Integer)
+    placeholder = Column(Text)  # Tiny blurred preview as a data URI (images only)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
-    day_number = Column(Integer, ForeignKey("countdown_days.day_number"))
+    countdown_id = Column(Integer, ForeignKey("countdowns.id", ondelete="CASCADE"), nullable=False)
+    day_number = Column(Integer)  # None for media not tied to a day
     
     # Relationship to countdown day
-    countdown_day = relationship("CountdownDay", back_populates="media_assets", foreign_keys=[day_number])
+    countdown_day = relationship("CountdownDay", back_populates="media_assets", foreign_keys=[countdown_id, day_number])
+    
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['countdown_id', 'day_number'], ['countdown_days.countdown_id', 'countdown_days.day_number'],
+            name='media_assets_countdown_day_fkey'
+        ),
+        Index('idx_media_assets_countdown_day', 'countdown_id', 'day_number'),
+        Index('idx_media_assets_file_key', 'file_key'),
+        # Re-uploads are matched to stored objects by content
+        Index('idx_media_assets_content_hash', 'content_hash'),
+    )
 
 class AdminSession(Base):
     __tablename__ = "admin_sessions"
@@ -69,4 +109,10 @@ class AdminSession(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True), nullable=False)
-    is_active = Column(Boolean, default=True) 
\ No newline at end of file
+    is_active = Column(Boolean, default=True)
+    
+    __table_args__ = (
+        # The sweeper looks for active sessions past their expiry
+        Index('idx_admin_sessions_active', 'expires_at',
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+    )
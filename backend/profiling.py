@@ -0,0 +1,190 @@
+import hmac
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders
+
+# Request headers turning profiling on for a single request
+PROFILE_HEADER = "x-query-profile"
+EXPLAIN_HEADER = "x-query-explain"
+
+# EXPLAIN prefix per dialect, statements on other databases aren't explained
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+class ProfiledQuery:
+    def __init__(self, statement: str, duration: float, plan: Optional[list[str]] = None):
+        self.statement = statement
+        self.duration = duration
+        self.plan = plan
+
+class QueryProfile:
+    def __init__(self, explain: bool = False):
+        self.explain = explain
+        self.queries: list[ProfiledQuery] = []
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    def format_report(self, title: str) -> str:
+        """Every statement with its duration and plan, for logs and assertion messages."""
+        lines = [f"{title}: {len(self.queries)} queries, {self.total_seconds * 1000:.2f} ms"]
+        for index, query in enumerate(self.queries, start=1):
+            lines.append(f"  [{index}] {query.duration * 1000:.2f} ms  {' '.join(query.statement.split())}")
+            for row in query.plan or []:
+                lines.append(f"        {row}")
+        return "\n".join(lines)
+
+# Profile of the request being handled, None when it isn't profiled
+current_query_profile: ContextVar[Optional[QueryProfile]] = ContextVar("current_query_profile", default=None)
+
+class QueryProfilerMiddleware:
+    """
+    Record the SQL statements of profiled requests.
+
+    Every request is profiled when enabled is set. Otherwise a request opts in
+    with an X-Query-Profile header matching the configured token, and adds
+    X-Query-Explain: 1 for query plans. The count and DB time are returned in
+    X-Query-Count and Server-Timing headers, the statements are logged once
+    the response is complete.
+    """
+    def __init__(self, app, enabled: bool = False, explain: bool = False, token: str = ""):
+        self.app = app
+        self.enabled = enabled
+        self.explain = explain
+        self.token = token
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = self._profile_for(Headers(scope=scope))
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # Statements run after this point (e.g. background tasks) are only logged
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Query-Count", str(len(profile.queries)))
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={profile.total_seconds * 1000:.2f};desc="{len(profile.queries)} queries"'
+                )
+            await send(message)
+
+        token = current_query_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_profile.reset(token)
+            print(profile.format_report(f"Query profile {scope['method']} {scope['path']}"))
+
+    def _profile_for(self, headers: Headers) -> Optional[QueryProfile]:
+        if self.enabled:
+            return QueryProfile(explain=self.explain)
+
+        requested = headers.get(PROFILE_HEADER)
+        if not self.token or not requested or not hmac.compare_digest(requested, self.token):
+            return None
+        return QueryProfile(explain=self.explain or headers.get(EXPLAIN_HEADER) == "1")
+
+def enable_query_profiling(engine: Engine) -> None:
+    """Record statements into the current request's profile, if it has one."""
+    listen_for_queries(engine, current_query_profile.get)
+
+def listen_for_queries(engine: Engine, get_profile) -> tuple:
+    """
+    Register statement timing listeners on an engine.
+
+    Args:
+        engine: Sync engine (AsyncEngine.sync_engine for async code)
+        get_profile: Returns the QueryProfile to record into, or None to skip
+
+    Returns:
+        The registered (event name, listener) pairs, for event.remove()
+    """
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if get_profile() is not None:
+            conn.info.setdefault("profile_start_times", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = get_profile()
+        if profile is None or not conn.info.get("profile_start_times"):
+            return
+        duration = time.perf_counter() - conn.info["profile_start_times"].pop()
+        plan = None
+        if profile.explain and not executemany:
+            plan = explain_statement(conn, statement, parameters)
+        profile.queries.append(ProfiledQuery(statement, duration, plan))
+
+    def handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("profile_start_times"):
+            connection.info["profile_start_times"].pop()
+
+    listeners = (
+        ("before_cursor_execute", before_cursor_execute),
+        ("after_cursor_execute", after_cursor_execute),
+        ("handle_error", handle_error),
+    )
+    for name, listener in listeners:
+        event.listen(engine, name, listener)
+    return listeners
+
+def explain_statement(conn, statement: str, parameters) -> Optional[list[str]]:
+    """
+    Query plan of a statement that just ran, on a separate cursor.
+
+    Only SELECTs are explained, EXPLAIN ANALYZE executes the statement again
+    and must not repeat writes.
+    """
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return [" ".join(str(value) for value in row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception as e:
+        return [f"EXPLAIN failed: {str(e)}"]
+
+@contextmanager
+def count_queries(engine) -> Iterator[QueryProfile]:
+    """Record every statement run on the engine inside the block, from any thread or task."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    profile = QueryProfile()
+    listeners = listen_for_queries(sync_engine, lambda: profile)
+    try:
+        yield profile
+    finally:
+        for name, listener in listeners:
+            event.remove(sync_engine, name, listener)
+
+@contextmanager
+def assert_max_queries(engine, limit: int) -> Iterator[QueryProfile]:
+    """
+    Fail when the block runs more than limit SQL statements.
+
+    Guards endpoints against N+1 regressions in pytest:
+
+        with assert_max_queries(engine, 4):
+            response = client.get("/api/admin/countdown", headers=admin_headers)
+
+    The failure message lists every statement.
+    """
+    with count_queries(engine) as profile:
+        yield profile
+    assert len(profile.queries) <= limit, profile.format_report(f"Expected at most {limit} queries")
@@ -1,35 +1,87 @@
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from typing import Optional, BinaryIO
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional, BinaryIO
 from config import settings
-import uuid
-import mimetypes
+from storage_backend import StorageBackend
 from urllib.parse import quote
 
-class S3Service:
+# S3 requires every multipart part except the last to be at least 5MB
+MIN_MULTIPART_CHUNK_SIZE = 5 * 1024 * 1024
+
+class PresignedUrlCache:
+    def __init__(self, sign: Callable[[str, int], str], expiry_seconds: int, margin_seconds: int):
+        """
+        Presigned GET URLs per file key, reused for a whole signing window.
+        
+        Windows are aligned to the epoch and last expiry minus margin, so every
+        URL handed out in a window stays valid for at least margin_seconds
+        after the window ends (e.g. for images a page loads lazily).
+        
+        Args:
+            sign: Returns a presigned URL for (file_key, expiry_seconds)
+            expiry_seconds: Lifetime of each signature
+            margin_seconds: Minimum validity left when a URL is last handed out
+        """
+        self.sign = sign
+        self.expiry = expiry_seconds
+        self.window_seconds = max(expiry_seconds - margin_seconds, 1)
+        self._window: Optional[int] = None
+        self._urls: dict[str, str] = {}
+    
+    def window(self, now: datetime) -> tuple[datetime, datetime]:
+        """Start and end of the signing window containing the given time."""
+        index = int(now.timestamp()) // self.window_seconds
+        start = datetime.fromtimestamp(index * self.window_seconds, timezone.utc)
+        return start, start + timedelta(seconds=self.window_seconds)
+    
+    def get(self, file_key: str, now: datetime) -> str:
+        """Presigned URL for a file key, signed at most once per window."""
+        self._start_window(now)
+        url = self._urls.get(file_key)
+        if url is None:
+            url = self._urls[file_key] = self.sign(file_key, self.expiry)
+        return url
+    
+    def missing(self, file_keys: Iterable[str], now: datetime) -> list[str]:
+        """File keys without a URL for the current window."""
+        self._start_window(now)
+        return list({file_key for file_key in file_keys if file_key not in self._urls})
+    
+    def sign_many(self, file_keys: list[str], now: datetime) -> None:
+        """Sign a batch of file keys for the current window."""
+        for file_key in file_keys:
+            self.get(file_key, now)
+    
+    def _start_window(self, now: datetime) -> None:
+        # URLs from earlier windows are never handed out again
+        index = int(now.timestamp()) // self.window_seconds
+        if index != self._window:
+            self._window = index
+            self._urls = {}
+
+class S3Service(StorageBackend):
     def __init__(self):
+        super().__init__(settings.S3_MAX_WORKERS, "s3")
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
+            region_name=settings.AWS_REGION,
+            endpoint_url=settings.S3_ENDPOINT_URL or None,  # S3-compatible stores such as MinIO
+            config=Config(max_pool_connections=settings.S3_MAX_WORKERS)
         )
         self.bucket_name = settings.S3_BUCKET_NAME
-    
-    def generate_file_key(self, filename: str, day_number: Optional[int] = None) -> str:
-        """Generate a unique S3 object key for a file."""
-        file_id = str(uuid.uuid4())
+        self.chunk_size = max(settings.S3_MULTIPART_CHUNK_SIZE, MIN_MULTIPART_CHUNK_SIZE)
         
-        # Get file extension
-        _, ext = mimetypes.guess_extension(filename) or ('', '')
-        if not ext and '.' in filename:
-            ext = '.' + filename.split('.')[-1].lower()
-        
-        # Organize by day if specified
-        if day_number:
-            return f"days/day-{day_number:02d}/{file_id}{ext}"
-        else:
-            return f"general/{file_id}{ext}"
+        # Private buckets hand out presigned URLs instead of public ones
+        self.private = settings.S3_PRIVATE_BUCKET
+        self.presigned_urls = PresignedUrlCache(
+            self.get_presigned_url,
+            settings.MEDIA_URL_EXPIRY,
+            settings.MEDIA_URL_EXPIRY_MARGIN
+        )
     
     def upload_file(
         self, 
@@ -74,10 +126,205 @@ class S3Service:
         except ClientError as e:
             raise Exception(f"Failed to upload file to S3: {str(e)}")
     
+    def upload_stream(
+        self,
+        file_obj: BinaryIO,
+        filename: str,
+        content_type: str,
+        day_number: Optional[int] = None,
+        max_size: Optional[int] = None
+    ) -> tuple[str, str, int]:
+        """
+        Stream a file to S3 in fixed-size chunks using multipart upload.
+        
+        Only one chunk is held in memory at a time. Blocking, run it through run().
+        
+        Args:
+            file_obj: Readable binary stream, read from its current position
+            filename: Original filename
+            content_type: MIME type of the file
+            day_number: Optional day number for organization
+            max_size: Optional size limit in bytes, enforced while streaming
+        
+        Returns:
+            Tuple of (file_key, public_url, size in bytes)
+        
+        Raises:
+            FileTooLargeError: If the stream is larger than max_size
+        """
+        file_key = self.generate_file_key(filename, day_number)
+        object_args = {
+            'Bucket': self.bucket_name,
+            'Key': file_key,
+            'ContentType': content_type,
+            'ContentDisposition': f'inline; filename="{quote(filename)}"',
+            'CacheControl': 'max-age=31536000'  # 1 year cache
+        }
+        
+        chunk = file_obj.read(self.chunk_size)
+        size = len(chunk)
+        self._check_size(size, max_size)
+        
+        try:
+            # Small files fit in a single request
+            if size < self.chunk_size:
+                self.s3_client.put_object(Body=chunk, **object_args)
+                return file_key, self.get_public_url(file_key), size
+            
+            upload_id = self.s3_client.create_multipart_upload(**object_args)['UploadId']
+        except ClientError as e:
+            raise Exception(f"Failed to upload file to S3: {str(e)}")
+        
+        try:
+            parts = []
+            while chunk:
+                part_number = len(parts) + 1
+                response = self.s3_client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=file_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk
+                )
+                parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+                
+                chunk = file_obj.read(self.chunk_size)
+                size += len(chunk)
+                self._check_size(size, max_size)
+            
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=file_key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+        except BaseException as e:
+            # Don't leave orphaned parts behind in the bucket
+            try:
+                self.s3_client.abort_multipart_upload(
+                    Bucket=self.bucket_name, Key=file_key, UploadId=upload_id
+                )
+            except ClientError as abort_error:
+                print(f"Failed to abort multipart upload: {str(abort_error)}")
+            if isinstance(e, ClientError):
+                raise Exception(f"Failed to upload file to S3: {str(e)}")
+            raise
+        
+        return file_key, self.get_public_url(file_key), size
+    
+    def upload_bytes(self, data: bytes, file_key: str, content_type: str) -> str:
+        """Upload an in-memory object (e.g. a generated derivative) under a given key."""
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=file_key,
+                Body=data,
+                ContentType=content_type,
+                CacheControl='max-age=31536000'  # 1 year cache
+            )
+            return self.get_public_url(file_key)
+        except ClientError as e:
+            raise Exception(f"Failed to upload file to S3: {str(e)}")
+    
     def get_public_url(self, file_key: str) -> str:
         """Generate public URL for an S3 object."""
+        if settings.S3_ENDPOINT_URL:
+            return f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{self.bucket_name}/{file_key}"
         return f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{file_key}"
     
+    @property
+    def proxied(self) -> bool:
+        return settings.MEDIA_PROXY_ENABLED
+    
+    def get_media_url(self, file_key: str) -> str:
+        """URL clients load an object from: proxied, presigned in private-bucket mode, or public."""
+        if self.proxied:
+            return self.get_proxy_url(file_key)
+        if not self.private:
+            return self.get_public_url(file_key)
+        return self.presigned_urls.get(file_key, datetime.now(timezone.utc))
+    
+    async def prepare_media_urls(self, file_keys: Iterable[str]) -> None:
+        """Presign a whole payload's missing media URLs in one thread-pool call, before serializing it."""
+        if self.proxied or not self.private:
+            return
+        now = datetime.now(timezone.utc)
+        missing = self.presigned_urls.missing(file_keys, now)
+        if missing:
+            await self.run(self.presigned_urls.sign_many, missing, now)
+    
+    def media_url_window(self) -> Optional[tuple[datetime, datetime]]:
+        """Start and end of the current presigned URL window, None for public and proxy URLs (they never change)."""
+        if self.proxied or not self.private:
+            return None
+        return self.presigned_urls.window(datetime.now(timezone.utc))
+    
+    def generate_presigned_upload(
+        self,
+        file_key: str,
+        filename: str,
+        content_type: str,
+        max_size: int,
+        expiration: int = 900
+    ) -> dict:
+        """
+        Generate a presigned POST that lets a browser upload one object directly to S3.
+        
+        S3 rejects the upload unless it matches the key, content type and size range.
+        
+        Returns:
+            Dict with 'url' and the form 'fields' to send along with the file
+        """
+        fields = {
+            'Content-Type': content_type,
+            'Content-Disposition': f'inline; filename="{quote(filename)}"',
+            'Cache-Control': 'max-age=31536000'  # 1 year cache
+        }
+        conditions = [{name: value} for name, value in fields.items()]
+        conditions.append(['content-length-range', 1, max_size])
+        
+        try:
+            return self.s3_client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=file_key,
+                Fields=fields,
+                Conditions=conditions,
+                ExpiresIn=expiration
+            )
+        except ClientError as e:
+            raise Exception(f"Failed to generate presigned upload: {str(e)}")
+    
+    def download_bytes(self, file_key: str) -> bytes:
+        """Download a whole object into memory (only for small objects such as images)."""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)
+            return response['Body'].read()
+        except ClientError as e:
+            raise Exception(f"Failed to download file from S3: {str(e)}")
+    
+    def open_object(self, file_key: str, byte_range: Optional[tuple[int, int]] = None):
+        """
+        Open an object, or an inclusive byte range of it, as a streaming body.
+        
+        Blocking, run it (and the body's reads) through run().
+        """
+        args = {'Bucket': self.bucket_name, 'Key': file_key}
+        if byte_range is not None:
+            args['Range'] = f"bytes={byte_range[0]}-{byte_range[1]}"
+        try:
+            return self.s3_client.get_object(**args)['Body']
+        except ClientError as e:
+            raise Exception(f"Failed to download file from S3: {str(e)}")
+    
+    def download_to_file(self, file_key: str, file_obj: BinaryIO) -> None:
+        """Copy an object into a writable binary file chunk by chunk. Blocking, run it through run()."""
+        body = self.open_object(file_key)
+        try:
+            for chunk in body.iter_chunks(self.chunk_size):
+                file_obj.write(chunk)
+        finally:
+            body.close()
+    
     def get_presigned_url(self, file_key: str, expiration: int = 3600) -> str:
         """Generate a presigned URL for temporary access to a private object."""
         try:
@@ -119,6 +366,3 @@ class S3Service:
             }
         except ClientError:
             return None
-
-# Create a singleton instance
-s3_service = S3Service() 
\ No newline at end of file
@@ -0,0 +1,147 @@
+import asyncio
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from auth import get_current_time_utc
+from models import CountdownDay
+
+# Longest the scheduler sleeps in one go, so clock changes are picked up
+MAX_SLEEP_SECONDS = 60
+
+class UnlockSchedule:
+    def __init__(self):
+        # Per countdown: (sorted release times, day numbers in the same order)
+        self._countdowns: dict[int, tuple[list[datetime], list[int]]] = {}
+        # Every countdown: (sorted release times, (countdown id, day number) in the same order)
+        self._index: tuple[list[datetime], list[tuple[int, int]]] = ([], [])
+        self.version = 0
+        self.changed = asyncio.Event()
+
+    async def load(self, db: AsyncSession, countdown_id: Optional[int] = None) -> None:
+        """(Re)build the schedule from countdown_days, for one countdown or all of them."""
+        query = select(
+            CountdownDay.release_datetime_utc,
+            CountdownDay.countdown_id,
+            CountdownDay.day_number
+        ).order_by(CountdownDay.release_datetime_utc, CountdownDay.countdown_id, CountdownDay.day_number)
+        if countdown_id is not None:
+            query = query.where(CountdownDay.countdown_id == countdown_id)
+        result = await db.execute(query)
+        rows = [tuple(row) for row in result]
+
+        if countdown_id is None:
+            countdowns, releases = {}, rows
+        else:
+            countdowns = {key: value for key, value in self._countdowns.items() if key != countdown_id}
+            # Both parts are already sorted, so this is a merge
+            releases = sorted([
+                (release_at, *entry) for release_at, entry in zip(*self._index) if entry[0] != countdown_id
+            ] + rows)
+
+        for release_at, day_countdown_id, day_number in rows:
+            release_times, day_numbers = countdowns.setdefault(day_countdown_id, ([], []))
+            release_times.append(release_at)
+            day_numbers.append(day_number)
+
+        # Swap the whole index at once so readers never see a partial schedule
+        self._countdowns = countdowns
+        self._index = ([row[0] for row in releases], [(row[1], row[2]) for row in releases])
+        self.version += 1
+        self.changed.set()
+
+    def unlocked_days(self, countdown_id: int, now: datetime) -> list[int]:
+        """Day numbers of a countdown released at or before the given time."""
+        release_times, day_numbers = self._countdowns.get(countdown_id, ([], []))
+        return day_numbers[:bisect_right(release_times, now)]
+
+    def next_release(self, now: datetime) -> Optional[tuple[datetime, dict[int, list[int]]]]:
+        """Next release time after the given time and the days unlocking then, by countdown."""
+        release_times, entries = self._index
+        start = bisect_right(release_times, now)
+        if start == len(release_times):
+            return None
+
+        release_at = release_times[start]
+        end = bisect_right(release_times, release_at, lo=start)
+        releases: dict[int, list[int]] = {}
+        for countdown_id, day_number in entries[start:end]:
+            releases.setdefault(countdown_id, []).append(day_number)
+        return release_at, releases
+
+    def next_release_time(self, now: datetime) -> Optional[datetime]:
+        """Next release time after the given time, if any."""
+        upcoming = self.next_release(now)
+        return upcoming[0] if upcoming else None
+
+class UnlockScheduler:
+    def __init__(
+        self,
+        schedule: UnlockSchedule,
+        prewarm: Callable[[datetime, dict[int, list[int]]], Awaitable[None]],
+        prewarm_seconds: int,
+        on_release: Optional[Callable[[datetime, dict[int, list[int]]], Awaitable[None]]] = None
+    ):
+        self.schedule = schedule
+        self.prewarm = prewarm
+        self.prewarm_lead = timedelta(seconds=prewarm_seconds)
+        self.on_release = on_release
+
+    async def run(self) -> None:
+        """Warm each release's payloads shortly before it unlocks, forever."""
+        while True:
+            version = self.schedule.version
+            upcoming = self.schedule.next_release(get_current_time_utc())
+            if upcoming is None:
+                await self._wait_for_change(version)
+                continue
+
+            release_at, releases = upcoming
+            if not await self._sleep_until(release_at - self.prewarm_lead, version):
+                continue
+
+            try:
+                await self.prewarm(release_at, releases)
+            except Exception as e:
+                print(f"Failed to prewarm release at {release_at.isoformat()}: {str(e)}")
+
+            # Don't plan the next release until this one has happened
+            if not await self._sleep_until(release_at, version) or self.on_release is None:
+                continue
+            
+            try:
+                await self.on_release(release_at, releases)
+            except Exception as e:
+                print(f"Failed to handle release at {release_at.isoformat()}: {str(e)}")
+
+    async def _sleep_until(self, when: datetime, version: int) -> bool:
+        """Sleep until the given time. Returns False if the schedule changed first."""
+        while True:
+            self.schedule.changed.clear()
+            if self.schedule.version != version:
+                return False
+
+            delay = (when - get_current_time_utc()).total_seconds()
+            if delay <= 0:
+                return True
+
+            try:
+                await asyncio.wait_for(
+                    self.schedule.changed.wait(),
+                    timeout=min(delay, MAX_SLEEP_SECONDS)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _wait_for_change(self, version: int) -> None:
+        self.schedule.changed.clear()
+        if self.schedule.version != version:
+            return
+        try:
+            await asyncio.wait_for(self.schedule.changed.wait(), timeout=MAX_SLEEP_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+# Create a singleton instance
+unlock_schedule = UnlockSchedule()
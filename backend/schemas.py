@@ -27,7 +27,7 @@ class DaySectionBase(BaseModel):
     media_asset_id: Optional[UUID] = None
 
 class DaySectionCreate(DaySectionBase):
-    day_number: int = Field(..., ge=1, le=25)
+    day_number: int = Field(..., ge=1)
 
 class DaySectionUpdate(BaseModel):
     section_type: Optional[str] = Field(None, pattern="^(title|text|image|video|audio|quote|divider)$")
@@ -35,6 +35,11 @@ class DaySectionUpdate(BaseModel):
     position_order: Optional[int] = Field(None, ge=0)
     style_config: Optional[SectionStyleConfig] = None
     media_asset_id: Optional[UUID] = None
+    expected_updated_at: Optional[datetime] = None  # Rejects the update if the section changed since
+
+class SectionMoveRequest(BaseModel):
+    position_order: int = Field(..., ge=0)
+    expected_updated_at: Optional[datetime] = None
 
 class DaySectionResponse(DaySectionBase):
     id: UUID
@@ -71,9 +76,28 @@ class MediaConfig(BaseModel):
     alt_text: Optional[str] = None
     caption: Optional[str] = None
 
+# Countdown Schemas
+class CountdownBase(BaseModel):
+    slug: str = Field(..., max_length=100, pattern="^[a-z0-9]+(-[a-z0-9]+)*$")
+    title: str = Field(..., max_length=255)
+
+class CountdownCreate(CountdownBase):
+    total_days: int = Field(..., ge=1, le=1000)  # Every day gets a row up front
+    first_release_utc: datetime  # When the highest day unlocks, day 1 is released last
+    release_interval_hours: int = Field(24, ge=1)
+
+class CountdownResponse(CountdownBase):
+    id: int
+    total_days: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
 # Countdown Day Schemas
 class CountdownDayBase(BaseModel):
-    day_number: int = Field(..., ge=1, le=25)
+    day_number: int = Field(..., ge=1)
     title: str = Field(..., max_length=255)
     content_html: Optional[str] = None  # Legacy support
     background_audio_id: Optional[UUID] = None
@@ -102,8 +126,11 @@ class CountdownDayResponse(CountdownDayBase):
         from_attributes = True
 
 # Section Management Schemas
+class DaySectionUpsert(DaySectionCreate):
+    id: Optional[UUID] = None  # Existing section to update, omitted for new sections
+
 class SectionsUpdateRequest(BaseModel):
-    sections: List[DaySectionCreate]
+    sections: List[DaySectionUpsert]
 
 class SectionsResponse(BaseModel):
     sections: List[DaySectionResponse]
@@ -122,12 +149,25 @@ class MediaAssetCreate(MediaAssetBase):
 class MediaAssetUpdate(BaseModel):
     media_config: Optional[MediaConfig] = None
 
+class MediaVariantResponse(BaseModel):
+    width: int
+    height: int
+    mime_type: str
+    file_key: str
+    file_size: int
+    url: str = ""  # Computed field for S3 URL
+
 class MediaAssetResponse(MediaAssetBase):
     id: UUID
     file_key: str
     uploaded_at: datetime
     day_number: Optional[int] = None
     url: str = ""  # Computed field for S3 URL
+    width: Optional[int] = None  # Intrinsic dimensions, when known
+    height: Optional[int] = None
+    placeholder: Optional[str] = None  # Blurred preview data URI (images only)
+    variants: List[MediaVariantResponse] = []  # Resized image derivatives
+    srcset: Dict[str, str] = {}  # Computed srcset per variant MIME type
     
     class Config:
         from_attributes = True
@@ -141,6 +181,29 @@ class MediaUploadResponse(BaseModel):
     url: str
     uploaded_at: datetime
     media_config: Optional[MediaConfig] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None
+    variants: List[MediaVariantResponse] = []
+    srcset: Dict[str, str] = {}
+
+# Direct-to-S3 Upload Schemas
+class PresignedUploadRequest(BaseModel):
+    filename: str = Field(..., max_length=255)
+    content_type: str
+    file_size: Optional[int] = Field(None, ge=1)
+    day_number: Optional[int] = None
+
+class PresignedUploadResponse(BaseModel):
+    file_key: str
+    url: str
+    fields: Dict[str, str]  # Form fields to POST along with the file
+    upload_token: str  # Pass to the completion endpoint
+    expires_in: int
+
+class UploadCompleteRequest(BaseModel):
+    upload_token: str
+    media_config: Optional[MediaConfig] = None
 
 # Public API Schemas (limited information for non-admin users)
 class PublicDaySectionResponse(BaseModel):
@@ -169,7 +232,38 @@ class PublicCountdownDayResponse(BaseModel):
 class CountdownOverviewResponse(BaseModel):
     days: List[PublicCountdownDayResponse]
     current_day: Optional[int] = None  # Currently unlocked day
-    total_days: int = 25
+    total_days: int
+
+# Grid summary schemas (no content, for the countdown overview grid)
+class CoverImageResponse(BaseModel):
+    url: str  # Smallest available rendition
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None
+    srcset: Dict[str, str] = {}
+
+class CountdownDaySummaryResponse(BaseModel):
+    day_number: int
+    title: str
+    is_unlocked: bool = False
+    cover_image: Optional[CoverImageResponse] = None  # First image of an unlocked day
+
+class CountdownSummaryResponse(BaseModel):
+    days: List[CountdownDaySummaryResponse]
+    current_day: Optional[int] = None
+    total_days: int
+
+class AdminDaySummaryResponse(BaseModel):
+    id: int
+    day_number: int
+    title: str
+    release_datetime_utc: datetime
+    updated_at: Optional[datetime] = None
+    is_unlocked: bool
+    has_content: bool  # Sections or legacy HTML
+    section_count: int
+    media_count: int
+    media_bytes: int
 
 # Validation Response
 class ValidationResponse(BaseModel):
@@ -0,0 +1,177 @@
+from typing import Any, Optional
+from fastapi.responses import JSONResponse
+from models import CountdownDay, DaySection, MediaAsset
+from schemas import AudioConfig, MediaConfig, SectionStyleConfig
+from storage import storage
+import orjson
+
+# Defaults the response schemas fill into stored JSON configs, computed once
+MEDIA_CONFIG_DEFAULTS = MediaConfig().dict()
+AUDIO_CONFIG_DEFAULTS = AudioConfig().dict()
+STYLE_CONFIG_DEFAULTS = SectionStyleConfig().dict()
+
+def dumps(payload: Any) -> bytes:
+    """Encode a payload as JSON. UTC datetimes end in Z, as Pydantic renders them."""
+    return orjson.dumps(payload, option=orjson.OPT_UTC_Z)
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson, for payloads built by this module.
+
+    Content is trusted and returned as is, skipping response_model validation.
+    Bytes are treated as an already encoded body (e.g. a cached payload).
+    """
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+def with_defaults(config: Optional[dict], defaults: dict) -> Optional[dict]:
+    """A stored JSON config as its schema renders it: known keys only, defaults filled in."""
+    if config is None:
+        return None
+    return {key: config.get(key, default) for key, default in defaults.items()}
+
+def serialize_media(media: MediaAsset) -> dict:
+    """MediaAssetResponse data with URLs for the original and its variants."""
+    variants = [
+        {
+            "width": variant["width"],
+            "height": variant["height"],
+            "mime_type": variant["mime_type"],
+            "file_key": variant["file_key"],
+            "file_size": variant["file_size"],
+            "url": storage.get_media_url(variant["file_key"]),
+        }
+        for variant in media.variants or []
+    ]
+    return {
+        "filename": media.filename,
+        "file_size": media.file_size,
+        "mime_type": media.mime_type,
+        "media_config": with_defaults(media.media_config, MEDIA_CONFIG_DEFAULTS),
+        "id": media.id,
+        "file_key": media.file_key,
+        "uploaded_at": media.uploaded_at,
+        "day_number": media.day_number,
+        "url": storage.get_media_url(media.file_key),
+        "width": media.width,
+        "height": media.height,
+        "placeholder": media.placeholder,
+        "variants": variants,
+        "srcset": build_srcset(variants),
+    }
+
+def build_srcset(variants: list[dict]) -> dict[str, str]:
+    """srcset strings per MIME type, e.g. {"image/webp": "a.webp 320w, b.webp 640w"}."""
+    candidates: dict[str, list[str]] = {}
+    for variant in sorted(variants, key=lambda v: v["width"]):
+        candidates.setdefault(variant["mime_type"], []).append(f"{variant['url']} {variant['width']}w")
+    return {mime_type: ", ".join(entries) for mime_type, entries in candidates.items()}
+
+def serialize_cover(
+    file_key: str,
+    width: Optional[int],
+    height: Optional[int],
+    placeholder: Optional[str],
+    variants: Optional[list[dict]]
+) -> dict:
+    """CoverImageResponse data: the smallest JPEG rendition of an image, with every variant in the srcset."""
+    renditions = [{**variant, "url": storage.get_media_url(variant["file_key"])} for variant in variants or []]
+    smallest = min(
+        (variant for variant in renditions if variant["mime_type"] == "image/jpeg"),
+        key=lambda variant: variant["width"],
+        default=None
+    )
+    return {
+        "url": smallest["url"] if smallest else storage.get_media_url(file_key),
+        "width": width,
+        "height": height,
+        "placeholder": placeholder,
+        "srcset": build_srcset(renditions),
+    }
+
+def media_file_keys(media: Optional[MediaAsset]) -> list[str]:
+    """Object keys a serialized media asset links to: the original and its variants."""
+    if media is None:
+        return []
+    return [media.file_key, *(variant["file_key"] for variant in media.variants or [])]
+
+def day_media_file_keys(day: CountdownDay, include_assets: bool = False) -> list[str]:
+    """Object keys a serialized day links to, with its media library for admin payloads."""
+    file_keys = media_file_keys(day.background_audio)
+    for section in day.sections:
+        file_keys += media_file_keys(section.media_asset)
+    if include_assets:
+        for media in day.media_assets:
+            file_keys += media_file_keys(media)
+    return file_keys
+
+def serialize_optional_media(media: Optional[MediaAsset]) -> Optional[dict]:
+    return serialize_media(media) if media else None
+
+def serialize_public_section(section: DaySection) -> dict:
+    """PublicDaySectionResponse data."""
+    return {
+        "id": section.id,
+        "section_type": section.section_type,
+        "content_text": section.content_text,
+        "position_order": section.position_order,
+        "style_config": section.style_config,
+        "media_asset": serialize_optional_media(section.media_asset),
+    }
+
+def serialize_public_day(day: CountdownDay, is_unlocked: bool) -> dict:
+    """PublicCountdownDayResponse data, content is left out while the day is locked."""
+    if not is_unlocked:
+        return {
+            "day_number": day.day_number,
+            "title": day.title,
+            "content_html": None,
+            "sections": [],
+            "background_audio": None,
+            "audio_config": None,
+            "is_unlocked": False,
+        }
+    return {
+        "day_number": day.day_number,
+        "title": day.title,
+        "content_html": day.content_html,
+        "sections": [serialize_public_section(section) for section in day.sections],
+        "background_audio": serialize_optional_media(day.background_audio),
+        "audio_config": with_defaults(day.audio_config, AUDIO_CONFIG_DEFAULTS),
+        "is_unlocked": True,
+    }
+
+def serialize_admin_section(section: DaySection) -> dict:
+    """DaySectionResponse data."""
+    return {
+        "section_type": section.section_type,
+        "content_text": section.content_text,
+        "position_order": section.position_order,
+        "style_config": with_defaults(section.style_config, STYLE_CONFIG_DEFAULTS),
+        "media_asset_id": section.media_asset_id,
+        "id": section.id,
+        "day_number": section.day_number,
+        "created_at": section.created_at,
+        "updated_at": section.updated_at,
+        "media_asset": serialize_optional_media(section.media_asset),
+    }
+
+def serialize_admin_day(day: CountdownDay, is_unlocked: bool) -> dict:
+    """CountdownDayResponse data with every section and media asset."""
+    return {
+        "day_number": day.day_number,
+        "title": day.title,
+        "content_html": day.content_html,
+        "background_audio_id": day.background_audio_id,
+        "audio_config": with_defaults(day.audio_config, AUDIO_CONFIG_DEFAULTS),
+        "id": day.id,
+        "release_datetime_utc": day.release_datetime_utc,
+        "created_at": day.created_at,
+        "updated_at": day.updated_at,
+        "is_unlocked": is_unlocked,
+        "sections": [serialize_admin_section(section) for section in day.sections],
+        "media_assets": [serialize_media(media) for media in day.media_assets],
+        "background_audio": serialize_optional_media(day.background_audio),
+    }
@@ -0,0 +1,88 @@
+import asyncio
+import gzip
+import os
+import sys
+import tempfile
+from typing import Awaitable, Callable
+import brotli
+
+# Suffixes written for each snapshot, nginx picks one by Accept-Encoding
+SNAPSHOT_ENCODINGS = {
+    ".json": lambda body: body,
+    ".json.gz": lambda body: gzip.compress(body, compresslevel=9, mtime=0),
+    ".json.br": lambda body: brotli.compress(body, quality=11),
+}
+
+def write_snapshots(root: str, files: dict[str, bytes]) -> None:
+    """
+    Write encoded payloads as static files, with gzip and brotli variants.
+
+    Every file is replaced atomically so nginx never serves a partial one.
+    Day snapshots under a published overview's path that aren't in this set
+    (e.g. a day whose release was moved back) are removed.
+
+    Args:
+        root: Snapshot directory served by nginx
+        files: Encoded payloads by API path without the leading slash,
+            e.g. {"api/countdowns/ours": ..., "api/countdowns/ours/3": ...}
+    """
+    for path, body in files.items():
+        target = os.path.join(root, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        for suffix, encode in SNAPSHOT_ENCODINGS.items():
+            write_atomic(target + suffix, encode(body))
+
+    published = {os.path.join(root, path) for path in files}
+    for day_dir in published:
+        if not os.path.isdir(day_dir):
+            continue
+        for name in os.listdir(day_dir):
+            path = os.path.join(day_dir, name)
+            stem = path.split(".json", 1)[0]
+            if name.split(".", 1)[0].isdigit() and stem not in published:
+                os.remove(path)
+
+def write_atomic(path: str, data: bytes) -> None:
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        # mkstemp creates files only the owner can read
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except Exception:
+        os.unlink(temp_path)
+        raise
+
+class SnapshotPublisher:
+    def __init__(self, root: str, render: Callable[[int], Awaitable[dict[str, bytes]]]):
+        self.root = root
+        self.render = render
+
+    async def publish(self, countdown_id: int) -> None:
+        """Render a countdown's public payloads and write them out."""
+        files = await self.render(countdown_id)
+        await asyncio.to_thread(write_snapshots, self.root, files)
+
+if __name__ == "__main__":
+    # Publish once from the command line: python snapshots.py [directory]
+    from config import settings
+    from countdowns import countdown_directory
+    from database import SessionLocal
+    from main import render_snapshots
+    from schedule import unlock_schedule
+
+    root = sys.argv[1] if len(sys.argv) > 1 else settings.SNAPSHOT_DIR
+    if not root:
+        sys.exit("Set SNAPSHOT_DIR or pass the snapshot directory")
+
+    async def publish_once() -> None:
+        async with SessionLocal() as db:
+            await countdown_directory.load(db)
+            await unlock_schedule.load(db)
+        publisher = SnapshotPublisher(root, render_snapshots)
+        for countdown_id in countdown_directory.ids():
+            await publisher.publish(countdown_id)
+        print(f"Published snapshots to {root}")
+
+    asyncio.run(publish_once())
@@ -0,0 +1,16 @@
+from config import settings
+from storage_backend import StorageBackend, FileTooLargeError, hash_stream, RangedObjectReader
+
+def create_storage() -> StorageBackend:
+    """Storage backend selected by STORAGE_BACKEND."""
+    if settings.STORAGE_BACKEND == "local":
+        from local_storage import LocalStorage
+        return LocalStorage(settings.LOCAL_STORAGE_DIR)
+    if settings.STORAGE_BACKEND == "s3":
+        # boto3 is only loaded when S3 is in use
+        from s3_service import S3Service
+        return S3Service()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+# Create a singleton instance
+storage = create_storage()
@@ -0,0 +1,214 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Iterable, Optional
+from urllib.parse import quote
+from config import settings
+import asyncio
+import hashlib
+import mimetypes
+import uuid
+
+# Bytes read per chunk when hashing a stream
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class FileTooLargeError(Exception):
+    """Raised when an upload stream grows past the allowed size."""
+    pass
+
+def hash_stream(file_obj: BinaryIO, max_size: Optional[int] = None) -> tuple[str, int]:
+    """
+    SHA-256 hex digest and size of a stream, read in chunks from its current position.
+
+    Raises:
+        FileTooLargeError: If the stream is larger than max_size
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := file_obj.read(HASH_CHUNK_SIZE):
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise FileTooLargeError(f"File exceeds {max_size} bytes")
+        digest.update(chunk)
+    return digest.hexdigest(), size
+
+class RangedObjectReader:
+    """
+    Seekable, read-only view of a stored object, fetched block by block through ranged reads.
+
+    For parsers that only look at a few places in a large object (e.g. MP4 box
+    headers), without downloading the whole of it. Blocking, like the backend's calls.
+    """
+    def __init__(self, backend: "StorageBackend", file_key: str, size: int, block_size: int = 64 * 1024):
+        self.backend = backend
+        self.file_key = file_key
+        self.size = size
+        self.block_size = block_size
+        self.position = 0
+        self._blocks: dict[int, bytes] = {}
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = {0: 0, 1: self.position, 2: self.size}[whence]
+        self.position = max(base + offset, 0)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def read(self, size: int = -1) -> bytes:
+        end = self.size if size < 0 else min(self.position + size, self.size)
+        chunks = []
+        while self.position < end:
+            index, offset = divmod(self.position, self.block_size)
+            block = self._block(index)[offset:offset + end - self.position]
+            if not block:
+                break
+            chunks.append(block)
+            self.position += len(block)
+        return b"".join(chunks)
+
+    def _block(self, index: int) -> bytes:
+        block = self._blocks.get(index)
+        if block is None:
+            start = index * self.block_size
+            body = self.backend.open_object(self.file_key, (start, min(start + self.block_size, self.size) - 1))
+            try:
+                block = self._blocks[index] = body.read()
+            finally:
+                body.close()
+        return block
+
+class StorageBackend:
+    """
+    Where media objects live, addressed by file key.
+
+    Object operations are blocking, call them through run() from async code.
+    Backends that can't do something (e.g. direct browser uploads) raise
+    NotImplementedError.
+    """
+    # Objects are files on this machine, see local_file()
+    local = False
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        # Bounded pool for blocking storage calls, keeps them off the event loop
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix
+        )
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Run a blocking storage call in the storage thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def generate_file_key(self, filename: str, day_number: Optional[int] = None) -> str:
+        """Generate a unique object key for a file."""
+        file_id = str(uuid.uuid4())
+
+        # Get file extension
+        _, ext = mimetypes.guess_extension(filename) or ('', '')
+        if not ext and '.' in filename:
+            ext = '.' + filename.split('.')[-1].lower()
+
+        # Organize by day if specified
+        if day_number:
+            return f"days/day-{day_number:02d}/{file_id}{ext}"
+        else:
+            return f"general/{file_id}{ext}"
+
+    # URLs
+
+    @property
+    def proxied(self) -> bool:
+        """Whether clients load media from the app's /media proxy."""
+        return True
+
+    def get_proxy_url(self, file_key: str) -> str:
+        """URL of an object on the app's own media proxy."""
+        return f"{settings.MEDIA_PROXY_BASE_URL.rstrip('/')}/media/{quote(file_key)}"
+
+    def get_media_url(self, file_key: str) -> str:
+        """URL clients load an object from."""
+        return self.get_proxy_url(file_key)
+
+    async def prepare_media_urls(self, file_keys: Iterable[str]) -> None:
+        """Do any per-URL work (e.g. signing) for a whole payload at once, before serializing it."""
+        pass
+
+    def media_url_window(self) -> Optional[tuple[datetime, datetime]]:
+        """Start and end of the window media URLs are valid in, None when they never change."""
+        return None
+
+    def local_file(self, file_key: str) -> Optional[tuple[str, int]]:
+        """Path and size of an object stored on this machine, None if it isn't."""
+        return None
+
+    # Objects
+
+    def upload_stream(
+        self,
+        file_obj: BinaryIO,
+        filename: str,
+        content_type: str,
+        day_number: Optional[int] = None,
+        max_size: Optional[int] = None
+    ) -> tuple[str, str, int]:
+        """
+        Store a file from a stream in fixed-size chunks, under a new key.
+
+        Args:
+            file_obj: Readable binary stream, read from its current position
+            filename: Original filename
+            content_type: MIME type of the file
+            day_number: Optional day number for organization
+            max_size: Optional size limit in bytes, enforced while streaming
+
+        Returns:
+            Tuple of (file_key, url, size in bytes)
+
+        Raises:
+            FileTooLargeError: If the stream is larger than max_size
+        """
+        raise NotImplementedError
+
+    def upload_bytes(self, data: bytes, file_key: str, content_type: str) -> str:
+        """Store an in-memory object (e.g. a generated derivative) under a given key, returns its URL."""
+        raise NotImplementedError
+
+    def download_bytes(self, file_key: str) -> bytes:
+        """Read a whole object into memory (only for small objects such as images)."""
+        raise NotImplementedError
+
+    def open_object(self, file_key: str, byte_range: Optional[tuple[int, int]] = None):
+        """Open an object, or an inclusive byte range of it, as a body with read(size) and close()."""
+        raise NotImplementedError
+
+    def download_to_file(self, file_key: str, file_obj: BinaryIO) -> None:
+        """Copy an object into a writable binary file."""
+        raise NotImplementedError
+
+    def get_file_metadata(self, file_key: str) -> Optional[dict]:
+        """Size, content_type, last_modified and etag of an object, None if it doesn't exist."""
+        raise NotImplementedError
+
+    def delete_file(self, file_key: str) -> bool:
+        """Delete an object."""
+        raise NotImplementedError
+
+    def file_exists(self, file_key: str) -> bool:
+        """Check if an object exists."""
+        raise NotImplementedError
+
+    def generate_presigned_upload(
+        self,
+        file_key: str,
+        filename: str,
+        content_type: str,
+        max_size: int,
+        expiration: int = 900
+    ) -> dict:
+        """Let a browser upload one object directly, returns a dict with 'url' and form 'fields'."""
+        raise NotImplementedError
+
+    def _check_size(self, size: int, max_size: Optional[int]) -> None:
+        if max_size is not None and size > max_size:
+            raise FileTooLargeError(f"File exceeds {max_size} bytes")
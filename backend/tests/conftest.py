@@ -0,0 +1,100 @@
+"""
+Fixtures running the API against a SQLite stand-in of the database.
+
+Settings are read from the environment when config is first imported, so they
+are set here before any backend module loads. Requires the packages in
+tests/requirements.txt.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = tempfile.mkdtemp(prefix="countdown_tests_")
+ADMIN_PASSWORD = "test-password"
+
+os.environ.update({
+    "DATABASE_URL": "sqlite:///" + os.path.join(DATA_DIR, "test.db"),
+    "ADMIN_PASSWORD": ADMIN_PASSWORD,
+    "STORAGE_BACKEND": "local",
+    "LOCAL_STORAGE_DIR": os.path.join(DATA_DIR, "media"),
+    "SNAPSHOT_DIR": "",
+    "METRICS_ENABLED": "false",
+    "QUERY_PROFILING": "false",
+})
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.unlock_spike import use_sqlite_standin  # noqa: E402
+from database import engine  # noqa: E402
+
+use_sqlite_standin(engine)
+
+# Days 1-10 are unlocked, the rest still locked
+UNLOCKED_DAYS = 10
+SECTIONS_PER_DAY = 4
+
+async def seed() -> None:
+    """Create the schema and the default countdown, every day with sections and media."""
+    from sqlalchemy import insert
+    from database import Base, SessionLocal
+    from models import Countdown, CountdownDay, DaySection, MediaAsset
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime.now(timezone.utc)
+    days, media_rows, section_rows = [], [], []
+    for day in range(1, 26):
+        days.append({
+            "countdown_id": 1, "day_number": day, "title": f"Day {day}", "audio_config": {},
+            "release_datetime_utc": now + timedelta(days=day - UNLOCKED_DAYS - 1),
+        })
+        for position in range(SECTIONS_PER_DAY):
+            media_id = uuid.uuid4()
+            media_rows.append({
+                "id": media_id, "filename": f"photo_{position}.jpg",
+                "file_key": f"media/day_{day}/{media_id}.jpg", "file_size": 1000,
+                "mime_type": "image/jpeg", "media_config": {}, "countdown_id": 1,
+                "day_number": day, "width": 640, "height": 480, "uploaded_at": now,
+            })
+            section_rows.append({
+                "id": uuid.uuid4(), "countdown_id": 1, "day_number": day, "position_order": position,
+                "section_type": "image", "media_asset_id": media_id, "content_text": f"Section {position}",
+                "style_config": {}, "created_at": now, "updated_at": now,
+            })
+
+    async with SessionLocal() as db:
+        await db.execute(insert(Countdown).values(id=1, slug="default", title="Tests", total_days=25))
+        await db.execute(insert(CountdownDay), days)
+        await db.execute(insert(MediaAsset), media_rows)
+        await db.execute(insert(DaySection), section_rows)
+        await db.commit()
+    await engine.dispose()
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    import main
+
+    asyncio.run(seed())
+    with TestClient(main.app) as test_client:
+        # Let the startup tasks (the first session sweep) finish before anything is counted
+        test_client.portal.call(asyncio.sleep, 0.5)
+        yield test_client
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    response = client.post("/api/admin/login", json={"password": ADMIN_PASSWORD})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture
+def cold_cache():
+    """Start the test with nothing cached."""
+    from cache import countdown_cache
+    countdown_cache.invalidate()
@@ -0,0 +1,115 @@
+"""
+Direct-to-S3 uploads: presign, POST the form to S3, complete.
+
+S3 is mocked with moto, the API's storage backend is swapped for an S3 one
+for the duration of each test.
+"""
+import hashlib
+import os
+import struct
+from io import BytesIO
+
+import pytest
+import requests
+from moto import mock_s3
+from PIL import Image
+from sqlalchemy import select
+
+from config import settings
+from database import SessionLocal
+from models import MediaAsset
+
+@pytest.fixture
+def s3_storage(client, monkeypatch):
+    import main
+    from s3_service import S3Service
+
+    with mock_s3():
+        monkeypatch.setattr(settings, "AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setattr(settings, "AWS_SECRET_ACCESS_KEY", "testing")
+        monkeypatch.setattr(settings, "S3_ENDPOINT_URL", "")
+        s3_storage = S3Service()
+        s3_storage.s3_client.create_bucket(Bucket=settings.S3_BUCKET_NAME)
+        monkeypatch.setattr(main, "storage", s3_storage)
+        yield s3_storage
+
+def box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+def rotated_mp4(width: int, height: int, media_size: int) -> bytes:
+    """MP4 with one video track rotated by 90 degrees, its moov after the media data."""
+    matrix = struct.pack(">9i", 0, 1 << 16, 0, -(1 << 16), 0, 0, 0, 0, 1 << 30)
+    tkhd = box(b"tkhd", bytes(40) + matrix + struct.pack(">II", width << 16, height << 16))
+    return box(b"ftyp", b"isom" + bytes(4)) + box(b"mdat", os.urandom(media_size)) + box(b"moov", box(b"trak", tkhd))
+
+def presign_and_upload(client, admin_headers, filename: str, content_type: str, data: bytes) -> dict:
+    response = client.post("/api/admin/uploads/presign", headers=admin_headers, json={
+        "filename": filename, "content_type": content_type, "file_size": len(data), "day_number": 2
+    })
+    assert response.status_code == 200
+    presigned = response.json()
+
+    # What the browser does with the presigned POST
+    upload = requests.post(presigned["url"], data=presigned["fields"], files={"file": (filename, data, content_type)})
+    assert upload.status_code in (200, 204)
+    return presigned
+
+async def find_media(file_key: str) -> list[MediaAsset]:
+    async with SessionLocal() as db:
+        result = await db.execute(select(MediaAsset).where(MediaAsset.file_key == file_key))
+        return list(result.scalars())
+
+def test_presign_upload_complete(client, admin_headers, s3_storage):
+    data = os.urandom(64 * 1024)
+    presigned = presign_and_upload(client, admin_headers, "song.ogg", "audio/ogg", data)
+
+    complete = {"upload_token": presigned["upload_token"]}
+    first = client.post("/api/admin/uploads/complete", headers=admin_headers, json=complete)
+    assert first.status_code == 200
+    assert first.json()["file_key"] == presigned["file_key"]
+    assert first.json()["file_size"] == len(data)
+
+    # Completing again (e.g. a retried request) returns the same asset
+    second = client.post("/api/admin/uploads/complete", headers=admin_headers, json=complete)
+    assert second.status_code == 200
+    assert second.json()["id"] == first.json()["id"]
+
+    media = client.portal.call(find_media, presigned["file_key"])
+    assert len(media) == 1
+    assert media[0].countdown_id == 1 and media[0].day_number == 2
+    # Hashed by the background task that ran after the first completion
+    assert media[0].content_hash == hashlib.sha256(data).hexdigest()
+
+def test_complete_probes_video_dimensions(client, admin_headers, s3_storage):
+    presigned = presign_and_upload(client, admin_headers, "clip.mp4", "video/mp4", rotated_mp4(1920, 1080, 300_000))
+    response = client.post("/api/admin/uploads/complete", headers=admin_headers, json={
+        "upload_token": presigned["upload_token"]
+    })
+    assert response.status_code == 200
+
+    media = client.portal.call(find_media, presigned["file_key"])
+    # Shot upright, displayed portrait
+    assert (media[0].width, media[0].height) == (1080, 1920)
+
+def test_complete_renders_image_variants(client, admin_headers, s3_storage):
+    buffer = BytesIO()
+    Image.new("RGB", (800, 600), (200, 80, 80)).save(buffer, "JPEG")
+    data = buffer.getvalue()
+    presigned = presign_and_upload(client, admin_headers, "photo.jpg", "image/jpeg", data)
+    response = client.post("/api/admin/uploads/complete", headers=admin_headers, json={
+        "upload_token": presigned["upload_token"]
+    })
+    assert response.status_code == 200
+
+    media = client.portal.call(find_media, presigned["file_key"])
+    assert (media[0].width, media[0].height) == (800, 600)
+    assert {variant["width"] for variant in media[0].variants} == {320, 640}
+    assert media[0].content_hash == hashlib.sha256(data).hexdigest()
+
+def test_complete_without_upload(client, admin_headers, s3_storage):
+    response = client.post("/api/admin/uploads/presign", headers=admin_headers, json={
+        "filename": "song.ogg", "content_type": "audio/ogg", "day_number": 2
+    })
+    complete = {"upload_token": response.json()["upload_token"]}
+    response = client.post("/api/admin/uploads/complete", headers=admin_headers, json=complete)
+    assert response.status_code == 400
@@ -0,0 +1,37 @@
+"""
+SQL statements per request on the hot endpoints.
+
+Budgets hold for the seeded data whatever the number of days, sections and
+media; going over one is an N+1 regression, or a deliberate change that should
+update the budget here.
+"""
+import pytest
+
+from database import engine
+from profiling import assert_max_queries
+
+@pytest.mark.parametrize("path", ["/api/countdown", "/api/countdown/3", "/api/countdown/20"])
+def test_public_endpoints_cold(client, cold_cache, path):
+    with assert_max_queries(engine, 2):
+        response = client.get(path)
+    assert response.status_code == 200
+
+@pytest.mark.parametrize("path", ["/api/countdown", "/api/countdown/3", "/api/countdown/20"])
+def test_public_endpoints_cached(client, cold_cache, path):
+    client.get(path)
+    with assert_max_queries(engine, 0):
+        response = client.get(path)
+    assert response.status_code == 200
+
+def test_admin_overview(client, admin_headers, cold_cache):
+    with assert_max_queries(engine, 4):
+        response = client.get("/api/admin/countdown", headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 25
+
+@pytest.mark.parametrize("day_number", [3, 20])
+def test_admin_day(client, admin_headers, cold_cache, day_number):
+    with assert_max_queries(engine, 3):
+        response = client.get(f"/api/admin/countdown/{day_number}", headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()["sections"]) == 4
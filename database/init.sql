@@ -101,4 +101,70 @@ ALTER TABLE countdown_days ADD COLUMN background_audio_id UUID REFERENCES media_
 ALTER TABLE countdown_days ADD COLUMN audio_config JSONB DEFAULT '{}';
 
 -- Create index for background audio
-CREATE INDEX idx_countdown_days_background_audio ON countdown_days(background_audio_id); 
\ No newline at end of file
+CREATE INDEX idx_countdown_days_background_audio ON countdown_days(background_audio_id);
+
+-- Migration 003: Responsive image derivatives
+-- Resized WebP/JPEG copies of uploaded images, stored next to the original
+ALTER TABLE media_assets ADD COLUMN variants JSONB DEFAULT '[]';
+
+-- Migration 004: Intrinsic media dimensions and image placeholders
+-- Lets clients reserve layout and paint a preview before media loads
+ALTER TABLE media_assets ADD COLUMN width INTEGER;
+ALTER TABLE media_assets ADD COLUMN height INTEGER;
+ALTER TABLE media_assets ADD COLUMN placeholder TEXT;
+
+-- Migration 005: Active admin session index
+-- The sweeper finds active sessions past their expiry without scanning the whole table
+CREATE INDEX idx_admin_sessions_active ON admin_sessions(expires_at) WHERE is_active = TRUE;
+
+-- Migration 006: Content-addressed upload deduplication
+-- Re-uploads of identical bytes reuse the stored object, so several assets can share a file key
+ALTER TABLE media_assets ADD COLUMN content_hash VARCHAR(64);
+ALTER TABLE media_assets DROP CONSTRAINT media_assets_file_key_key;
+CREATE INDEX idx_media_assets_content_hash ON media_assets(content_hash);
+
+-- Migration 007: Multiple countdowns
+-- Days, sections and media belong to a countdown, existing content becomes the default countdown
+CREATE TABLE countdowns (
+    id SERIAL PRIMARY KEY,
+    slug VARCHAR(100) NOT NULL UNIQUE,
+    title VARCHAR(255) NOT NULL,
+    total_days INTEGER NOT NULL CONSTRAINT check_total_days_positive CHECK (total_days >= 1),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+INSERT INTO countdowns (slug, title, total_days) VALUES ('default', 'Our Anniversary Countdown', 25);
+
+ALTER TABLE countdown_days ADD COLUMN countdown_id INTEGER REFERENCES countdowns(id) ON DELETE CASCADE;
+ALTER TABLE day_sections ADD COLUMN countdown_id INTEGER;
+ALTER TABLE media_assets ADD COLUMN countdown_id INTEGER REFERENCES countdowns(id) ON DELETE CASCADE;
+UPDATE countdown_days SET countdown_id = (SELECT id FROM countdowns WHERE slug = 'default');
+UPDATE day_sections SET countdown_id = (SELECT id FROM countdowns WHERE slug = 'default');
+UPDATE media_assets SET countdown_id = (SELECT id FROM countdowns WHERE slug = 'default');
+ALTER TABLE countdown_days ALTER COLUMN countdown_id SET NOT NULL;
+ALTER TABLE day_sections ALTER COLUMN countdown_id SET NOT NULL;
+ALTER TABLE media_assets ALTER COLUMN countdown_id SET NOT NULL;
+
+-- Day numbers are unique per countdown, so references to a day carry its countdown
+ALTER TABLE day_sections DROP CONSTRAINT day_sections_day_number_fkey;
+ALTER TABLE media_assets DROP CONSTRAINT media_assets_day_number_fkey;
+ALTER TABLE day_sections DROP CONSTRAINT day_sections_day_number_position_order_key;
+ALTER TABLE countdown_days DROP CONSTRAINT countdown_days_day_number_key;
+ALTER TABLE countdown_days DROP CONSTRAINT countdown_days_day_number_check;
+
+-- The upper bound is the countdown's total_days, checked by the API
+ALTER TABLE countdown_days ADD CONSTRAINT check_day_number_range CHECK (day_number >= 1);
+ALTER TABLE countdown_days ADD CONSTRAINT uq_countdown_days_countdown_day UNIQUE (countdown_id, day_number);
+ALTER TABLE day_sections ADD CONSTRAINT uq_day_sections_position UNIQUE (countdown_id, day_number, position_order);
+ALTER TABLE day_sections ADD CONSTRAINT day_sections_countdown_day_fkey
+    FOREIGN KEY (countdown_id, day_number) REFERENCES countdown_days(countdown_id, day_number) ON DELETE CASCADE;
+ALTER TABLE media_assets ADD CONSTRAINT media_assets_countdown_day_fkey
+    FOREIGN KEY (countdown_id, day_number) REFERENCES countdown_days(countdown_id, day_number);
+
+-- Lookups are by (countdown, day), the unique constraints above index days and sections
+DROP INDEX idx_countdown_days_day_number;
+DROP INDEX idx_day_sections_day_number;
+DROP INDEX idx_day_sections_position;
+DROP INDEX idx_media_assets_day_number;
+CREATE INDEX idx_media_assets_countdown_day ON media_assets(countdown_id, day_number);
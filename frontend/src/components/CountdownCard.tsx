@@ -42,6 +42,24 @@ const CountdownCard: React.FC<CountdownCardProps & { style?: React.CSSProperties
 
       {/* Content */}
       <div className="relative z-10 p-4 md:p-6 h-full flex flex-col items-center justify-center text-center">
+        {/* Cover thumbnail */}
+        {day.is_unlocked && day.cover_image && (
+          <picture>
+            {Object.entries(day.cover_image.srcset).map(([mimeType, srcSet]) => (
+              <source key={mimeType} type={mimeType} srcSet={srcSet} sizes="64px" />
+            ))}
+            <img
+              src={day.cover_image.url}
+              alt=""
+              width={day.cover_image.width}
+              height={day.cover_image.height}
+              className="w-16 h-16 object-cover rounded-full mb-3 shadow-sm bg-cover bg-center"
+              style={day.cover_image.placeholder ? { backgroundImage: `url(${day.cover_image.placeholder})` } : undefined}
+              loading="lazy"
+            />
+          </picture>
+        )}
+
         {/* Day number */}
         <div className={clsx(
           'text-3xl md:text-4xl font-bold mb-3 transition-all duration-300',
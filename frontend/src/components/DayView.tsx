@@ -191,12 +191,21 @@ const DayView: React.FC = () => {
           <div key={section.id} className={`${alignmentClass} ${marginClass}`}>
             {section.media_asset && (
               <div className="relative">
-                <img
-                  src={section.media_asset.url}
-                  alt={section.media_asset.media_config?.alt_text || section.content_text || ''}
-                  className="max-w-full h-auto rounded-lg shadow-lg"
-                  loading="lazy"
-                />
+                <picture>
+                  {/* Resized derivatives, the browser picks the best format and width */}
+                  {Object.entries(section.media_asset.srcset || {}).map(([mimeType, srcSet]) => (
+                    <source key={mimeType} type={mimeType} srcSet={srcSet} sizes="(max-width: 768px) 100vw, 768px" />
+                  ))}
+                  <img
+                    src={section.media_asset.url}
+                    alt={section.media_asset.media_config?.alt_text || section.content_text || ''}
+                    width={section.media_asset.width}
+                    height={section.media_asset.height}
+                    className="max-w-full h-auto rounded-lg shadow-lg bg-cover bg-center"
+                    style={section.media_asset.placeholder ? { backgroundImage: `url(${section.media_asset.placeholder})` } : undefined}
+                    loading="lazy"
+                  />
+                </picture>
                 {(section.content_text || section.media_asset.media_config?.caption) && (
                   <p className="text-sm text-warm-gray-600 mt-2 italic">
                     {section.content_text || section.media_asset.media_config?.caption}
@@ -225,6 +234,8 @@ const DayView: React.FC = () => {
                   muted={section.media_asset.media_config?.muted || false}
                   loop={section.media_asset.media_config?.loop || false}
                   poster={section.media_asset.media_config?.poster}
+                  width={section.media_asset.width}
+                  height={section.media_asset.height}
                   className="w-full max-w-full h-auto rounded-lg shadow-lg"
                   preload="metadata"
                 >
@@ -4,6 +4,13 @@ import { useAdminCountdown } from '../../hooks/useAdminCountdown';
 import LoadingSpinner from '../LoadingSpinner';
 import { PencilIcon, EyeIcon } from '@heroicons/react/24/outline';
 
+const formatBytes = (bytes: number): string => {
+  if (bytes < 1024 * 1024) {
+    return `${Math.round(bytes / 1024)} KB`;
+  }
+  return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+};
+
 const AdminDashboard: React.FC = () => {
   const { days, loading, error, refetch } = useAdminCountdown();
 
@@ -66,11 +73,14 @@ const AdminDashboard: React.FC = () => {
             </h4>
             
             <div className="text-sm text-warm-gray-500 mb-4">
-              {day.content_html ? (
+              {day.has_content ? (
                 <span className="text-green-600">✓ Content added</span>
               ) : (
                 <span className="text-gray-500">No content yet</span>
               )}
+              <div className="mt-1">
+                {day.section_count} sections · {day.media_count} media ({formatBytes(day.media_bytes)})
+              </div>
             </div>
             
             <div className="flex space-x-2">
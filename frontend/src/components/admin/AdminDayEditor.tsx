@@ -20,7 +20,6 @@ import {
 } from '@heroicons/react/24/outline';
 import {
   DaySection,
-  DaySectionCreate,
   MediaAsset,
   AudioConfig,
   MediaConfig,
@@ -178,26 +177,67 @@ const AdminDayEditor: React.FC = () => {
     }
   };
 
+  // Save sections one write at a time, only the ones that changed since the day was loaded
+  const saveSections = async () => {
+    const savedSections = day?.sections || [];
+    const keptIds = sections.map(section => section.id);
+
+    for (const section of savedSections) {
+      if (keptIds.indexOf(section.id) === -1) {
+        await adminApi.deleteDaySection(dayNum, section.id, section.updated_at);
+      }
+    }
+
+    // Order of the sections on the server, put right one position at a time
+    const serverOrder = savedSections.map(section => section.id).filter(id => keptIds.indexOf(id) !== -1);
+    for (let position = 0; position < sections.length; position++) {
+      const section = sections[position];
+      const fields = {
+        section_type: section.section_type,
+        content_text: section.content_text,
+        style_config: section.style_config,
+        media_asset_id: section.media_asset_id
+      };
+      const original = savedSections.find(saved => saved.id === section.id);
+
+      if (!original) {
+        const created = await adminApi.createDaySection(dayNum, { ...fields, position_order: position });
+        serverOrder.splice(position, 0, created.id);
+        continue;
+      }
+
+      const moved = serverOrder.indexOf(section.id) !== position;
+      const edited = section.section_type !== original.section_type
+        || section.content_text !== original.content_text
+        || section.media_asset_id !== original.media_asset_id
+        || JSON.stringify(section.style_config) !== JSON.stringify(original.style_config);
+
+      if (edited) {
+        await adminApi.updateDaySection(dayNum, section.id, {
+          ...fields,
+          position_order: moved ? position : undefined,
+          expected_updated_at: original.updated_at
+        });
+      } else if (moved) {
+        await adminApi.moveDaySection(dayNum, section.id, position, original.updated_at);
+      }
+
+      if (moved) {
+        serverOrder.splice(serverOrder.indexOf(section.id), 1);
+        serverOrder.splice(position, 0, section.id);
+      }
+    }
+  };
+
   // Save all changes
   const handleSave = async () => {
     if (!hasChanges) return;
     
     setIsSaving(true);
     try {
-      // Convert sections to create format
-      const sectionsToSave: DaySectionCreate[] = sections.map(section => ({
-        day_number: dayNum,
-        section_type: section.section_type,
-        content_text: section.content_text,
-        position_order: section.position_order,
-        style_config: section.style_config,
-        media_asset_id: section.media_asset_id
-      }));
-
-      // Update sections
-      await adminApi.updateDaySections(dayNum, sectionsToSave);
+      await saveSections();
 
-      // Update day metadata
+      // Update day metadata, the response brings back the saved sections
       await updateDay({ 
         title, 
         background_audio_id: backgroundAudioId,
@@ -207,7 +247,8 @@ const AdminDayEditor: React.FC = () => {
       setHasChanges(false);
       toast.success('Day saved successfully!');
     } catch (err) {
-      toast.error('Failed to save changes');
+      const message = err instanceof Error ? err.message : 'Failed to save changes';
+      toast.error(message);
     } finally {
       setIsSaving(false);
     }
@@ -1,10 +1,10 @@
 import { useState, useEffect, useCallback } from 'react';
 import { adminApi } from '../services/api';
-import { UseAdminCountdownReturn, CountdownDay, CountdownDayUpdate } from '../types';
+import { UseAdminCountdownReturn, AdminDaySummary, CountdownDay, CountdownDayUpdate } from '../types';
 import toast from 'react-hot-toast';
 
 export const useAdminCountdown = (): UseAdminCountdownReturn => {
-  const [days, setDays] = useState<CountdownDay[] | undefined>();
+  const [days, setDays] = useState<AdminDaySummary[] | undefined>();
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | undefined>();
 
@@ -13,7 +13,7 @@ export const useAdminCountdown = (): UseAdminCountdownReturn => {
     setError(undefined);
 
     try {
-      const data = await adminApi.getCountdownDays();
+      const data = await adminApi.getCountdownSummaries();
       setDays(data);
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to load countdown days';
@@ -34,7 +34,9 @@ export const useAdminCountdown = (): UseAdminCountdownReturn => {
       
       // Update local state
       setDays(prev => prev?.map(day => 
-        day.day_number === dayNumber ? updatedDay : day
+        day.day_number === dayNumber
+          ? { ...day, title: updatedDay.title, updated_at: updatedDay.updated_at, has_content: day.has_content || !!updatedDay.content_html }
+          : day
       ));
       
       toast.success(`Day ${dayNumber} updated successfully!`);
@@ -59,7 +59,12 @@ export const useAuth = (): UseAuthReturn => {
     }
   }, []);
 
-  const logout = useCallback(() => {
+  const logout = useCallback(async () => {
+    try {
+      await adminApi.logout();
+    } catch {
+      // The session may already be expired, log out locally regardless
+    }
     localStorage.removeItem(STORAGE_KEYS.AUTH_TOKEN);
     setIsAuthenticated(false);
     setError(undefined);
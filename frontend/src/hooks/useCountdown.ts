@@ -1,18 +1,22 @@
 import { useState, useEffect, useCallback } from 'react';
-import { publicApi } from '../services/api';
-import { UseCountdownReturn, CountdownOverview, PublicCountdownDay } from '../types';
+import { publicApi, subscribeToCountdownEvents } from '../services/api';
+import { UseCountdownReturn, CountdownSummary, PublicCountdownDay } from '../types';
 
 export const useCountdown = (): UseCountdownReturn => {
-  const [overview, setOverview] = useState<CountdownOverview | undefined>();
+  const [overview, setOverview] = useState<CountdownSummary | undefined>();
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | undefined>();
 
-  const fetchCountdown = useCallback(async () => {
-    setLoading(true);
+  // Background refreshes keep showing the current overview while loading
+  const fetchCountdown = useCallback(async (background: boolean = false) => {
+    if (!background) {
+      setLoading(true);
+    }
     setError(undefined);
 
     try {
-      const data = await publicApi.getCountdownOverview();
+      // The grid only needs titles and unlock status, not every day's content
+      const data = await publicApi.getCountdownSummary();
       setOverview(data);
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to load countdown';
@@ -27,6 +31,11 @@ export const useCountdown = (): UseCountdownReturn => {
     fetchCountdown();
   }, [fetchCountdown]);
 
+  // Any unlock or content change affects the overview
+  useEffect(() => {
+    return subscribeToCountdownEvents(() => fetchCountdown(true));
+  }, [fetchCountdown]);
+
   const refetch = useCallback(() => {
     fetchCountdown();
   }, [fetchCountdown]);
@@ -45,8 +54,10 @@ export const useCountdownDay = (dayNumber: number, previewToken?: string) => {
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | undefined>();
 
-  const fetchDay = useCallback(async () => {
-    setLoading(true);
+  const fetchDay = useCallback(async (background: boolean = false) => {
+    if (!background) {
+      setLoading(true);
+    }
     setError(undefined);
 
     try {
@@ -65,6 +76,15 @@ export const useCountdownDay = (dayNumber: number, previewToken?: string) => {
     fetchDay();
   }, [fetchDay]);
 
+  // Refresh when this day unlocks or published content changes
+  useEffect(() => {
+    return subscribeToCountdownEvents((event) => {
+      if (event.type !== 'unlock' || event.day_numbers?.includes(dayNumber)) {
+        fetchDay(true);
+      }
+    });
+  }, [fetchDay, dayNumber]);
+
   const refetch = useCallback(() => {
     fetchDay();
   }, [fetchDay]);
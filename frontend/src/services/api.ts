@@ -1,14 +1,22 @@
 import axios, { AxiosResponse, AxiosError } from 'axios';
 import {
   CountdownOverview,
+  CountdownSummary,
   PublicCountdownDay,
   CountdownDay,
+  AdminDaySummary,
   CountdownDayUpdate,
+  DaySection,
+  DaySectionCreate,
+  DaySectionInsert,
+  DaySectionUpdate,
+  SectionsResponse,
   AdminLoginRequest,
   AdminLoginResponse,
   ValidationResponse,
   MediaUploadResponse,
   APIError,
+  CountdownEvent,
   API_ENDPOINTS,
   STORAGE_KEYS
 } from '../types';
@@ -77,6 +85,18 @@ export const publicApi = {
     }
   },
 
+  // Get the countdown grid (titles, unlock status and cover images only)
+  getCountdownSummary: async (): Promise<CountdownSummary> => {
+    try {
+      const response: AxiosResponse<CountdownSummary> = await api.get(
+        API_ENDPOINTS.COUNTDOWN_SUMMARY
+      );
+      return response.data;
+    } catch (error) {
+      throw new Error(handleApiError(error as AxiosError<APIError>));
+    }
+  },
+
   // Get specific countdown day
   getCountdownDay: async (
     dayNumber: number,
@@ -105,6 +125,36 @@ export const publicApi = {
   },
 };
 
+// Live countdown updates, one event stream shared by every subscriber
+const COUNTDOWN_EVENT_TYPES: CountdownEvent['type'][] = ['unlock', 'content', 'resync'];
+const countdownEventListeners = new Set<(event: CountdownEvent) => void>();
+let countdownEventSource: EventSource | undefined;
+
+// Subscribe to unlock and content change events, returns an unsubscribe function.
+// EventSource reconnects on its own and resumes from the last event it saw.
+export const subscribeToCountdownEvents = (listener: (event: CountdownEvent) => void): (() => void) => {
+  countdownEventListeners.add(listener);
+
+  if (!countdownEventSource && typeof EventSource !== 'undefined') {
+    const source = new EventSource(`${process.env.REACT_APP_API_URL || ''}${API_ENDPOINTS.COUNTDOWN_EVENTS}`);
+    COUNTDOWN_EVENT_TYPES.forEach(type => {
+      source.addEventListener(type, (message) => {
+        const event: CountdownEvent = { ...JSON.parse((message as MessageEvent).data), type };
+        countdownEventListeners.forEach(notify => notify(event));
+      });
+    });
+    countdownEventSource = source;
+  }
+
+  return () => {
+    countdownEventListeners.delete(listener);
+    if (countdownEventListeners.size === 0 && countdownEventSource) {
+      countdownEventSource.close();
+      countdownEventSource = undefined;
+    }
+  };
+};
+
 // Admin API endpoints (auth required)
 export const adminApi = {
   // Login
@@ -120,6 +170,18 @@ export const adminApi = {
     }
   },
 
+  // Revoke the current session
+  logout: async (): Promise<ValidationResponse> => {
+    try {
+      const response: AxiosResponse<ValidationResponse> = await api.post(
+        API_ENDPOINTS.ADMIN_LOGOUT
+      );
+      return response.data;
+    } catch (error) {
+      throw new Error(handleApiError(error as AxiosError<APIError>));
+    }
+  },
+
   // Validate token
   validateToken: async (): Promise<ValidationResponse> => {
     try {
@@ -144,6 +206,18 @@ export const adminApi = {
     }
   },
 
+  // Get every day with section counts and media usage (admin dashboard)
+  getCountdownSummaries: async (): Promise<AdminDaySummary[]> => {
+    try {
+      const response: AxiosResponse<AdminDaySummary[]> = await api.get(
+        API_ENDPOINTS.ADMIN_COUNTDOWN_SUMMARY
+      );
+      return response.data;
+    } catch (error) {
+      throw new Error(handleApiError(error as AxiosError<APIError>));
+    }
+  },
+
   // Get specific countdown day (admin view)
   getCountdownDay: async (dayNumber: number): Promise<CountdownDay> => {
     try {
@@ -173,26 +247,86 @@ export const adminApi = {
   },
 
   // Section management
-  getDaySections: async (dayNumber: number): Promise<any> => {
+  getDaySections: async (dayNumber: number): Promise<SectionsResponse> => {
     try {
-      const response = await api.get(`/api/admin/countdown/${dayNumber}/sections`);
+      const response: AxiosResponse<SectionsResponse> = await api.get(
+        API_ENDPOINTS.ADMIN_DAY_SECTIONS(dayNumber)
+      );
       return response.data;
     } catch (error) {
       throw new Error(handleApiError(error as AxiosError<APIError>));
     }
   },
 
-  updateDaySections: async (dayNumber: number, sections: any[]): Promise<any> => {
+  updateDaySections: async (dayNumber: number, sections: DaySectionCreate[]): Promise<SectionsResponse> => {
     try {
-      const response = await api.put(`/api/admin/countdown/${dayNumber}/sections`, {
-        sections
-      });
+      const response: AxiosResponse<SectionsResponse> = await api.put(
+        API_ENDPOINTS.ADMIN_DAY_SECTIONS(dayNumber),
+        { sections }
+      );
+      return response.data;
+    } catch (error) {
+      throw new Error(handleApiError(error as AxiosError<APIError>));
+    }
+  },
+
+  // Insert a section, later sections shift down
+  createDaySection: async (dayNumber: number, section: DaySectionInsert): Promise<DaySection> => {
+    try {
+      const response: AxiosResponse<DaySection> = await api.post(
+        API_ENDPOINTS.ADMIN_DAY_SECTIONS(dayNumber),
+        section
+      );
       return response.data;
     } catch (error) {
       throw new Error(handleApiError(error as AxiosError<APIError>));
     }
   },
 
+  // Update one section, expected_updated_at guards against overwriting concurrent edits
+  updateDaySection: async (
+    dayNumber: number,
+    sectionId: string,
+    data: DaySectionUpdate
+  ): Promise<DaySection> => {
+    try {
+      const response: AxiosResponse<DaySection> = await api.patch(
+        API_ENDPOINTS.ADMIN_DAY_SECTION(dayNumber, sectionId),
+        data
+      );
+      return response.data;
+    } catch (error) {
+      throw new Error(handleApiError(error as AxiosError<APIError>));
+    }
+  },
+
+  moveDaySection: async (
+    dayNumber: number,
+    sectionId: string,
+    positionOrder: number,
+    expectedUpdatedAt?: string
+  ): Promise<DaySection> => {
+    try {
+      const response: AxiosResponse<DaySection> = await api.post(
+        API_ENDPOINTS.ADMIN_DAY_SECTION_MOVE(dayNumber, sectionId),
+        { position_order: positionOrder, expected_updated_at: expectedUpdatedAt }
+      );
+      return response.data;
+    } catch (error) {
+      throw new Error(handleApiError(error as AxiosError<APIError>));
+    }
+  },
+
+  deleteDaySection: async (dayNumber: number, sectionId: string, expectedUpdatedAt?: string): Promise<void> => {
+    try {
+      await api.delete(API_ENDPOINTS.ADMIN_DAY_SECTION(dayNumber, sectionId), {
+        params: { expected_updated_at: expectedUpdatedAt }
+      });
+    } catch (error) {
+      throw new Error(handleApiError(error as AxiosError<APIError>));
+    }
+  },
+
   // Upload media file with configuration
   uploadMedia: async (
     file: File,
@@ -21,6 +21,7 @@ export interface DaySection {
 }
 
 export interface DaySectionCreate {
+  id?: string; // existing section to update, omitted for new sections
   day_number: number;
   section_type: 'title' | 'text' | 'image' | 'video' | 'audio' | 'quote' | 'divider';
   content_text?: string;
@@ -90,6 +91,50 @@ export interface CountdownOverview {
   total_days: number;
 }
 
+// Grid summary, without day content
+export interface CoverImage {
+  url: string;
+  width?: number;
+  height?: number;
+  placeholder?: string;
+  srcset: Record<string, string>;
+}
+
+export interface CountdownDaySummary {
+  day_number: number;
+  title: string;
+  is_unlocked: boolean;
+  cover_image?: CoverImage;
+}
+
+export interface CountdownSummary {
+  days: CountdownDaySummary[];
+  current_day?: number;
+  total_days: number;
+}
+
+export interface AdminDaySummary {
+  id: number;
+  day_number: number;
+  title: string;
+  release_datetime_utc: string;
+  updated_at?: string;
+  is_unlocked: boolean;
+  has_content: boolean;
+  section_count: number;
+  media_count: number;
+  media_bytes: number;
+}
+
+export interface MediaVariant {
+  width: number;
+  height: number;
+  mime_type: string;
+  file_key: string;
+  file_size: number;
+  url: string;
+}
+
 export interface MediaAsset {
   id: string;
   filename: string;
@@ -100,6 +145,11 @@ export interface MediaAsset {
   uploaded_at: string;
   day_number?: number;
   url: string;
+  width?: number;
+  height?: number;
+  placeholder?: string;
+  variants?: MediaVariant[];
+  srcset?: Record<string, string>;
 }
 
 export interface MediaUploadResponse {
@@ -111,6 +161,11 @@ export interface MediaUploadResponse {
   url: string;
   uploaded_at: string;
   media_config?: MediaConfig;
+  width?: number;
+  height?: number;
+  placeholder?: string;
+  variants?: MediaVariant[];
+  srcset?: Record<string, string>;
 }
 
 // Auth Types
@@ -140,6 +195,22 @@ export interface SectionsUpdateRequest {
   sections: DaySectionCreate[];
 }
 
+export interface SectionsResponse {
+  sections: DaySection[];
+}
+
+// Single-section writes, expected_updated_at rejects the write if the section changed since it was read
+export type DaySectionInsert = Omit<DaySectionCreate, 'id' | 'day_number'>;
+
+export interface DaySectionUpdate {
+  section_type?: DaySection['section_type'];
+  content_text?: string;
+  position_order?: number;
+  style_config?: SectionStyleConfig;
+  media_asset_id?: string;
+  expected_updated_at?: string;
+}
+
 export interface MediaAssetUpdate {
   media_config?: MediaConfig;
 }
@@ -152,7 +223,7 @@ export interface APIError {
 
 // Component Props Types
 export interface CountdownCardProps {
-  day: PublicCountdownDay;
+  day: CountdownDaySummary;
   onClick: (dayNumber: number) => void;
   className?: string;
 }
@@ -211,15 +282,22 @@ export interface DayEditFormData {
 }
 
 // Hook Types
+// Live update pushed by /api/countdown/events
+export interface CountdownEvent {
+  type: 'unlock' | 'content' | 'resync';
+  day_numbers?: number[]; // days that just unlocked (unlock events)
+  release_at?: string;
+}
+
 export interface UseCountdownReturn {
-  overview?: CountdownOverview;
+  overview?: CountdownSummary;
   loading: boolean;
   error?: string;
   refetch: () => void;
 }
 
 export interface UseAdminCountdownReturn {
-  days?: CountdownDay[];
+  days?: AdminDaySummary[];
   loading: boolean;
   error?: string;
   updateDay: (dayNumber: number, data: CountdownDayUpdate) => Promise<void>;
@@ -230,7 +308,7 @@ export interface UseAuthReturn {
   isAuthenticated: boolean;
   loading: boolean;
   login: (password: string) => Promise<void>;
-  logout: () => void;
+  logout: () => Promise<void>;
   error?: string;
 }
 
@@ -263,14 +341,20 @@ export const STORAGE_KEYS: StorageKeys = {
 export const API_ENDPOINTS = {
   // Public endpoints
   COUNTDOWN_OVERVIEW: '/api/countdown',
+  COUNTDOWN_SUMMARY: '/api/countdown/summary',
   COUNTDOWN_DAY: (dayNumber: number) => `/api/countdown/${dayNumber}`,
+  COUNTDOWN_EVENTS: '/api/countdown/events',
   
   // Admin endpoints
   ADMIN_LOGIN: '/api/admin/login',
+  ADMIN_LOGOUT: '/api/admin/logout',
   ADMIN_VALIDATE: '/api/admin/validate-token',
   ADMIN_COUNTDOWN: '/api/admin/countdown',
+  ADMIN_COUNTDOWN_SUMMARY: '/api/admin/countdown/summary',
   ADMIN_COUNTDOWN_DAY: (dayNumber: number) => `/api/admin/countdown/${dayNumber}`,
   ADMIN_DAY_SECTIONS: (dayNumber: number) => `/api/admin/countdown/${dayNumber}/sections`,
+  ADMIN_DAY_SECTION: (dayNumber: number, sectionId: string) => `/api/admin/countdown/${dayNumber}/sections/${sectionId}`,
+  ADMIN_DAY_SECTION_MOVE: (dayNumber: number, sectionId: string) => `/api/admin/countdown/${dayNumber}/sections/${sectionId}/move`,
   ADMIN_UPLOAD: '/api/admin/upload',
   ADMIN_MEDIA_CONFIG: (mediaId: string) => `/api/admin/media/${mediaId}`,
   